@@ -1,19 +1,34 @@
-from fastapi import FastAPI, HTTPException, APIRouter
+from fastapi import FastAPI, HTTPException, APIRouter, Query, Response
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import List, Optional
+from starlette.background import BackgroundTask
+from typing import List, Literal, Optional
 import sqlite3
 import sys
 import os
 import logging
 import json
+import threading
+import asyncio
 
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+from article_store import (create_search_index, migrate_articles_table, normalize_url, search_articles, stored_article,
+                           stored_article_text)
 from config import Config
+from dedup import Deduplicator
+from ingest import ingest_articles
+from jobs import Job, JobManager
+from metrics import REGISTRY
 from news_collector import NewsCollector
 from news_processor import NewsProcessor
+from relevance import (add_pattern, article_text, create_relevance_table, get_relevance_matcher,
+                       matched_names, remove_pattern, score_content, score_missing, store_relevance)
+from scheduler import shared_planner
 from teams_notifier import TeamsNotifier
+from teams_outbox import OutboxDrainer, shared_outbox
 
 app = FastAPI(
     title="Energy News Bot API",
@@ -74,9 +89,44 @@ class PickupResult(BaseModel):
     summary: str
     url: str
 
-def get_db_connection():
-    import os
+class SearchResult(BaseModel):
+    id: int
+    url: str
+    title: Optional[str] = None
+    source: Optional[str] = None
+    category: Optional[str] = None
+    published_date: Optional[str] = None
+    published_at: Optional[str] = None
+    snippet: str
+    rank: float
+
+class PollingStatus(BaseModel):
+    source: str
+    polls: int
+    changes: int
+    hit_rate: Optional[float] = None
+    changes_per_day: Optional[float] = None
+    interval_seconds: float
+    expected_freshness: Optional[float] = None
+
+class JobStatus(BaseModel):
+    id: str
+    kind: str
+    params: dict
+    status: str  # "queued", "running", "succeeded", "failed"
+    progress_done: int
+    progress_total: int
+    message: str
+    error: str
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
 
+_db_pool: Optional["ConnectionPool"] = None
+_db_lock = threading.Lock()
+
+def resolve_db_path() -> str:
+    """Pick the database path: DB_PATH, DATABASE_PATH, then the fallback locations, probing each in turn."""
     db_path_candidates = [
         os.environ.get('DB_PATH', ''),
         os.environ.get('DATABASE_PATH', ''),
@@ -92,9 +142,9 @@ def get_db_connection():
     for candidate in db_path_candidates:
         if not candidate:  # Skip empty strings
             continue
-            
+
         logger.info(f"Trying database path: {os.path.abspath(candidate)}")
-        
+
         db_dir = os.path.dirname(candidate)
         if db_dir and not os.path.exists(db_dir):
             try:
@@ -104,7 +154,7 @@ def get_db_connection():
                 logger.warning(f"Could not create database directory {db_dir}: {e}")
                 logger.info(f"Skipping path {candidate} due to directory creation failure")
                 continue  # Skip this path and try the next one
-        
+
         try:
             test_conn = sqlite3.connect(candidate)
             test_conn.close()
@@ -119,13 +169,111 @@ def get_db_connection():
         db_path = './news.db'
         logger.warning(f"All database paths failed, using fallback: {os.path.abspath(db_path)}")
 
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    return conn
+    return db_path
+
+class PooledConnection:
+    """sqlite3 connection proxy whose close() hands the connection back to its pool.
+
+    As a context manager it commits, or rolls back if the block raised, like a
+    sqlite3 connection does, and then hands the connection back as well.
+    """
+
+    def __init__(self, pool: "ConnectionPool", conn: sqlite3.Connection):
+        self._pool = pool
+        self._conn = conn
+
+    def __getattr__(self, name):
+        if self._conn is None:
+            raise sqlite3.ProgrammingError("Cannot operate on a connection returned to the pool.")
+        return getattr(self._conn, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            if self._conn is not None:
+                if exc_type is None:
+                    self._conn.commit()
+                else:
+                    self._conn.rollback()
+        finally:
+            self.close()
+        return False
+
+    def close(self):
+        if self._conn is not None:
+            self._pool.release(self._conn)
+            self._conn = None
+
+class ConnectionPool:
+    """Pool of SQLite connections tuned for concurrent API access."""
+
+    def __init__(self, db_path: str, max_idle: int = 8):
+        self.db_path = db_path
+        self.max_idle = max_idle
+        self._idle = []
+        self._lock = threading.Lock()
+
+    def acquire(self) -> PooledConnection:
+        with self._lock:
+            conn = self._idle.pop() if self._idle else None
+        if conn is None:
+            conn = self._connect()
+        return PooledConnection(self, conn)
+
+    def release(self, conn: sqlite3.Connection):
+        if conn.in_transaction:
+            conn.rollback()
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def close_all(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=5.0)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA cache_size=-16000")  # 16 MB page cache
+        conn.execute("PRAGMA mmap_size=268435456")  # 256 MB memory-mapped I/O
+        conn.execute("PRAGMA temp_store=MEMORY")
+        return conn
+
+def open_db_pool() -> ConnectionPool:
+    """Resolve the database path and make its pool the one get_db_connection() borrows from.
+
+    init_database() calls this at startup, so requests never probe paths or take a
+    lock to find the pool. Reopening for another path closes the old pool's idle connections.
+    """
+    global _db_pool
+    db_path = resolve_db_path()
+    with _db_lock:
+        previous = _db_pool
+        if previous is not None and previous.db_path == db_path:
+            return previous
+        pool = _db_pool = ConnectionPool(db_path)
+    if previous is not None:
+        previous.close_all()
+    return pool
+
+def get_db_connection():
+    """Borrow a connection from the pool opened at startup; close() or leaving a with block returns it."""
+    pool = _db_pool
+    if pool is None:
+        pool = open_db_pool()
+    return pool.acquire()
 
 def init_database():
     logger = logging.getLogger(__name__)
-    conn = get_db_connection()
+    conn = open_db_pool().acquire()
     c = conn.cursor()
 
     db_path = conn.execute("PRAGMA database_list").fetchone()[2]
@@ -139,6 +287,10 @@ def init_database():
         url TEXT UNIQUE
     )''')
 
+    migrate_articles_table(c)
+    tokenizer = create_search_index(c)
+    logger.info(f"Article search index tokenizer: {tokenizer or 'unavailable (LIKE search only)'}")
+
     c.execute('''CREATE TABLE IF NOT EXISTS keywords (
         id INTEGER PRIMARY KEY AUTOINCREMENT,
         word TEXT UNIQUE
@@ -160,6 +312,8 @@ def init_database():
         created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
     )''')
 
+    create_relevance_table(c)
+
     keyword_count = c.execute("SELECT COUNT(*) FROM keywords").fetchone()[0]
     company_count = c.execute("SELECT COUNT(*) FROM companies").fetchone()[0]
     pickup_count = c.execute("SELECT COUNT(*) FROM pickup_results").fetchone()[0]
@@ -237,21 +391,113 @@ def init_database():
     conn.close()
     logger.info("Database initialization completed")
 
+outbox_drainer: Optional[OutboxDrainer] = None
+
+def queue_for_teams(config: Config, articles) -> int:
+    """Queue articles in the durable Teams outbox and wake the background drainer."""
+    global outbox_drainer
+
+    outbox = shared_outbox(config.state_db_path, max_attempts=config.teams_outbox_max_attempts)
+    queued = outbox.enqueue(articles)
+
+    if outbox_drainer is None or not outbox_drainer.running:
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            logging.getLogger(__name__).warning("Teams outbox drainer not running; messages stay queued")
+            return queued
+        outbox_drainer = OutboxDrainer(
+            outbox,
+            TeamsNotifier(config),
+            batch_size=config.teams_outbox_batch_size,
+            interval_seconds=config.teams_outbox_drain_interval_seconds,
+        )
+        outbox_drainer.start()
+    outbox_drainer.wake()
+    return queued
+
 @app.on_event("startup")
 async def startup_event():
     init_database()
 
+    try:
+        queue_for_teams(Config.load_from_file("config.json"), [])
+    except Exception as e:
+        logging.getLogger(__name__).warning(f"Teams outbox drainer not started: {e}")
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    if outbox_drainer:
+        await outbox_drainer.stop()
+
+NDJSON_CHUNK_ROWS = 500
+
+def list_rows(sql: str, where: List[str], params: list, after_id: Optional[int], limit: Optional[int],
+              format: str, to_item, response: Response):
+    """Run a keyset-paginated list query and return it as a JSON list or an NDJSON stream.
+
+    Rows are ordered by id; a full JSON page sets X-Next-Cursor to the id to pass as
+    `after_id` for the next one. NDJSON streams rows straight from the cursor, and
+    the id of the last line serves as the cursor. Rows that to_item maps to None are skipped.
+    """
+    if after_id is not None:
+        where = where + ["id > ?"]
+        params = params + [after_id]
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY id"
+    if limit is not None:
+        sql += " LIMIT ?"
+        params = params + [limit]
+
+    conn = get_db_connection()
+    if format == "ndjson":
+        try:
+            cursor = conn.execute(sql, params)
+        except Exception:
+            conn.close()
+            raise
+
+        def generate():
+            while True:
+                rows = cursor.fetchmany(NDJSON_CHUNK_ROWS)
+                if not rows:
+                    break
+                items = (to_item(row) for row in rows)
+                yield "".join(json.dumps(item, ensure_ascii=False) + "\n" for item in items if item is not None)
+
+        def release():
+            cursor.close()
+            conn.close()
+
+        # The background task runs once the response ends, whether the stream finished,
+        # the client went away, or iteration never started; a finally in generate() would not.
+        return StreamingResponse(generate(), media_type="application/x-ndjson", background=BackgroundTask(release))
+
+    try:
+        rows = conn.execute(sql, params).fetchall()
+    finally:
+        conn.close()
+    if limit is not None and len(rows) == limit:
+        response.headers["X-Next-Cursor"] = str(rows[-1]["id"])
+    return [item for item in map(to_item, rows) if item is not None]
+
 @app.get("/")
 async def root():
     return {"message": "Energy News Bot API", "docs": "/docs"}
 
+@app.get("/metrics")
+async def get_metrics():
+    """Collector, processor and Teams metrics in the Prometheus text format."""
+    return Response(REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
 @api_router.post("/articles/", response_model=Article)
 async def create_article(article: ArticleCreate):
     conn = get_db_connection()
     c = conn.cursor()
 
     try:
-        c.execute("INSERT INTO articles (url) VALUES (?)", (article.url,))
+        c.execute("INSERT INTO articles (url, normalized_url) VALUES (?, ?)", (article.url, normalize_url(article.url)))
         article_id = c.lastrowid
         conn.commit()
         conn.close()
@@ -262,16 +508,31 @@ async def create_article(article: ArticleCreate):
 
 @api_router.get("/articles", response_model=List[Article])
 @api_router.get("/articles/", response_model=List[Article])
-async def get_articles():
-    conn = get_db_connection()
-    c = conn.cursor()
-
-    articles = []
-    for row in c.execute("SELECT id, url FROM articles"):
-        articles.append(Article(id=row["id"], url=row["url"]))
-
-    conn.close()
-    return articles
+async def get_articles(response: Response,
+                       limit: Optional[int] = Query(None, ge=1, le=10000),
+                       after_id: Optional[int] = None,
+                       category: Optional[str] = None,
+                       source: Optional[str] = None,
+                       since: Optional[str] = None,
+                       until: Optional[str] = None,
+                       format: Literal["json", "ndjson"] = "json"):
+    where, params = [], []
+    if category:
+        where.append("category = ?")
+        params.append(category)
+    if source:
+        where.append("source = ?")
+        params.append(source)
+    # collected_at is a UTC ISO timestamp, so whole-day bounds compare as strings and use its index.
+    if since:
+        where.append("collected_at >= date(?)")
+        params.append(since)
+    if until:
+        where.append("collected_at < date(?, '+1 day')")
+        params.append(until)
+
+    return list_rows("SELECT id, url FROM articles", where, params, after_id, limit, format,
+                     lambda row: {"id": row["id"], "url": row["url"]}, response)
 
 @api_router.delete("/articles/{article_id}")
 async def delete_article(article_id: int):
@@ -283,6 +544,7 @@ async def delete_article(article_id: int):
         conn.close()
         raise HTTPException(status_code=404, detail="Article not found")
 
+    c.execute("DELETE FROM article_relevance WHERE article_id = ?", (article_id,))
     conn.commit()
     conn.close()
     return {"message": "Article deleted successfully"}
@@ -297,6 +559,7 @@ async def create_keyword(keyword: KeywordCreate):
         keyword_id = c.lastrowid
         conn.commit()
         conn.close()
+        schedule_pattern_added("keyword", keyword_id, keyword.word)
         return Keyword(id=keyword_id, word=keyword.word)
     except sqlite3.IntegrityError:
         conn.close()
@@ -304,20 +567,15 @@ async def create_keyword(keyword: KeywordCreate):
 
 @api_router.get("/keywords", response_model=List[Keyword])
 @api_router.get("/keywords/", response_model=List[Keyword])
-async def get_keywords():
+async def get_keywords(response: Response,
+                       limit: Optional[int] = Query(None, ge=1, le=10000),
+                       after_id: Optional[int] = None,
+                       format: Literal["json", "ndjson"] = "json"):
     logger = logging.getLogger(__name__)
     logger.info("GET /api/keywords endpoint called")
 
-    conn = get_db_connection()
-    c = conn.cursor()
-
-    keywords = []
-    for row in c.execute("SELECT id, word FROM keywords"):
-        keywords.append(Keyword(id=row["id"], word=row["word"]))
-
-    logger.info(f"Returning {len(keywords)} keywords")
-    conn.close()
-    return keywords
+    return list_rows("SELECT id, word FROM keywords", [], [], after_id, limit, format,
+                     lambda row: {"id": row["id"], "word": row["word"]}, response)
 
 @api_router.delete("/keywords/{keyword_id}")
 async def delete_keyword(keyword_id: int):
@@ -329,6 +587,7 @@ async def delete_keyword(keyword_id: int):
         conn.close()
         raise HTTPException(status_code=404, detail="Keyword not found")
 
+    remove_pattern(conn, "keyword", keyword_id)
     conn.commit()
     conn.close()
     return {"message": "Keyword deleted successfully"}
@@ -343,6 +602,7 @@ async def create_company(company: CompanyCreate):
         company_id = c.lastrowid
         conn.commit()
         conn.close()
+        schedule_pattern_added("company", company_id, company.name)
         return Company(id=company_id, name=company.name)
     except sqlite3.IntegrityError:
         conn.close()
@@ -350,20 +610,15 @@ async def create_company(company: CompanyCreate):
 
 @api_router.get("/companies", response_model=List[Company])
 @api_router.get("/companies/", response_model=List[Company])
-async def get_companies():
+async def get_companies(response: Response,
+                        limit: Optional[int] = Query(None, ge=1, le=10000),
+                        after_id: Optional[int] = None,
+                        format: Literal["json", "ndjson"] = "json"):
     logger = logging.getLogger(__name__)
     logger.info("GET /api/companies endpoint called")
 
-    conn = get_db_connection()
-    c = conn.cursor()
-
-    companies = []
-    for row in c.execute("SELECT id, name FROM companies"):
-        companies.append(Company(id=row["id"], name=row["name"]))
-
-    logger.info(f"Returning {len(companies)} companies")
-    conn.close()
-    return companies
+    return list_rows("SELECT id, name FROM companies", [], [], after_id, limit, format,
+                     lambda row: {"id": row["id"], "name": row["name"]}, response)
 
 @api_router.delete("/companies/{company_id}")
 async def delete_company(company_id: int):
@@ -383,6 +638,7 @@ async def delete_company(company_id: int):
     logger.info(f"Deleting company: {company_name} (ID: {company_id})")
 
     c.execute("DELETE FROM companies WHERE id = ?", (company_id,))
+    remove_pattern(conn, "company", company_id)
     conn.commit()
     conn.close()
 
@@ -402,35 +658,21 @@ async def get_article_relevance(article_id: int):
     article_url = article_row["url"]
 
     try:
-        config = Config.load_from_file("config.json")
-        collector = NewsCollector(config)
-        processor = NewsProcessor(config)
-
-        article_data = collector.fetch_article_content(article_url)
-        if not article_data:
-            conn.close()
-            raise HTTPException(status_code=400, detail="Could not fetch article content")
-
-        keywords = [row["word"] for row in c.execute("SELECT word FROM keywords")]
-        companies = [row["name"] for row in c.execute("SELECT name FROM companies")]
-
-        matching_keywords = []
-        matching_companies = []
-
-        content = article_data.get('content', '') + ' ' + article_data.get('title', '')
-
-        for keyword in keywords:
-            if keyword in content:
-                matching_keywords.append(keyword)
-
-        for company in companies:
-            if company in content:
-                matching_companies.append(company)
+        relevance_row = c.execute("SELECT * FROM article_relevance WHERE article_id = ?", (article_id,)).fetchone()
+        if relevance_row:
+            matching_keywords, matching_companies = matched_names(conn, relevance_row)
+            score = relevance_row["score"]
+        else:
+            config = Config.load_from_file("config.json")
+            collector = NewsCollector(config)
 
-        total_matches = len(matching_keywords) + len(matching_companies)
-        total_possible = len(keywords) + len(companies)
+            article_data = stored_or_fetched(conn, collector, article_url)
+            if not article_data:
+                conn.close()
+                raise HTTPException(status_code=400, detail="Could not fetch article content")
 
-        score = total_matches / max(total_possible, 1) if total_possible > 0 else 0.0
+            matching_keywords, matching_companies, score = store_relevance(conn, article_id, article_text(article_data))
+            conn.commit()
 
         conn.close()
         return RelevanceScore(
@@ -444,131 +686,145 @@ async def get_article_relevance(article_id: int):
         conn.close()
         raise HTTPException(status_code=500, detail=f"Error calculating relevance: {str(e)}")
 
-@api_router.post("/process-articles/", response_model=ProcessingResult)
-async def process_articles():
+def stored_or_fetched(conn, collector: NewsCollector, url: str):
+    """An article's stored record, fetching the page only for URLs stored without content."""
+    return stored_article(conn, url) or collector.fetch_article_content(url)
+
+def relevance_text_source(conn, collector: NewsCollector):
+    """Return a url -> text lookup that prefers stored article content over fetching the page."""
+    def fetch_text(url: str):
+        return stored_article_text(conn, url) or article_text(collector.fetch_article_content(url))
+    return fetch_text
+
+def _no_progress(done: int, total: int, message: str = ""):
+    pass
+
+def run_process_articles(progress=_no_progress) -> ProcessingResult:
+    """Run the collect, process and queue-for-Teams pipeline (blocking)."""
     try:
         config = Config.load_from_file("config.json")
 
+        progress(0, 3, "Collecting articles")
         collector = NewsCollector(config)
         news_articles = collector.collect_news()
 
+        collected_count = len(news_articles)
+        if config.dedup_enabled:
+            news_articles = Deduplicator(config.state_db_path, threshold=config.dedup_threshold).deduplicate(news_articles)
+
+        progress(1, 3, "Processing articles")
         processor = NewsProcessor(config)
         processed_articles = processor.process_articles(news_articles)
 
+        progress(2, 3, "Storing and queueing articles")
         posted_count = 0
         if processed_articles:
-            notifier = TeamsNotifier(config)
             articles_to_post = processed_articles[:config.max_teams_posts]
-            notifier.post_articles(articles_to_post)
-            posted_count = len(articles_to_post)
+            posted_count = queue_for_teams(config, articles_to_post)
 
         conn = get_db_connection()
-        c = conn.cursor()
-        for article in news_articles:
-            try:
-                c.execute("INSERT OR IGNORE INTO articles (url) VALUES (?)", (article.get('url', ''),))
-            except:
-                pass
-        conn.commit()
-        conn.close()
+        try:
+            ingest_articles(conn, news_articles, processed_articles)
+        finally:
+            conn.close()
 
+        progress(3, 3, "Done")
         return ProcessingResult(
-            collected_articles=len(news_articles),
+            collected_articles=collected_count,
             processed_articles=len(processed_articles),
             posted_to_teams=posted_count,
-            message=f"Successfully processed {len(news_articles)} articles, {len(processed_articles)} passed filtering, {posted_count} posted to Teams"
+            message=f"Successfully processed {collected_count} articles ({collected_count - len(news_articles)} duplicates), {len(processed_articles)} passed filtering, {posted_count} queued for Teams"
         )
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing articles: {str(e)}")
 
-@api_router.post("/teams/post-high-relevance/")
-async def post_high_relevance_articles(threshold: float = 0.75):
+@api_router.post("/process-articles/", response_model=ProcessingResult)
+async def process_articles():
+    return await run_in_threadpool(run_process_articles)
+
+def run_post_high_relevance(threshold: float, progress=_no_progress) -> dict:
+    """Queue stored articles whose persisted relevance is at or above the threshold for Teams (blocking)."""
     try:
         config = Config.load_from_file("config.json")
         conn = get_db_connection()
         c = conn.cursor()
 
-        articles = [row["url"] for row in c.execute("SELECT url FROM articles")]
-        keywords = [row["word"] for row in c.execute("SELECT word FROM keywords")]
-        companies = [row["name"] for row in c.execute("SELECT name FROM companies")]
-
-        high_relevance_articles = []
         collector = NewsCollector(config)
+        score_missing(conn, relevance_text_source(conn, collector), progress)
 
-        for article_url in articles:
+        rows = c.execute(
+            """SELECT a.url, r.score, r.matched_keyword_ids, r.matched_company_ids
+               FROM article_relevance r JOIN articles a ON a.id = r.article_id
+               WHERE r.score >= ? ORDER BY a.id""",
+            (threshold,),
+        ).fetchall()
+
+        high_relevance_articles = []
+        for index, row in enumerate(rows):
+            if len(high_relevance_articles) >= config.max_teams_posts:
+                break
+            progress(index, len(rows), f"Fetching {row['url']}")
             try:
-                article_data = collector.fetch_article_content(article_url)
+                article_data = stored_or_fetched(conn, collector, row["url"])
                 if not article_data:
                     continue
 
-                content = article_data.get('content', '') + ' ' + article_data.get('title', '')
-
-                matching_keywords = [kw for kw in keywords if kw in content]
-                matching_companies = [comp for comp in companies if comp in content]
-
-                total_matches = len(matching_keywords) + len(matching_companies)
-                total_possible = len(keywords) + len(companies)
-                score = total_matches / max(total_possible, 1) if total_possible > 0 else 0.0
-
-                if score >= threshold:
-                    article_data['relevance_score'] = score
-                    article_data['matching_keywords'] = matching_keywords
-                    article_data['matching_companies'] = matching_companies
-                    high_relevance_articles.append(article_data)
+                matching_keywords, matching_companies = matched_names(conn, row)
+                article_data['relevance_score'] = row["score"]
+                article_data['matching_keywords'] = matching_keywords
+                article_data['matching_companies'] = matching_companies
+                high_relevance_articles.append(article_data)
 
             except Exception as e:
                 continue
 
         posted_count = 0
         if high_relevance_articles:
-            notifier = TeamsNotifier(config)
             articles_to_post = high_relevance_articles[:config.max_teams_posts]
-            notifier.post_articles(articles_to_post)
-            posted_count = len(articles_to_post)
+            posted_count = queue_for_teams(config, articles_to_post)
 
         conn.close()
+        progress(len(rows), len(rows), "Done")
         return {
-            "message": f"Posted {posted_count} high-relevance articles to Teams",
+            "message": f"Queued {posted_count} high-relevance articles for Teams",
             "threshold": threshold,
             "articles_posted": posted_count,
-            "total_high_relevance": len(high_relevance_articles)
+            "total_high_relevance": len(rows)
         }
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error posting to Teams: {str(e)}")
 
-@api_router.get("/pickup-results", response_model=List[PickupResult])
-async def get_pickup_results():
-    """Analyze registered articles for relevance and return pickup candidates for Teams posting."""
+@api_router.post("/teams/post-high-relevance/")
+async def post_high_relevance_articles(threshold: float = 0.75):
+    return await run_in_threadpool(run_post_high_relevance, threshold)
+
+def run_pickup_results(progress=_no_progress) -> List[PickupResult]:
+    """Analyze registered articles for relevance and build pickup candidates (blocking)."""
     try:
         config = Config.load_from_file("config.json")
         conn = get_db_connection()
         c = conn.cursor()
 
         articles = [{"id": row["id"], "url": row["url"]} for row in c.execute("SELECT id, url FROM articles")]
-        keywords = [row["word"] for row in c.execute("SELECT word FROM keywords")]
-        companies = [row["name"] for row in c.execute("SELECT name FROM companies")]
+        matcher = get_relevance_matcher(conn)
 
         pickup_results = []
         collector = NewsCollector(config)
 
-        for article in articles:
+        for index, article in enumerate(articles):
+            progress(index, len(articles), f"Analyzing {article['url']}")
             try:
                 article_url = article["url"]
-                article_data = collector.fetch_article_content(article_url)
+                article_data = stored_or_fetched(conn, collector, article_url)
                 if not article_data:
                     continue
 
                 title = article_data.get('title', 'No Title')
                 content = article_data.get('content', '') + ' ' + title
 
-                matching_keywords = [kw for kw in keywords if kw in content]
-                matching_companies = [comp for comp in companies if comp in content]
-
-                total_matches = len(matching_keywords) + len(matching_companies)
-                total_possible = len(keywords) + len(companies)
-                score = total_matches / max(total_possible, 1) if total_possible > 0 else 0.0
+                matching_keywords, matching_companies, score = score_content(matcher, content)
 
                 if score > 0.8:
                     importance = "High"
@@ -596,43 +852,164 @@ async def get_pickup_results():
                 continue
 
         conn.close()
+        progress(len(articles), len(articles), "Done")
         return pickup_results
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error generating pickup results: {str(e)}")
 
+@api_router.get("/pickup-results", response_model=List[PickupResult])
+async def get_pickup_results():
+    """Analyze registered articles for relevance and return pickup candidates for Teams posting."""
+    return await run_in_threadpool(run_pickup_results)
+
 @api_router.get("/pickup_results", response_model=List[PickupResult])
-async def get_pickup_results_from_table():
-    """Get all pickup results from the pickup_results table."""
+async def get_pickup_results_from_table(response: Response,
+                                        limit: Optional[int] = Query(None, ge=1, le=10000),
+                                        after_id: Optional[int] = None,
+                                        importance: Optional[str] = None,
+                                        created_since: Optional[str] = None,
+                                        created_until: Optional[str] = None,
+                                        format: Literal["json", "ndjson"] = "json"):
+    """Get pickup results from the pickup_results table, optionally paginated and filtered."""
     logger = logging.getLogger(__name__)
     logger.info("GET /api/pickup_results endpoint called")
 
-    conn = get_db_connection()
-    c = conn.cursor()
-
-    pickup_results = []
-    for row in c.execute("""SELECT title, matched_keywords, matched_companies,
-                                  importance, summary, url FROM pickup_results"""):
+    where, params = [], []
+    if importance:
+        where.append("importance = ?")
+        params.append(importance)
+    if created_since:
+        where.append("date(created_at) >= date(?)")
+        params.append(created_since)
+    if created_until:
+        where.append("date(created_at) <= date(?)")
+        params.append(created_until)
+
+    def to_item(row):
         try:
-            matched_keywords = json.loads(row["matched_keywords"]) if row["matched_keywords"] else []
-            matched_companies = json.loads(row["matched_companies"]) if row["matched_companies"] else []
-
-            pickup_result = PickupResult(
-                title=row["title"],
-                matched_keywords=matched_keywords,
-                matched_companies=matched_companies,
-                importance=row["importance"],
-                summary=row["summary"],
-                url=row["url"]
-            )
-            pickup_results.append(pickup_result)
+            item = {
+                "id": row["id"],
+                "title": row["title"],
+                "matched_keywords": json.loads(row["matched_keywords"]) if row["matched_keywords"] else [],
+                "matched_companies": json.loads(row["matched_companies"]) if row["matched_companies"] else [],
+                "importance": row["importance"],
+                "summary": row["summary"],
+                "url": row["url"],
+                "created_at": row["created_at"],
+            }
+            PickupResult(**item)
+            return item
         except Exception as e:
             logger.warning(f"Error processing pickup result row: {e}")
-            continue
+            return None
 
-    logger.info(f"Returning {len(pickup_results)} pickup results from table")
-    conn.close()
-    return pickup_results
+    return list_rows("""SELECT id, title, matched_keywords, matched_companies,
+                               importance, summary, url, created_at FROM pickup_results""",
+                     where, params, after_id, limit, format, to_item, response)
+
+@api_router.get("/search", response_model=List[SearchResult])
+async def search(q: str, since: Optional[str] = None, until: Optional[str] = None,
+                 category: Optional[str] = None, limit: int = 20):
+    """Full-text search over stored article titles and content, best matches first."""
+    conn = get_db_connection()
+    try:
+        results = search_articles(conn, q, since=since, until=until, category=category, limit=max(1, min(limit, 100)))
+    except sqlite3.Error as e:
+        raise HTTPException(status_code=400, detail=f"Invalid search query: {str(e)}")
+    finally:
+        conn.close()
+    return [SearchResult(**result) for result in results]
+
+@api_router.get("/polling", response_model=List[PollingStatus])
+async def get_polling_status():
+    """Observed update frequency, hit rate and chosen polling interval per source."""
+    try:
+        config = Config.load_from_file("config.json")
+        planner = shared_planner(config)
+        return [PollingStatus(**row) for row in planner.stats(config.update_interval_hours * 3600)]
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error reading polling status: {str(e)}")
+
+job_manager = JobManager(max_workers=2)
+
+def schedule_pattern_added(kind: str, pattern_id: int, pattern: str) -> Job:
+    """Update stored relevance for a new keyword or company in the background."""
+    def run(progress) -> dict:
+        config = Config.load_from_file("config.json")
+        collector = NewsCollector(config)
+        conn = get_db_connection()
+        try:
+            matched = add_pattern(conn, kind, pattern_id, pattern, relevance_text_source(conn, collector))
+        finally:
+            conn.close()
+        return {"kind": kind, "id": pattern_id, "matched_articles": matched}
+
+    return job_manager.submit("relevance-pattern-added", {"kind": kind, "id": pattern_id}, run)
+
+def job_status(job: Job) -> JobStatus:
+    return JobStatus(
+        id=job.id,
+        kind=job.kind,
+        params=job.params,
+        status=job.status,
+        progress_done=job.progress_done,
+        progress_total=job.progress_total,
+        message=job.message,
+        error=job.error,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at
+    )
+
+@api_router.post("/jobs/process-articles", response_model=JobStatus, status_code=202)
+async def submit_process_articles_job():
+    """Start the collection pipeline in the background and return its job id."""
+    job = job_manager.submit(
+        "process-articles", {},
+        lambda progress: run_process_articles(progress).model_dump()
+    )
+    return job_status(job)
+
+@api_router.post("/jobs/post-high-relevance", response_model=JobStatus, status_code=202)
+async def submit_post_high_relevance_job(threshold: float = 0.75):
+    """Start high-relevance scoring and Teams queueing in the background."""
+    job = job_manager.submit(
+        "post-high-relevance", {"threshold": threshold},
+        lambda progress: run_post_high_relevance(threshold, progress)
+    )
+    return job_status(job)
+
+@api_router.post("/jobs/pickup-results", response_model=JobStatus, status_code=202)
+async def submit_pickup_results_job():
+    """Start pickup analysis in the background."""
+    job = job_manager.submit(
+        "pickup-results", {},
+        lambda progress: [result.model_dump() for result in run_pickup_results(progress)]
+    )
+    return job_status(job)
+
+@api_router.get("/jobs", response_model=List[JobStatus])
+async def list_jobs():
+    return [job_status(job) for job in job_manager.list()]
+
+@api_router.get("/jobs/{job_id}", response_model=JobStatus)
+async def get_job(job_id: str):
+    job = job_manager.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job_status(job)
+
+@api_router.get("/jobs/{job_id}/result")
+async def get_job_result(job_id: str):
+    job = job_manager.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.status == "failed":
+        raise HTTPException(status_code=500, detail=job.error)
+    if job.status != "succeeded":
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}")
+    return job.result
 
 app.include_router(api_router)
 
@@ -0,0 +1,348 @@
+"""Stored article content and its full-text search index."""
+
+import json
+import re
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Columns added to the original (id, url) articles table, in migration order.
+ARTICLE_COLUMNS = [
+    ("title", "TEXT"),
+    ("content", "TEXT"),
+    ("source", "TEXT"),
+    ("category", "TEXT"),
+    ("published_date", "TEXT"),
+    ("published_at", "TEXT"),
+    ("collected_at", "TEXT"),
+    ("normalized_url", "TEXT"),
+    ("processed_at", "TEXT"),
+    ("word_count", "INTEGER"),
+    ("sentiment", "TEXT"),
+    ("topics", "TEXT"),
+]
+
+# Collected fields, written when a URL is first stored or was registered without content.
+CONTENT_FIELDS = ["title", "content", "source", "category", "published_date", "published_at", "collected_at"]
+# Fields NewsProcessor adds to articles that pass its filters, refreshed on every ingest that has them.
+PROCESSED_FIELDS = ["processed_at", "word_count", "sentiment", "topics"]
+
+UPSERT_SQL = (
+    f"""INSERT INTO articles (url, normalized_url, {", ".join(CONTENT_FIELDS + PROCESSED_FIELDS)})
+        VALUES ({", ".join("?" * (2 + len(CONTENT_FIELDS) + len(PROCESSED_FIELDS)))})
+        ON CONFLICT(normalized_url) DO UPDATE SET {{updates}} WHERE {{changed}}
+        ON CONFLICT(url) DO UPDATE SET normalized_url = excluded.normalized_url, {{updates}}"""
+).format(
+    updates=", ".join(
+        [f"{name} = CASE WHEN articles.content IS NULL THEN excluded.{name} ELSE articles.{name} END"
+         for name in CONTENT_FIELDS]
+        + [f"{name} = COALESCE(excluded.{name}, articles.{name})" for name in PROCESSED_FIELDS]
+    ),
+    # Re-collected articles with stored content and nothing processed are left untouched.
+    changed="articles.content IS NULL OR excluded.processed_at IS NOT NULL",
+)
+
+# Query parameters that only track where a click came from.
+TRACKING_PARAM = re.compile(r"^(utm_\w+|fbclid|gclid|yclid|mc_cid|mc_eid)$", re.IGNORECASE)
+DEFAULT_PORTS = {"http": 80, "https": 443}
+# Bound on the URLs in one IN (...) lookup, under SQLite's host parameter limit.
+LOOKUP_CHUNK = 500
+
+# Indexed columns, in the order bm25() weights are given.
+FTS_COLUMNS = ["title", "content", "source", "category"]
+FTS_WEIGHTS = (10.0, 1.0, 0.5, 0.5)
+
+# The trigram tokenizer matches substrings, which Japanese text without word spaces needs.
+TRIGRAM_MIN_LENGTH = 3
+
+NUMERIC_DATE = re.compile(r"(\d{4})\s*[年./-]\s*(\d{1,2})\s*[月./-]\s*(\d{1,2})")
+
+
+def migrate_articles_table(c) -> None:
+    """Add the content columns to an articles table created with only id and url."""
+    existing = {row[1] for row in c.execute("PRAGMA table_info(articles)")}
+    for name, column_type in ARTICLE_COLUMNS:
+        if name not in existing:
+            c.execute(f"ALTER TABLE articles ADD COLUMN {name} {column_type}")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_articles_published_at ON articles (published_at)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_articles_collected_at ON articles (collected_at)")
+    c.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_articles_normalized_url ON articles (normalized_url)")
+
+    # Rows whose normalized URL another row already has keep NULL; they stay reachable by their exact URL.
+    missing = c.execute("SELECT id, url FROM articles WHERE normalized_url IS NULL AND url IS NOT NULL").fetchall()
+    c.executemany("UPDATE OR IGNORE articles SET normalized_url = ? WHERE id = ?",
+                  [(normalize_url(url), article_id) for article_id, url in missing])
+
+
+def normalize_url(url: str) -> str:
+    """The form of an article URL used to recognize it again.
+
+    Lower-cases the scheme and host, and drops default ports, fragments, tracking
+    parameters and trailing slashes. The remaining query parameters are sorted.
+    """
+    scheme, netloc, path, query, _ = urlsplit(url.strip())
+    scheme = scheme.lower()
+    netloc = netloc.lower()
+    if ":" in netloc or "@" in netloc:
+        parts = urlsplit(f"//{netloc}")
+        host = parts.hostname or ""
+        if ":" in host:
+            host = f"[{host}]"
+        try:
+            port = parts.port
+        except ValueError:
+            port = None
+        netloc = host if port is None or DEFAULT_PORTS.get(scheme) == port else f"{host}:{port}"
+    path = path.rstrip("/") or "/"
+    if query:
+        query = urlencode(sorted((name, value) for name, value in parse_qsl(query, keep_blank_values=True)
+                                 if not TRACKING_PARAM.match(name)))
+    return urlunsplit((scheme, netloc, path, query, ""))
+
+
+def create_search_index(c) -> Optional[str]:
+    """Create the articles_fts index and its sync triggers. Returns the tokenizer used, or None without FTS5."""
+    exists = c.execute("SELECT 1 FROM sqlite_master WHERE name = 'articles_fts'").fetchone()
+    if not exists:
+        columns = ", ".join(FTS_COLUMNS)
+        for tokenizer in ("trigram", "unicode61"):
+            try:
+                c.execute(f"""CREATE VIRTUAL TABLE articles_fts USING fts5(
+                    {columns}, content='articles', content_rowid='id', tokenize='{tokenizer}'
+                )""")
+                break
+            except Exception:
+                continue
+        else:
+            return None
+        c.execute("INSERT INTO articles_fts(articles_fts) VALUES ('rebuild')")
+
+    new_values = ", ".join(f"new.{name}" for name in FTS_COLUMNS)
+    old_values = ", ".join(f"old.{name}" for name in FTS_COLUMNS)
+    columns = ", ".join(FTS_COLUMNS)
+    c.execute(f"""CREATE TRIGGER IF NOT EXISTS articles_fts_insert AFTER INSERT ON articles BEGIN
+        INSERT INTO articles_fts (rowid, {columns}) VALUES (new.id, {new_values});
+    END""")
+    c.execute(f"""CREATE TRIGGER IF NOT EXISTS articles_fts_delete AFTER DELETE ON articles BEGIN
+        INSERT INTO articles_fts (articles_fts, rowid, {columns}) VALUES ('delete', old.id, {old_values});
+    END""")
+    # Only changes to indexed columns reindex a row; processed fields are updated on every ingest.
+    c.execute("DROP TRIGGER IF EXISTS articles_fts_update")
+    c.execute(f"""CREATE TRIGGER articles_fts_update AFTER UPDATE OF {columns} ON articles BEGIN
+        INSERT INTO articles_fts (articles_fts, rowid, {columns}) VALUES ('delete', old.id, {old_values});
+        INSERT INTO articles_fts (rowid, {columns}) VALUES (new.id, {new_values});
+    END""")
+    return search_tokenizer(c)
+
+
+def search_tokenizer(conn) -> Optional[str]:
+    """Return the tokenizer of the articles_fts index, or None if there is no index."""
+    row = conn.execute("SELECT sql FROM sqlite_master WHERE name = 'articles_fts'").fetchone()
+    if not row:
+        return None
+    return "trigram" if "trigram" in row[0] else "unicode61"
+
+
+def normalize_published_date(value: str) -> Optional[str]:
+    """Turn an RSS (RFC 822), ISO or Japanese numeric date into YYYY-MM-DD, or None if unparseable."""
+    value = (value or "").strip()
+    if not value:
+        return None
+
+    try:
+        parsed = parsedate_to_datetime(value)
+        if parsed.tzinfo:
+            parsed = parsed.astimezone(timezone.utc)
+        return parsed.date().isoformat()
+    except (TypeError, ValueError, IndexError):
+        pass
+
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).date().isoformat()
+    except ValueError:
+        pass
+
+    match = NUMERIC_DATE.search(value)
+    if match:
+        try:
+            return datetime(*(int(part) for part in match.groups())).date().isoformat()
+        except ValueError:
+            return None
+    return None
+
+
+def _article_row(article: Dict[str, Any], normalized_url: str, collected_at: str) -> Tuple:
+    topics = article.get("topics")
+    return (
+        article["url"],
+        normalized_url,
+        article.get("title", ""),
+        article.get("content", ""),
+        article.get("source", ""),
+        article.get("category", ""),
+        article.get("published_date", ""),
+        normalize_published_date(article.get("published_date", "")),
+        collected_at,
+        article.get("processed_at"),
+        article.get("word_count"),
+        article.get("sentiment"),
+        json.dumps(topics, ensure_ascii=False) if topics is not None else None,
+    )
+
+
+def _lookup(conn, sql: str, keys: List[str]) -> List[Any]:
+    rows = []
+    for start in range(0, len(keys), LOOKUP_CHUNK):
+        chunk = keys[start:start + LOOKUP_CHUNK]
+        rows.extend(conn.execute(sql.format(placeholders=", ".join("?" * len(chunk))), chunk).fetchall())
+    return rows
+
+
+def upsert_articles(conn, articles: List[Dict[str, Any]]) -> List[Tuple[Optional[int], bool]]:
+    """Save collected articles with one executemany upsert, keyed on their normalized URL.
+
+    New URLs are inserted. URLs registered without content get the collected fields,
+    and stored content is otherwise kept. Processed fields (`processed_at`,
+    `word_count`, `sentiment`, `topics`) are refreshed whenever an article has them.
+    Returns, per article, its id (None if it has no URL) and whether a new row was
+    created for it. Articles repeating an earlier URL in the batch map to that row.
+    The caller commits.
+    """
+    collected_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    keys = [normalize_url(article["url"]) if article.get("url") else None for article in articles]
+    unique = list(dict.fromkeys(key for key in keys if key))
+
+    existing = {row["normalized_url"] for row in _lookup(
+        conn, "SELECT normalized_url FROM articles WHERE normalized_url IN ({placeholders})", unique)}
+    # Rows registered by exact URL only (no normalized form yet) are updated, not created.
+    existing.update(normalize_url(row["url"]) for row in _lookup(
+        conn, "SELECT url FROM articles WHERE normalized_url IS NULL AND url IN ({placeholders})",
+        [article["url"] for article in articles if article.get("url")]))
+    rows, seen = [], set()
+    for article, key in zip(articles, keys):
+        if key and key not in seen:
+            seen.add(key)
+            rows.append(_article_row(article, key, collected_at))
+    conn.executemany(UPSERT_SQL, rows)
+
+    ids = {row["normalized_url"]: row["id"] for row in _lookup(
+        conn, "SELECT id, normalized_url FROM articles WHERE normalized_url IN ({placeholders})", unique)}
+    results = []
+    for key in keys:
+        created = key is not None and key not in existing
+        if created:
+            existing.add(key)
+        results.append((ids.get(key) if key else None, created))
+    return results
+
+
+def stored_texts(conn, ids: List[int]) -> Dict[int, str]:
+    """Relevance text (content, then title) of the articles among `ids` that have stored content."""
+    return {row["id"]: row["content"] + " " + (row["title"] or "") for row in _lookup(
+        conn, "SELECT id, title, content FROM articles WHERE content IS NOT NULL AND id IN ({placeholders})", ids)}
+
+
+def stored_article(conn, url: str) -> Optional[Dict[str, Any]]:
+    """An article's stored record, shaped like NewsCollector.fetch_article_content's, or None if only its URL is known."""
+    row = conn.execute("SELECT url, title, content, source FROM articles WHERE normalized_url = ? OR url = ?",
+                       (normalize_url(url), url)).fetchone()
+    if not row or row["content"] is None:
+        return None
+    return {"title": row["title"] or "", "content": row["content"], "url": row["url"],
+            "source": row["source"] or row["url"], "author": "Unknown"}
+
+
+def stored_article_text(conn, url: str) -> Optional[str]:
+    """Return an article's stored content and title as relevance text, or None if only its URL is known."""
+    article = stored_article(conn, url)
+    if article is None:
+        return None
+    return article["content"] + " " + article["title"]
+
+
+def _fts_query(terms: List[str]) -> str:
+    return " ".join('"' + term.replace('"', '""') + '"' for term in terms)
+
+
+def _like_pattern(term: str) -> str:
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _snippet(text: str, term: str, width: int = 40) -> str:
+    position = text.lower().find(term.lower())
+    if position < 0:
+        return text[:width * 2]
+    start = max(0, position - width)
+    end = min(len(text), position + len(term) + width)
+    return (
+        ("…" if start > 0 else "")
+        + text[start:position] + "<mark>" + text[position:position + len(term)] + "</mark>"
+        + text[position + len(term):end]
+        + ("…" if end < len(text) else "")
+    )
+
+
+def search_articles(conn, query: str, since: Optional[str] = None, until: Optional[str] = None,
+                    category: Optional[str] = None, limit: int = 20) -> List[Dict[str, Any]]:
+    """Search stored articles, best matches first.
+
+    Uses the FTS5 index with bm25 ranking when every term is long enough for the
+    trigram tokenizer, and a LIKE scan otherwise. `since` and `until` are inclusive
+    YYYY-MM-DD bounds on the published date, falling back to the collection date.
+    """
+    terms = query.split()
+    if not terms:
+        return []
+
+    filters, params = [], []
+    date_column = "COALESCE(a.published_at, substr(a.collected_at, 1, 10))"
+    if since:
+        filters.append(f"{date_column} >= ?")
+        params.append(since)
+    if until:
+        filters.append(f"{date_column} <= ?")
+        params.append(until)
+    if category:
+        filters.append("a.category = ?")
+        params.append(category)
+
+    columns = "a.id, a.url, a.title, a.source, a.category, a.published_date, a.published_at"
+    use_fts = (search_tokenizer(conn) == "trigram"
+               and all(len(term) >= TRIGRAM_MIN_LENGTH for term in terms))
+
+    if use_fts:
+        where = " AND ".join(["articles_fts MATCH ?"] + filters)
+        weights = ", ".join(str(weight) for weight in FTS_WEIGHTS)
+        rows = conn.execute(
+            f"""SELECT {columns},
+                       snippet(articles_fts, -1, '<mark>', '</mark>', '…', 24) AS snippet,
+                       bm25(articles_fts, {weights}) AS rank
+                FROM articles_fts JOIN articles a ON a.id = articles_fts.rowid
+                WHERE {where}
+                ORDER BY rank LIMIT ?""",
+            (_fts_query(terms), *params, limit),
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    term_filters = ["(a.title LIKE ? ESCAPE '\\' OR a.content LIKE ? ESCAPE '\\')"] * len(terms)
+    term_params = [pattern for term in terms for pattern in (_like_pattern(term), _like_pattern(term))]
+
+    rows = conn.execute(
+        f"""SELECT {columns}, a.content FROM articles a
+            WHERE {" AND ".join(term_filters + filters)}
+            ORDER BY {date_column} DESC, a.id DESC LIMIT ?""",
+        (*term_params, *params, limit),
+    ).fetchall()
+
+    results = []
+    for row in rows:
+        result = dict(row)
+        content = result.pop("content") or ""
+        title = result["title"] or ""
+        text = content if terms[0].lower() in content.lower() else title
+        result["snippet"] = _snippet(text, terms[0])
+        result["rank"] = 0.0
+        results.append(result)
+    return results
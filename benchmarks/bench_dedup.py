@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""Benchmark near-duplicate lookups against a large persisted signature index."""
+
+import sys
+import os
+import random
+import tempfile
+import shutil
+import time
+from array import array
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dedup import NUM_PERMUTATIONS, Deduplicator, minhash
+
+STORED_SIGNATURES = 200_000
+LOOKUPS = 2_000
+
+
+def random_signature(rng: random.Random) -> array:
+    return array("I", (rng.getrandbits(32) for _ in range(NUM_PERMUTATIONS)))
+
+
+def main() -> None:
+    rng = random.Random(42)
+    test_dir = tempfile.mkdtemp()
+    try:
+        deduplicator = Deduplicator(os.path.join(test_dir, "state.db"))
+
+        start = time.perf_counter()
+        signatures = []
+        for index in range(STORED_SIGNATURES):
+            signature = random_signature(rng)
+            if index % (STORED_SIGNATURES // LOOKUPS) == 0:
+                signatures.append(signature)
+            deduplicator._store(f"https://example.jp/{index}", f"https://example.jp/{index}", signature, 0.0)
+        deduplicator._conn.commit()
+        print(f"Indexed {STORED_SIGNATURES:,} signatures in {time.perf_counter() - start:.1f}s")
+
+        queries = [random_signature(rng) for _ in range(LOOKUPS // 2)]
+        for signature in signatures[:LOOKUPS // 2]:
+            near = array("I", signature)
+            for position in rng.sample(range(NUM_PERMUTATIONS), 6):
+                near[position] = rng.getrandbits(32)
+            queries.append(near)
+
+        start = time.perf_counter()
+        found = sum(1 for signature in queries if deduplicator.find(signature))
+        elapsed = time.perf_counter() - start
+        print(f"{len(queries):,} lookups: {elapsed / len(queries) * 1e6:.0f} µs each, {found} near-duplicates found")
+
+        text = "経済産業省は系統用蓄電池の導入を支援する補助金の公募を開始すると発表した。" * 4
+        runs = 500
+        start = time.perf_counter()
+        for _ in range(runs):
+            minhash(text)
+        print(f"MinHash of a {len(text)}-character article: {(time.perf_counter() - start) / runs * 1e6:.0f} µs")
+    finally:
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""Micro-benchmark for Japanese script detection in NewsProcessor."""
+
+import sys
+import os
+import timeit
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from news_processor import NewsProcessor
+
+
+def legacy_contains_japanese(text: str) -> bool:
+    """The original per-character ord() loop, kept as the baseline."""
+    japanese_ranges = [
+        (0x3040, 0x309F),
+        (0x30A0, 0x30FF),
+        (0x4E00, 0x9FAF),
+    ]
+
+    for char in text:
+        char_code = ord(char)
+        for start, end in japanese_ranges:
+            if start <= char_code <= end:
+                return True
+    return False
+
+
+SAMPLES = {
+    "english_article": (
+        "Japan's grid operators approved new rules for battery storage interconnection, "
+        "opening the way for merchant projects to bid into the balancing market. "
+    ) * 60,
+    "japanese_article": "系統用蓄電池の導入が進み、太陽光発電との併設案件が増えている。" * 60,
+    "english_with_trailing_kanji": ("Solar PPA pipeline update for Q3. " * 150) + "蓄電池",
+}
+
+
+def main() -> None:
+    config = Config.load_from_file(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config.example.json"))
+    processor = NewsProcessor(config)
+    number = 2000
+
+    print(f"{'sample':32} {'chars':>7} {'legacy µs':>11} {'regex µs':>10} {'stats µs':>10} {'speedup':>8}")
+    for name, text in SAMPLES.items():
+        assert legacy_contains_japanese(text) == processor._contains_japanese(text)
+        legacy = timeit.timeit(lambda: legacy_contains_japanese(text), number=number) / number * 1e6
+        regex = timeit.timeit(lambda: processor._contains_japanese(text), number=number) / number * 1e6
+        stats = timeit.timeit(lambda: processor.japanese_stats(text), number=number) / number * 1e6
+        print(f"{name:32} {len(text):>7} {legacy:>11.1f} {regex:>10.1f} {stats:>10.1f} {legacy / regex:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
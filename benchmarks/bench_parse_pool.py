@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""Benchmark the parse stage: parsing in fetch threads vs handing bytes to a process pool.
+
+Fetch threads are simulated by a thread pool that already holds the downloaded
+bytes, so the numbers show parse throughput alone. Process workers only pay off
+with more than one core; run this on the host the bot will use.
+"""
+
+import sys
+import os
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_scrape import SOURCE, index_page
+from fixtures import render_article
+from parse_pool import ParsePool, parse_article, parse_scrape
+
+FETCH_THREADS = 8
+
+
+def pages(count: int):
+    """Alternate scrape index pages and article pages, one article host per page so none is known in advance."""
+    index = index_page()
+    for i in range(count):
+        if i % 2:
+            yield parse_scrape, (index, SOURCE, "html.parser")
+        else:
+            yield parse_article, (render_article(f"site{i}", i), None, "html.parser")
+
+
+def run(count: int, pool: ParsePool = None) -> float:
+    """Seconds to parse `count` pages from FETCH_THREADS threads, in the threads or on the pool."""
+    def parse(job):
+        function, args = job
+        return pool.run(function, *args) if pool else function(*args)
+
+    jobs = list(pages(count))
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=FETCH_THREADS) as executor:
+        list(executor.map(parse, jobs))
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=64, help="pages to parse per run")
+    parser.add_argument("--workers", default=",".join(str(n) for n in sorted({2, os.cpu_count() or 1})),
+                        help="comma-separated parse_workers values to compare")
+    args = parser.parse_args()
+
+    print(f"{args.pages} pages, {FETCH_THREADS} fetch threads, {os.cpu_count()} CPUs\n")
+    threaded = run(args.pages)
+    print(f"{'threaded (parse_workers=0)':<28} {threaded:7.2f}s  {args.pages / threaded:7.1f} pages/s")
+    for workers in (int(value) for value in args.workers.split(",")):
+        pool = ParsePool(workers)
+        try:
+            run(workers * 2, pool)  # start the workers and import the parsers
+            elapsed = run(args.pages, pool)
+        finally:
+            pool.close()
+        print(f"{f'parse_workers={workers}':<28} {elapsed:7.2f}s  {args.pages / elapsed:7.1f} pages/s  "
+              f"({threaded / elapsed:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""Benchmark the collection pipeline and API against a local replay of the configured sources.
+
+Every source in config.example.json is rewritten to a local stand-in server (see
+fixtures.py) that serves its feed or page with enough items to reach each target
+article count. The script times collect_news, process_articles, keyword scoring
+and the main API endpoints, and writes the timings as JSON so runs on different
+commits can be compared:
+
+    python benchmarks/bench_pipeline.py --sizes 10,1000
+    python benchmarks/bench_pipeline.py --compare benchmarks/results/<older commit>.json
+
+Run with --record to save live responses of the RSS sources into
+benchmarks/recordings/; recorded feeds are replayed instead of generated ones.
+"""
+
+import sys
+import os
+import argparse
+import json
+import logging
+import math
+import platform
+import shutil
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from config import Config
+from fixtures import FIXTURE_DIR, FixtureServer, source_key, source_slug
+from news_collector import NewsCollector
+from news_processor import NewsProcessor
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(REPO_DIR, "benchmarks", "results")
+DEFAULT_SIZES = [10, 1000, 100000]
+# Sizes up to this are timed as the best of several runs; larger ones run once.
+REPEAT_MAX_SIZE = 1000
+REPEATS = 3
+# /api/pickup-results fetches every article page, so it is skipped above this size.
+PICKUP_MAX_SIZE = 1000
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def load_example_config() -> Dict[str, Any]:
+    with open(os.path.join(REPO_DIR, "config.example.json"), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def localized_config(config_data: Dict[str, Any], server: FixtureServer, work_dir: str,
+                     items_per_source: int) -> Dict[str, Any]:
+    """Point every source and the webhook at the fixture server, keeping names and selectors."""
+    data = json.loads(json.dumps(config_data))
+    for key in ("rss_feeds", "government_rss_feeds", "market_rss_feeds", "municipality_rss_feeds"):
+        data[key] = [server.url_for("rss", feed) for feed in data.get(key, [])]
+    for key in ("government_scrape_sources", "market_scrape_sources", "municipality_scrape_sources"):
+        data[key] = [dict(source, url=server.url_for("scrape", source)) for source in data.get(key, [])]
+    data["teams_webhook_url"] = f"{server.base_url}/webhook"
+    data["max_articles_per_source"] = items_per_source
+    data["collection_deadline_seconds"] = 3600.0
+    data["state_db_path"] = os.path.join(work_dir, "state.db")
+    # Every run should parse the fixtures rather than replay cached results.
+    data["conditional_requests"] = False
+    data["content_cache_enabled"] = False
+    return data
+
+
+def collection_tasks(config_data: Dict[str, Any]) -> List[tuple]:
+    return NewsCollector(Config(**config_data)).collection_tasks()
+
+
+def timed(function: Callable[[], Any], repeats: int) -> tuple:
+    """Best wall time of `repeats` calls, and the last call's result."""
+    best, result = math.inf, None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+class Recorder:
+    """Collects timings for one size and prints them as they come in."""
+
+    def __init__(self, size: int):
+        self.size = size
+        self.results: List[Dict[str, Any]] = []
+
+    def add(self, name: str, seconds: float, items: int) -> None:
+        self.results.append({"name": name, "size": self.size, "seconds": seconds, "items": items})
+        per_item = f"{seconds / items * 1e6:10.1f} µs/item" if items else ""
+        print(f"  {name:<38} {seconds * 1000:10.1f} ms  {items:>7} items {per_item}")
+
+
+def bench_pipeline(config: Config, recorder: Recorder, repeats: int) -> List[Dict[str, Any]]:
+    collector = NewsCollector(config)
+    seconds, articles = timed(collector.collect_news, repeats)
+    recorder.add("collect_news", seconds, len(articles))
+
+    processor = NewsProcessor(config)
+    seconds, processed = timed(lambda: processor.process_articles(articles), repeats)
+    recorder.add("process_articles", seconds, len(articles))
+    print(f"  ({len(processed)} of {len(articles)} articles passed filtering)")
+    return articles
+
+
+def bench_scoring(articles: List[Dict[str, Any]], recorder: Recorder, repeats: int) -> None:
+    import api
+    from relevance import article_text, get_relevance_matcher, score_content
+
+    conn = api.get_db_connection()
+    try:
+        seconds, matcher = timed(lambda: get_relevance_matcher(conn), 1)
+        recorder.add("relevance_matcher_load", seconds, len(matcher))
+        texts = [article_text(article) for article in articles]
+        seconds, _ = timed(lambda: [score_content(matcher, text) for text in texts], repeats)
+        recorder.add("score_content", seconds, len(texts))
+    finally:
+        conn.close()
+
+
+def bench_api(client, size: int, recorder: Recorder, repeats: int) -> None:
+    def call(method: str, path: str, **kwargs) -> Any:
+        response = client.request(method, path, **kwargs)
+        response.raise_for_status()
+        return response
+
+    seconds, response = timed(lambda: call("POST", "/api/process-articles/"), 1)
+    recorder.add("POST /api/process-articles/", seconds, response.json()["collected_articles"])
+
+    endpoints = [
+        ("GET /api/articles", "/api/articles", {}),
+        ("GET /api/articles ndjson", "/api/articles", {"format": "ndjson"}),
+        ("GET /api/articles page", "/api/articles", {"limit": 100}),
+        ("GET /api/search", "/api/search", {"q": "蓄電池"}),
+        ("GET /api/keywords", "/api/keywords", {}),
+    ]
+    for name, path, params in endpoints:
+        seconds, response = timed(lambda: call("GET", path, params=params), repeats)
+        items = len(response.text.splitlines()) if params.get("format") == "ndjson" else len(response.json())
+        recorder.add(name, seconds, items)
+
+    seconds, _ = timed(lambda: call("GET", "/api/articles/1/relevance"), repeats)
+    recorder.add("GET /api/articles/{id}/relevance", seconds, 1)
+
+    seconds, response = timed(lambda: call("POST", "/api/teams/post-high-relevance/", params={"threshold": 0.0}), 1)
+    recorder.add("POST /api/teams/post-high-relevance/", seconds, response.json()["total_high_relevance"])
+
+    if size <= PICKUP_MAX_SIZE:
+        seconds, response = timed(lambda: call("GET", "/api/pickup-results"), 1)
+        recorder.add("GET /api/pickup-results", seconds, len(response.json()))
+
+
+def run_size(config_data: Dict[str, Any], size: int) -> List[Dict[str, Any]]:
+    tasks = collection_tasks(config_data)
+    repeats = REPEATS if size <= REPEAT_MAX_SIZE else 1
+    recorder = Recorder(size)
+    print(f"\n{size:,} articles from {len(tasks)} sources")
+
+    work_dir = tempfile.mkdtemp()
+    saved_cwd = os.getcwd()
+    saved_env = {key: os.environ.get(key) for key in ("DB_PATH", "DISABLE_SEEDING")}
+    with FixtureServer(tasks, size) as server:
+        try:
+            data = localized_config(config_data, server, work_dir, max(server.item_counts))
+            with open(os.path.join(work_dir, "config.json"), "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+
+            articles = bench_pipeline(Config(**data), recorder, repeats)
+
+            # The API reads config.json from the working directory and DB_PATH from the environment.
+            os.chdir(work_dir)
+            os.environ["DB_PATH"] = os.path.join(work_dir, "news.db")
+            os.environ.pop("DISABLE_SEEDING", None)
+            from fastapi.testclient import TestClient
+            import api
+            with TestClient(api.app) as client:
+                bench_scoring(articles, recorder, repeats)
+                bench_api(client, size, recorder, repeats)
+        finally:
+            os.chdir(saved_cwd)
+            for key, value in saved_env.items():
+                if value is None:
+                    os.environ.pop(key, None)
+                else:
+                    os.environ[key] = value
+            shutil.rmtree(work_dir, ignore_errors=True)
+    return recorder.results
+
+
+def record_fixtures(config_data: Dict[str, Any]) -> None:
+    """Save live responses of the configured RSS feeds for replay."""
+    import requests
+
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    for kind, source, _ in collection_tasks(config_data):
+        if kind != "rss":
+            continue
+        path = os.path.join(FIXTURE_DIR, f"{source_slug(source_key(kind, source))}.xml")
+        try:
+            response = requests.get(source, timeout=30)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            print(f"Skipped {source}: {e}")
+            continue
+        with open(path, "wb") as f:
+            f.write(response.content)
+        print(f"Recorded {source} -> {os.path.relpath(path, REPO_DIR)}")
+
+
+def compare(results: List[Dict[str, Any]], baseline_path: str) -> None:
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    previous = {(entry["name"], entry["size"]): entry["seconds"] for entry in baseline["results"]}
+
+    print(f"\nCompared with {baseline.get('commit', baseline_path)}:")
+    for entry in results:
+        before = previous.get((entry["name"], entry["size"]))
+        if not before:
+            continue
+        ratio = entry["seconds"] / before
+        flag = "  slower" if ratio > 1.2 else "  faster" if ratio < 0.8 else ""
+        print(f"  {entry['name']:<38} {entry['size']:>7}  {before * 1000:10.1f} -> "
+              f"{entry['seconds'] * 1000:10.1f} ms  x{ratio:.2f}{flag}")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default=",".join(str(size) for size in DEFAULT_SIZES),
+                        help="comma-separated article counts to benchmark")
+    parser.add_argument("--output", help="results file (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    parser.add_argument("--record", action="store_true", help="record live RSS responses and exit")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    config_data = load_example_config()
+    if args.record:
+        record_fixtures(config_data)
+        return
+
+    commit = git_commit()
+    results = []
+    for size in [int(size) for size in args.sizes.split(",") if size.strip()]:
+        results.extend(run_size(config_data, size))
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({
+            "commit": commit,
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "results": results,
+        }, f, ensure_ascii=False, indent=2)
+    print(f"\nWrote {len(results)} timings to {os.path.relpath(output)}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""Benchmark scraping a large government index page: per-item selector strings vs compiled plans."""
+
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+from selector_plan import available_backends, plan_for
+
+SOURCE = {
+    "name": "経済産業省 資源エネルギー庁",
+    "url": "https://www.enecho.meti.go.jp/about/whatsnew/",
+    "news_selector": ".news-list .news-item",
+    "title_selector": ".news-title",
+    "link_selector": "a",
+    "date_selector": ".news-date",
+}
+ITEMS = 300
+RUNS = 10
+
+
+def index_page() -> bytes:
+    """An index page with a large menu, inline scripts and footer around the news list."""
+    menu = "".join(f"<li><a href='/menu/{i}'>メニュー項目{i}</a><ul><li><a href='/sub/{i}'>下位{i}</a></li></ul></li>"
+                   for i in range(1500))
+    script = "<script>" + "var data = {'key': 'value'};" * 3000 + "</script>"
+    items = "".join(f"<div class='news-item'><span class='news-date'>2024年1月{i % 28 + 1}日</span>"
+                    f"<a class='news-title' href='/about/whatsnew/{i}.html'>再生可能エネルギーに関するお知らせ{i}</a></div>"
+                    for i in range(ITEMS))
+    footer = "<footer>" + "<p>サイトマップ リンク</p>" * 1000 + "</footer>"
+    html = f"<html><head>{script}</head><body><nav><ul>{menu}</ul></nav><div class='news-list'>{items}</div>{footer}</body></html>"
+    return html.encode("utf-8")
+
+
+def legacy_scrape(content: bytes) -> int:
+    count = 0
+    for item in BeautifulSoup(content, "html.parser").select(SOURCE["news_selector"]):
+        title_elem = item if SOURCE["title_selector"] == "self" else item.select_one(SOURCE["title_selector"])
+        link_elem = item if SOURCE["link_selector"] == "self" else item.select_one(SOURCE["link_selector"])
+        date_elem = item.select_one(SOURCE["date_selector"]) if SOURCE["date_selector"] else None
+        if title_elem and link_elem:
+            title_elem.get_text(strip=True), link_elem.get("href", "")
+            date_elem.get_text(strip=True) if date_elem else ""
+            count += 1
+    return count
+
+
+def bench(label: str, function) -> None:
+    start = time.perf_counter()
+    for _ in range(RUNS):
+        count = function()
+    elapsed = (time.perf_counter() - start) / RUNS
+    print(f"{label:<36} {elapsed * 1000:8.1f} ms per page ({count} items)")
+
+
+def main() -> None:
+    content = index_page()
+    print(f"Index page: {len(content) / 1024:.0f} KB, {ITEMS} news items\n")
+
+    bench("html.parser, per-item selectors", lambda: legacy_scrape(content))
+    plan = plan_for(SOURCE)
+    for backend in available_backends():
+        bench(f"{backend}, compiled plan", lambda: len(plan.extract(content, SOURCE["url"], backend)))
+
+
+if __name__ == "__main__":
+    main()
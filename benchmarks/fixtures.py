@@ -0,0 +1,194 @@
+"""Source fixtures and a local stand-in HTTP server for the pipeline benchmarks.
+
+Each source in config.example.json is served from http://127.0.0.1:<port>/source/<slug>.
+A response recorded with `bench_pipeline.py --record` (saved in benchmarks/recordings/)
+is replayed with its items repeated up to the requested count. Sources without a
+recording get generated RSS or HTML in the shape of that source's markup. Article
+links point back at the server, so fetch_article_content can be exercised too.
+"""
+
+import os
+import random
+import re
+import threading
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Tuple
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "recordings")
+
+TITLES_JA = [
+    "系統用蓄電池の導入補助金、公募を開始",
+    "太陽光発電の出力抑制が過去最大に",
+    "コーポレートPPAの契約件数が増加",
+    "洋上風力発電の新たな公募区域を指定",
+    "電力需給ひっ迫警報の運用を見直し",
+    "容量市場のメインオークション結果を公表",
+    "水素・アンモニア発電の実証を拡大",
+    "地域新電力の経営状況に関する調査",
+]
+TITLES_EN = [
+    "Japan approves new grid storage rules",
+    "Solar power auction results announced",
+    "Corporate PPA market grows in Asia",
+    "Sponsored content: best solar panels",
+    "Renewable energy investment hits record",
+]
+BODY_JA = ("経済産業省は、再生可能エネルギーの主力電源化に向けて系統用蓄電池の導入を支援する。"
+           "太陽光発電の出力抑制が増える中、需給調整力の確保が課題となっている。")
+# Item descriptions are drawn from these so generated articles are not near-duplicates of each other.
+TERMS_JA = [
+    "経済産業省", "資源エネルギー庁", "電力広域的運営推進機関", "日本卸電力取引所", "系統用蓄電池",
+    "太陽光発電", "洋上風力", "地熱発電", "バイオマス", "水素", "アンモニア", "出力抑制", "需給調整市場",
+    "容量市場", "非化石証書", "再エネ賦課金", "FIP制度", "コーポレートPPA", "送配電網", "連系線",
+    "スポット価格", "インバランス", "小売電気事業者", "発電事業者", "自治体", "脱炭素先行地域",
+    "補助金", "公募", "実証事業", "入札", "導入目標", "電源構成", "卸電力価格", "需要家", "設備容量",
+]
+
+
+def source_slug(key: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", key.lower()).strip("-")[:60]
+
+
+def source_key(kind: str, source: Any) -> str:
+    return source if kind == "rss" else source["name"]
+
+
+def _items(slug: str, count: int, base_url: str, seed: int) -> List[Tuple[str, str, str]]:
+    rng = random.Random(f"{slug}:{seed}")
+    items = []
+    for index in range(count):
+        title = f"{rng.choice(TITLES_JA + TITLES_EN)}：{'・'.join(rng.sample(TERMS_JA, 3))}"
+        body = "、".join(rng.choice(TERMS_JA) for _ in range(24)) + f"について{rng.randint(1, 9999)}件を公表した。"
+        items.append((f"{title} ({slug} #{index})", f"{base_url}/article/{slug}/{index}", body))
+    return items
+
+
+def render_rss(slug: str, count: int, base_url: str, seed: int = 0) -> bytes:
+    """An RSS 2.0 feed with `count` items."""
+    entries = "".join(
+        f"<item><title>{escape(title)}</title><link>{escape(link)}</link>"
+        f"<description>{escape(body)}</description><pubDate>Mon, 15 Jan 2024 09:00:00 +0900</pubDate></item>"
+        for title, link, body in _items(slug, count, base_url, seed)
+    )
+    return (f'<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+            f"<title>{slug}</title><link>{base_url}</link>{entries}</channel></rss>").encode("utf-8")
+
+
+def render_scrape_page(source: Dict[str, Any], count: int, base_url: str, seed: int = 0) -> bytes:
+    """An HTML page whose markup matches the source's configured selectors."""
+    slug = source_slug(source["name"])
+    items = _items(slug, count, base_url, seed)
+    news_selector = source["news_selector"]
+
+    if news_selector.startswith(".news-list"):
+        rows = "".join(
+            f'<div class="news-item"><span class="news-date">2024.01.15</span>'
+            f'<a class="news-title" href="{escape(link)}">{escape(title)}</a></div>'
+            for title, link, _ in items
+        )
+        body = f'<div class="news-list">{rows}</div>'
+    elif news_selector.startswith(".news-section"):
+        rows = "".join(f'<a href="{escape(link)}">{escape(title)}</a>' for title, link, _ in items)
+        body = f'<div class="news-section">{rows}</div>'
+    else:
+        rows = "".join(f'<li><a href="{escape(link)}">{escape(title)}</a></li>' for title, link, _ in items)
+        body = f"<main><ul>{rows}</ul></main>"
+
+    return (f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>{escape(source['name'])}</title>"
+            f"<script>var tracking = true;</script></head><body><nav>menu</nav>{body}"
+            f"<footer>footer</footer></body></html>").encode("utf-8")
+
+
+def render_article(slug: str, index: int) -> bytes:
+    """An article page for fetch_article_content."""
+    paragraphs = "".join(f"<p>{BODY_JA}</p>" for _ in range(8))
+    return (f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>{slug} {index}</title></head>"
+            f"<body><nav>menu</nav><article><h1>{TITLES_JA[index % len(TITLES_JA)]} ({slug} #{index})</h1>"
+            f"{paragraphs}</article><footer>footer</footer></body></html>").encode("utf-8")
+
+
+def _replay_recording(body: bytes, count: int) -> bytes:
+    """Repeat the items of a recorded RSS feed until it has `count` of them, each with its own link."""
+    text = body.decode("utf-8", errors="replace")
+    items = re.findall(r"<item\b.*?</item>", text, flags=re.S)
+    if not items:
+        return body
+    repeated = "".join(
+        items[i % len(items)].replace("</link>", f"?replay={i}</link>", 1) for i in range(count)
+    )
+    start = text.index(items[0])
+    end = text.rindex(items[-1]) + len(items[-1])
+    return (text[:start] + repeated + text[end:]).encode("utf-8")
+
+
+class FixtureServer:
+    """Serves the given sources with `total_items` items between them, plus article pages and a webhook."""
+
+    def __init__(self, tasks: List[Tuple[str, Any, str]], total_items: int, seed: int = 0):
+        self.tasks = tasks
+        self.seed = seed
+        share, remainder = divmod(total_items, max(1, len(tasks)))
+        self.item_counts = [share + (index < remainder) for index in range(len(tasks))]
+        self.webhook_posts = 0
+        self._bodies: Dict[str, bytes] = {}
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        for (kind, source, _), count in zip(tasks, self.item_counts):
+            slug = source_slug(source_key(kind, source))
+            self._bodies[slug] = self._render(kind, source, slug, count)
+
+    def url_for(self, kind: str, source: Any) -> str:
+        return f"{self.base_url}/source/{source_slug(source_key(kind, source))}"
+
+    def __enter__(self) -> "FixtureServer":
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _render(self, kind: str, source: Any, slug: str, count: int) -> bytes:
+        recording = os.path.join(FIXTURE_DIR, f"{slug}.xml")
+        if kind == "rss" and os.path.exists(recording):
+            with open(recording, "rb") as f:
+                return _replay_recording(f.read(), count)
+        if kind == "rss":
+            return render_rss(slug, count, self.base_url, self.seed)
+        return render_scrape_page(source, count, self.base_url, self.seed)
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                parts = self.path.strip("/").split("/")
+                if parts[0] == "source" and len(parts) == 2 and parts[1] in server._bodies:
+                    body = server._bodies[parts[1]]
+                    content_type = "application/rss+xml" if body.lstrip().startswith(b"<?xml") else "text/html"
+                elif parts[0] == "article" and len(parts) == 3:
+                    body = render_article(parts[1], int(parts[2].split("#")[0] or 0))
+                    content_type = "text/html"
+                else:
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                server.webhook_posts += 1
+                self.send_response(200)
+                self.end_headers()
+                self.wfile.write(b"1")
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
@@ -1,7 +1,7 @@
 """Configuration management for the Energy News Bot."""
 
 import json
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Dict, List, Optional
 
@@ -33,6 +33,47 @@ class Config:
     keywords: List[str]
     japanese_keywords: List[str]
     exclude_keywords: List[str]
+    min_japanese_ratio: float = 0.0
+    
+    concurrent_collection: bool = True
+    max_concurrent_fetches: int = 8
+    max_fetches_per_host: int = 2
+    collection_deadline_seconds: float = 120.0
+    http_timeout_seconds: float = 10.0
+    http_max_connections: int = 20
+    http2: bool = True
+    source_timeout_seconds: Dict[str, float] = field(default_factory=dict)
+    max_response_bytes: int = 5 * 1024 * 1024
+    source_max_bytes: Dict[str, int] = field(default_factory=dict)
+    html_parser: str = "auto"
+    parse_workers: int = 0
+    incremental_feeds: bool = False
+    
+    state_db_path: str = "data/state.db"
+    conditional_requests: bool = True
+    content_cache_enabled: bool = True
+    content_cache_ttl_hours: float = 24.0
+    content_cache_max_entries: int = 10000
+    
+    dedup_enabled: bool = True
+    dedup_threshold: float = 0.8
+    
+    source_update_interval_hours: Dict[str, float] = field(default_factory=dict)
+    scheduler_jitter_ratio: float = 0.1
+    scheduler_max_backoff_hours: float = 24.0
+    scheduler_slow_source_seconds: float = 30.0
+    adaptive_polling: bool = True
+    polling_target_freshness: float = 0.8
+    polling_min_interval_minutes: float = 15.0
+    polling_max_interval_hours: float = 48.0
+    
+    teams_rate_per_second: float = 4.0
+    teams_burst: int = 4
+    teams_max_retries: int = 3
+    teams_backoff_seconds: float = 1.0
+    teams_outbox_batch_size: int = 10
+    teams_outbox_max_attempts: int = 5
+    teams_outbox_drain_interval_seconds: float = 60.0
     
     @classmethod
     def load_from_file(cls, config_path: str) -> "Config":
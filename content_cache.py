@@ -0,0 +1,125 @@
+"""Persistent cache of extracted article content."""
+
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from state_db import connect_state_db
+
+
+class ArticleContentCache:
+    """Stores extracted title and body per URL with a TTL and LRU eviction by entry count.
+
+    Reads do not write: access times are kept in memory and saved with the next
+    store or revalidation, which has to write anyway.
+    """
+
+    def __init__(self, db_path: str, ttl_seconds: float, max_entries: int):
+        """Open the cache in the given state database."""
+        self.logger = logging.getLogger(__name__)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._accessed: Dict[str, float] = {}
+        self._conn = connect_state_db(db_path)
+        with self._lock:
+            self._conn.execute('''CREATE TABLE IF NOT EXISTS article_content (
+                url TEXT PRIMARY KEY,
+                title TEXT,
+                content TEXT,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL,
+                accessed_at REAL
+            )''')
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_article_content_accessed_at ON article_content (accessed_at)"
+            )
+            self._conn.commit()
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """Return the cached entry for a URL and mark it as recently used."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT title, content, etag, last_modified, fetched_at FROM article_content WHERE url = ?",
+                (url,),
+            ).fetchone()
+            if not row:
+                return None
+            self._accessed[url] = time.time()
+        return dict(row)
+
+    def is_fresh(self, entry: Dict[str, Any]) -> bool:
+        """Check whether an entry is still within its TTL."""
+        return time.time() - entry["fetched_at"] < self.ttl_seconds
+
+    def request_headers(self, entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        """Build conditional GET headers for revalidating an entry."""
+        headers = {}
+        if entry:
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def revalidated(self, url: str, response: Any) -> None:
+        """Restart the TTL of an entry after the server answered 304 Not Modified."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                '''UPDATE article_content
+                   SET etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified),
+                       fetched_at = ?, accessed_at = ?
+                   WHERE url = ?''',
+                (response.headers.get("ETag"), response.headers.get("Last-Modified"), now, now, url),
+            )
+            self._save_accessed()
+            self._conn.commit()
+
+    def store(self, url: str, title: str, content: str, response: Any) -> None:
+        """Save freshly extracted content and evict the least recently used entries over the limit."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                '''INSERT OR REPLACE INTO article_content
+                   (url, title, content, etag, last_modified, fetched_at, accessed_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)''',
+                (url, title, content,
+                 response.headers.get("ETag"), response.headers.get("Last-Modified"),
+                 now, now),
+            )
+            self._save_accessed()
+
+            overflow = self._conn.execute("SELECT COUNT(*) FROM article_content").fetchone()[0] - self.max_entries
+            if overflow > 0:
+                self._conn.execute(
+                    '''DELETE FROM article_content WHERE url IN
+                       (SELECT url FROM article_content ORDER BY accessed_at ASC LIMIT ?)''',
+                    (overflow,),
+                )
+                self.logger.info(f"Evicted {overflow} entries from article content cache")
+            self._conn.commit()
+
+    def _save_accessed(self) -> None:
+        """Write the access times recorded by get() since the last write; the caller holds the lock and commits."""
+        accessed, self._accessed = self._accessed, {}
+        self._conn.executemany(
+            "UPDATE article_content SET accessed_at = MAX(accessed_at, ?) WHERE url = ?",
+            [(accessed_at, url) for url, accessed_at in accessed.items()],
+        )
+
+
+_caches: Dict[Tuple[str, float, int], ArticleContentCache] = {}
+_caches_lock = threading.Lock()
+
+
+def shared_content_cache(db_path: str, ttl_seconds: float, max_entries: int) -> ArticleContentCache:
+    """The process-wide cache for this state database and these limits."""
+    key = (db_path, ttl_seconds, max_entries)
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = _caches[key] = ArticleContentCache(*key)
+        return cache
@@ -0,0 +1,194 @@
+"""Main-content extraction for article pages, remembering which block holds the article on each site."""
+
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+
+TITLE_SELECTORS = ["h1", "title", ".title", "#title"]
+CONTENT_SELECTORS = ["article", ".content", ".article-content", ".post-content", "main", ".main"]
+# Subtrees that never hold article text.
+PRUNED_TAGS = ["script", "style", "noscript", "template", "iframe", "svg", "nav", "footer", "aside", "form"]
+TEXT_TAGS = ["p", "pre", "blockquote"]
+MIN_PARAGRAPH_CHARS = 20
+# Shorter text from a remembered block means the site's layout changed, so the page is scored again.
+MIN_CONTENT_CHARS = 40
+# Ids with digits are usually per-article (post-1234) and would not match the next page.
+PER_PAGE_ID = re.compile(r"\d")
+
+
+@dataclass
+class SiteBlock:
+    """The element that held the article on a site's last scored page."""
+
+    name: str
+    id: Optional[str] = None
+    classes: Tuple[str, ...] = ()
+    # Whether the title was found inside the block, so parsing can skip everything else.
+    title_inside: bool = False
+    compiled: Any = field(init=False, repr=False)
+
+    def __post_init__(self):
+        import soupsieve
+        self.compiled = soupsieve.compile(self.selector)
+
+    @property
+    def selector(self) -> str:
+        import soupsieve
+        if self.id:
+            return f"{self.name}#{soupsieve.escape(self.id)}"
+        return self.name + "".join("." + soupsieve.escape(name) for name in self.classes)
+
+    @classmethod
+    def describe(cls, element: Any, title_inside: bool) -> Optional["SiteBlock"]:
+        """A block that finds this element on other pages, or None if nothing identifies it."""
+        element_id = element.get("id")
+        if element_id and not PER_PAGE_ID.search(element_id):
+            return cls(element.name, id=element_id, title_inside=title_inside)
+        classes = tuple(element.get("class") or ())
+        if classes:
+            return cls(element.name, classes=classes, title_inside=title_inside)
+        if element.name in ("article", "main"):
+            return cls(element.name, title_inside=title_inside)
+        return None
+
+    def strainer(self) -> Any:
+        from bs4 import SoupStrainer
+
+        if self.id:
+            return SoupStrainer(self.name, attrs={"id": self.id})
+        if self.classes:
+            return SoupStrainer(self.name, attrs={"class": self.classes[0]})
+        return SoupStrainer(self.name)
+
+
+def _title(root: Any) -> str:
+    for selector in TITLE_SELECTORS:
+        element = root.select_one(selector)
+        if element:
+            return element.get_text(strip=True)
+    return ""
+
+
+def _prune(root: Any) -> None:
+    for element in root.find_all(PRUNED_TAGS):
+        element.decompose()
+
+
+def _densest_block(soup: Any) -> Optional[Any]:
+    """The element whose paragraphs hold the most non-link text.
+
+    Each paragraph of at least MIN_PARAGRAPH_CHARS scores its text length minus the
+    text of its links; the score goes to its parent in full and to its grandparent at
+    half, so the container of the article body wins over page-wide wrappers.
+    """
+    scores: Dict[int, list] = {}
+    for paragraph in soup.find_all(TEXT_TAGS):
+        text_length = len(paragraph.get_text(strip=True))
+        if text_length < MIN_PARAGRAPH_CHARS:
+            continue
+        link_length = sum(len(link.get_text(strip=True)) for link in paragraph.find_all("a"))
+        score = text_length - link_length
+        parent = paragraph.parent
+        for weight in (1.0, 0.5):
+            if parent is None or parent.name == "[document]":
+                break
+            entry = scores.setdefault(id(parent), [parent, 0.0])
+            entry[1] += score * weight
+            parent = parent.parent
+    if not scores:
+        return None
+    return max(scores.values(), key=lambda entry: entry[1])[0]
+
+
+def _extract_known(content: bytes, block: SiteBlock, parser: str) -> Optional[Tuple[str, str]]:
+    """Read a page through its site's remembered block; None if the block is missing or too short."""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(content, parser, parse_only=block.strainer() if block.title_inside else None)
+    element = block.compiled.select_one(soup)
+    if element is None:
+        return None
+    title = _title(element) if block.title_inside else _title(soup)
+    if block.title_inside and not title:
+        return None
+    _prune(element)
+    text = element.get_text(strip=True)
+    if len(text) < MIN_CONTENT_CHARS:
+        return None
+    return title, text
+
+
+def extract_article(content: bytes, block: Optional[SiteBlock],
+                    parser: str = "html.parser") -> Tuple[str, str, Optional[SiteBlock]]:
+    """Return the (title, body text) of an article page and the block to remember for its site.
+
+    `block` is the one remembered from the site's earlier pages, if any. It is read
+    first and comes back unchanged when it still fits; otherwise the page is scored
+    and the returned block is the new winner, or None when nothing identifies it.
+    Keeps no state, so it can run in a worker process.
+    """
+    if block:
+        extracted = _extract_known(content, block, parser)
+        if extracted:
+            return extracted + (block,)
+
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(content, parser)
+    title = _title(soup)
+    _prune(soup)
+
+    element = _densest_block(soup)
+    if element is not None:
+        site = SiteBlock.describe(element, title_inside=bool(title) and _title(element) == title)
+        return title, element.get_text(strip=True), site
+
+    for selector in CONTENT_SELECTORS:
+        element = soup.select_one(selector)
+        if element and element.get_text(strip=True):
+            return title, element.get_text(strip=True), block
+    body = soup.body or soup
+    return title, body.get_text(strip=True), block
+
+
+class ContentExtractor:
+    """Extracts an article page's title and body text.
+
+    The first page from a site is scored: boilerplate subtrees are pruned and the
+    block with the densest paragraph text wins. The winning block is remembered per
+    host, so later pages from the site go straight to it and, when the title was
+    inside it too, only that block is parsed at all.
+    """
+
+    def __init__(self):
+        """Start with no remembered sites."""
+        self._lock = threading.Lock()
+        self._sites: Dict[str, SiteBlock] = {}
+
+    def site_block(self, host: str) -> Optional[SiteBlock]:
+        """The block remembered for a host, if any."""
+        with self._lock:
+            return self._sites.get(host)
+
+    def remember(self, host: str, block: Optional[SiteBlock]) -> None:
+        """Remember a host's block, as returned by extract_article; None forgets the host."""
+        with self._lock:
+            if block:
+                self._sites[host] = block
+            else:
+                self._sites.pop(host, None)
+
+    def extract(self, content: bytes, host: str, parser: str = "html.parser") -> Tuple[str, str]:
+        """Return the (title, body text) of an article page served by `host`."""
+        title, text, block = extract_article(content, self.site_block(host), parser)
+        self.remember(host, block)
+        return title, text
+
+
+_extractor = ContentExtractor()
+
+
+def shared_extractor() -> ContentExtractor:
+    """The process-wide extractor, so every collector shares what it learned about each site."""
+    return _extractor
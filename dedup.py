@@ -0,0 +1,198 @@
+"""Near-duplicate article detection with MinHash signatures and a banded LSH index."""
+
+import hashlib
+import logging
+import re
+import threading
+import time
+import unicodedata
+from array import array
+from typing import Any, Dict, List, Optional, Tuple
+
+from state_db import connect_state_db
+
+SHINGLE_SIZE = 3
+# Only the start of long bodies is signed; duplicates share it too and it bounds the cost.
+MAX_SIGNED_CHARS = 4000
+
+NUM_PERMUTATIONS = 64
+# 16 bands of 4 rows: pairs with Jaccard similarity 0.8 share a band with probability > 0.999,
+# pairs at 0.3 only about 12% of the time, and those candidates are rejected on the full signature.
+BANDS = 16
+ROWS_PER_BAND = NUM_PERMUTATIONS // BANDS
+
+MASK_64 = (1 << 64) - 1
+# Odd multipliers and offsets for multiply-shift hashing, derived deterministically so
+# signatures stay comparable across runs.
+_PERMUTATIONS = [
+    (int.from_bytes(hashlib.blake2b(f"a{i}".encode(), digest_size=8).digest(), "big") | 1,
+     int.from_bytes(hashlib.blake2b(f"b{i}".encode(), digest_size=8).digest(), "big"))
+    for i in range(NUM_PERMUTATIONS)
+]
+
+NON_WORD = re.compile(r"[\W_]+")
+
+
+def normalize_text(text: str) -> str:
+    """Fold width and case and drop whitespace and punctuation so formatting differences vanish."""
+    return NON_WORD.sub("", unicodedata.normalize("NFKC", text).lower())
+
+
+def shingles(text: str) -> set:
+    """Character 3-grams of normalized text; they work without word boundaries, as Japanese needs."""
+    normalized = normalize_text(text)[:MAX_SIGNED_CHARS]
+    if len(normalized) <= SHINGLE_SIZE:
+        return {normalized} if normalized else set()
+    return {normalized[i:i + SHINGLE_SIZE] for i in range(len(normalized) - SHINGLE_SIZE + 1)}
+
+
+def minhash(text: str) -> Optional[array]:
+    """MinHash signature of a text's shingles, or None if it has no content to sign."""
+    hashes = [
+        int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big")
+        for shingle in shingles(text)
+    ]
+    if not hashes:
+        return None
+    return array("I", (
+        min(((a * value + b) & MASK_64) for value in hashes) >> 32
+        for a, b in _PERMUTATIONS
+    ))
+
+
+def similarity(a: array, b: array) -> float:
+    """Estimate the Jaccard similarity of two texts from their signatures."""
+    return sum(1 for x, y in zip(a, b) if x == y) / len(a)
+
+
+def _band_keys(signature: array) -> List[int]:
+    keys = []
+    for band in range(BANDS):
+        rows = signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND].tobytes()
+        keys.append(int.from_bytes(hashlib.blake2b(rows, digest_size=8).digest(), "big", signed=True))
+    return keys
+
+
+class Deduplicator:
+    """Collapses near-duplicate articles into the first one seen, across runs.
+
+    Signatures are kept in the state database with one row per LSH band keyed by a hash
+    of that band, so a lookup is a handful of primary-key probes plus a similarity check
+    of the few candidates they return.
+    """
+
+    def __init__(self, db_path: str, threshold: float = 0.8):
+        """Open the signature index in the given state database."""
+        self.logger = logging.getLogger(__name__)
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._conn = connect_state_db(db_path)
+        with self._lock:
+            self._conn.execute('''CREATE TABLE IF NOT EXISTS article_signatures (
+                url TEXT PRIMARY KEY,
+                canonical_url TEXT NOT NULL,
+                signature BLOB NOT NULL,
+                seen_at REAL
+            )''')
+            self._conn.execute('''CREATE TABLE IF NOT EXISTS article_signature_bands (
+                band INTEGER NOT NULL,
+                band_key INTEGER NOT NULL,
+                url TEXT NOT NULL,
+                PRIMARY KEY (band, band_key, url)
+            ) WITHOUT ROWID''')
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_article_signatures_canonical ON article_signatures (canonical_url)"
+            )
+            self._conn.commit()
+
+    def find(self, signature: array) -> Optional[Tuple[str, str, float]]:
+        """Return (url, canonical_url, similarity) of the most similar stored article above the threshold."""
+        with self._lock:
+            return self._find(signature)
+
+    def alternates(self, canonical_url: str) -> List[str]:
+        """Return the URLs that were collapsed into a canonical article."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT url FROM article_signatures WHERE canonical_url = ? AND url != ? ORDER BY seen_at, rowid",
+                (canonical_url, canonical_url),
+            ).fetchall()
+        return [row["url"] for row in rows]
+
+    def deduplicate(self, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Drop near-duplicates, keeping the first article of each story with its alternate sources.
+
+        An article that duplicates one kept earlier in the batch is added to that
+        article's "alternate_sources"; one that duplicates a story from a previous run
+        is dropped. Re-collecting a canonical article's own URL keeps it.
+        """
+        kept: List[Dict[str, Any]] = []
+        kept_by_url: Dict[str, Dict[str, Any]] = {}
+        now = time.time()
+
+        with self._lock:
+            for article in articles:
+                url = article.get("url", "")
+                if not url:
+                    kept.append(article)
+                    continue
+                if url in kept_by_url:
+                    continue
+
+                row = self._conn.execute(
+                    "SELECT canonical_url FROM article_signatures WHERE url = ?", (url,)
+                ).fetchone()
+                if row:
+                    canonical = row["canonical_url"]
+                else:
+                    signature = minhash(f"{article.get('title', '')} {article.get('content', '')}")
+                    if signature is None:
+                        kept.append(article)
+                        continue
+                    match = self._find(signature)
+                    canonical = match[1] if match else url
+                    self._store(url, canonical, signature, now)
+
+                if canonical == url:
+                    article = dict(article)
+                    article["alternate_sources"] = list(article.get("alternate_sources", []))
+                    kept.append(article)
+                    kept_by_url[url] = article
+                elif canonical in kept_by_url:
+                    kept_by_url[canonical]["alternate_sources"].append(
+                        {"url": url, "source": article.get("source", "")}
+                    )
+            self._conn.commit()
+
+        if len(kept) < len(articles):
+            self.logger.info(f"Collapsed {len(articles) - len(kept)} duplicate articles, {len(kept)} remain")
+        return kept
+
+    def _store(self, url: str, canonical: str, signature: array, now: float) -> None:
+        self._conn.execute(
+            "INSERT INTO article_signatures (url, canonical_url, signature, seen_at) VALUES (?, ?, ?, ?)",
+            (url, canonical, signature.tobytes(), now),
+        )
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO article_signature_bands (band, band_key, url) VALUES (?, ?, ?)",
+            [(band, key, url) for band, key in enumerate(_band_keys(signature))],
+        )
+
+    def _find(self, signature: array) -> Optional[Tuple[str, str, float]]:
+        keys = _band_keys(signature)
+        conditions = " OR ".join(["(b.band = ? AND b.band_key = ?)"] * BANDS)
+        rows = self._conn.execute(
+            f'''SELECT DISTINCT s.url, s.canonical_url, s.signature
+                FROM article_signature_bands b JOIN article_signatures s ON s.url = b.url
+                WHERE {conditions}''',
+            [value for band, key in enumerate(keys) for value in (band, key)],
+        ).fetchall()
+
+        best = None
+        for row in rows:
+            stored = array("I")
+            stored.frombytes(row["signature"])
+            score = similarity(signature, stored)
+            if score >= self.threshold and (best is None or score > best[2]):
+                best = (row["url"], row["canonical_url"], score)
+        return best
@@ -0,0 +1,216 @@
+"""Streaming RSS/Atom reader that stops at a cap or at the last entry already seen."""
+
+import logging
+import threading
+import time
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from state_db import connect_state_db
+
+CHUNK_SIZE = 64 * 1024
+
+ENTRY_TAGS = {"item", "entry"}
+DC_NS = "{http://purl.org/dc/elements/1.1/}"
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def parse_timestamp(value: str) -> Optional[float]:
+    """Seconds since the epoch of an RFC 822 or ISO 8601 date, or None if unparseable."""
+    value = (value or "").strip()
+    if not value:
+        return None
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        try:
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def _entry_from_element(element: ET.Element) -> Dict[str, str]:
+    """Map an RSS <item> or Atom <entry> onto the fields feedparser would give for it."""
+    fields: Dict[str, str] = {}
+    for child in element:
+        name = _local(child.tag)
+        text = (child.text or "").strip()
+        if name == "link":
+            href = child.get("href")
+            if href is None:
+                fields.setdefault("link", text)
+            elif child.get("rel", "alternate") == "alternate":
+                fields.setdefault("link", href)
+        elif name in ("description", "summary"):
+            fields.setdefault("summary", text)
+        elif name in ("content", "encoded"):
+            fields.setdefault("content", text)
+        elif name in ("pubDate", "published") or child.tag == DC_NS + "date":
+            fields.setdefault("published", text)
+        elif name == "updated":
+            fields.setdefault("updated", text)
+        elif name in ("guid", "id"):
+            fields.setdefault("id", text)
+        elif name == "author":
+            author = child.findtext("{http://www.w3.org/2005/Atom}name") or text
+            fields.setdefault("author", author.strip())
+        elif child.tag == DC_NS + "creator":
+            fields.setdefault("author", text)
+        elif name == "title":
+            fields.setdefault("title", text)
+
+    fields.setdefault("summary", fields.get("content", ""))
+    fields.setdefault("published", fields.get("updated", ""))
+    fields.setdefault("id", fields.get("link", ""))
+    return fields
+
+
+def stream_entries(chunks: Iterable[bytes]) -> Iterator[Dict[str, str]]:
+    """Yield feed entries as soon as each one is complete, dropping parsed elements as it goes.
+
+    Raises xml.etree.ElementTree.ParseError on input that is not well-formed XML.
+    """
+    parser = ET.XMLPullParser(events=("start", "end"))
+    stack: List[ET.Element] = []
+    for chunk in chunks:
+        parser.feed(chunk)
+        for event, element in parser.read_events():
+            if event == "start":
+                stack.append(element)
+                continue
+            stack.pop()
+            if _local(element.tag) in ENTRY_TAGS:
+                yield _entry_from_element(element)
+                if stack:
+                    stack[-1].remove(element)
+    parser.close()
+
+
+def _feedparser_entries(content: bytes) -> Iterator[Dict[str, str]]:
+    import feedparser
+
+    for entry in feedparser.parse(content).entries:
+        yield {
+            "title": entry.get("title", ""),
+            "summary": entry.get("summary", ""),
+            "link": entry.get("link", ""),
+            "published": entry.get("published", ""),
+            "author": entry.get("author", ""),
+            "id": entry.get("id", "") or entry.get("link", ""),
+        }
+
+
+def _chunks(content: bytes) -> Iterator[bytes]:
+    for start in range(0, len(content), CHUNK_SIZE):
+        yield content[start:start + CHUNK_SIZE]
+
+
+def read_feed(content: bytes, limit: Optional[int] = None,
+              last_seen: Optional[Tuple[str, Optional[float]]] = None,
+              truncated: bool = False) -> List[Dict[str, str]]:
+    """Read a feed's entries in document order, newest first as feeds publish them.
+
+    Stops after `limit` entries, or at the first entry matching `last_seen`, a
+    (guid, published timestamp) pair: one with that guid or published at or before
+    that time. Well-formed XML is streamed, so the rest of the document is never
+    parsed; anything else goes through feedparser, which tolerates broken feeds.
+    A `truncated` feed, cut off by a download cap, keeps the entries completed
+    before the cut.
+    """
+    return read_feed_stream(_chunks(content), lambda: (content, truncated), limit, last_seen)
+
+
+def read_feed_stream(chunks: Iterable[bytes], remaining: Callable[[], Tuple[bytes, bool]],
+                     limit: Optional[int] = None,
+                     last_seen: Optional[Tuple[str, Optional[float]]] = None) -> List[Dict[str, str]]:
+    """read_feed over a body that is still arriving, parsing each chunk as it comes in.
+
+    Stopping early leaves the rest of `chunks` unread. `remaining` is called only
+    when the XML is not well-formed; it reads the body to the end and returns it,
+    with whether a download cap cut it off, for feedparser.
+    """
+    def take(entries: Iterator[Dict[str, str]], taken: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        for entry in entries:
+            if limit is not None and len(taken) >= limit:
+                break
+            if last_seen and _is_seen(entry, last_seen):
+                break
+            taken.append(entry)
+        return taken
+
+    streamed: List[Dict[str, str]] = []
+    try:
+        return take(stream_entries(chunks), streamed)
+    except ET.ParseError as e:
+        content, truncated = remaining()
+        if truncated and streamed:
+            return streamed
+        logging.getLogger(__name__).debug(f"Feed is not well-formed XML ({e}), falling back to feedparser")
+        return take(_feedparser_entries(content), [])
+
+
+def _is_seen(entry: Dict[str, str], last_seen: Tuple[str, Optional[float]]) -> bool:
+    guid, published = last_seen
+    if guid and entry.get("id") == guid:
+        return True
+    timestamp = parse_timestamp(entry.get("published", ""))
+    return published is not None and timestamp is not None and timestamp <= published
+
+
+class FeedState:
+    """Remembers the newest entry read from each feed, so the next read can stop there."""
+
+    def __init__(self, db_path: str):
+        """Open the per-feed state in the given state database."""
+        self._lock = threading.Lock()
+        self._conn = connect_state_db(db_path)
+        with self._lock:
+            self._conn.execute('''CREATE TABLE IF NOT EXISTS feed_state (
+                feed TEXT PRIMARY KEY,
+                last_guid TEXT,
+                last_published REAL,
+                updated_at REAL
+            )''')
+            self._conn.commit()
+
+    def last_seen(self, feed: str) -> Optional[Tuple[str, Optional[float]]]:
+        """The (guid, published timestamp) of the newest entry read from a feed, if any."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT last_guid, last_published FROM feed_state WHERE feed = ?", (feed,)
+            ).fetchone()
+        return (row["last_guid"], row["last_published"]) if row else None
+
+    def remember(self, feed: str, entries: List[Dict[str, Any]]) -> None:
+        """Record the newest of the entries just read; does nothing when there are none."""
+        if not entries:
+            return
+        timestamps = [t for t in (parse_timestamp(entry.get("published", "")) for entry in entries) if t is not None]
+        with self._lock:
+            self._conn.execute(
+                '''INSERT OR REPLACE INTO feed_state (feed, last_guid, last_published, updated_at)
+                   VALUES (?, ?, ?, ?)''',
+                (feed, entries[0].get("id", ""), max(timestamps) if timestamps else None, time.time()),
+            )
+            self._conn.commit()
+
+
+_states: Dict[str, FeedState] = {}
+_states_lock = threading.Lock()
+
+
+def shared_feed_state(db_path: str) -> FeedState:
+    """The process-wide feed state for this state database."""
+    with _states_lock:
+        state = _states.get(db_path)
+        if state is None:
+            state = _states[db_path] = FeedState(db_path)
+        return state
@@ -0,0 +1,218 @@
+"""Shared outbound HTTP client: pooled keep-alive connections, compression and HTTP/2 where available."""
+
+import importlib.util
+import logging
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import httpx
+
+from config import Config
+
+USER_AGENT = "EnergyNewsBot/1.0"
+KEEPALIVE_EXPIRY_SECONDS = 30.0
+
+HTML_TYPES = ("text/html", "application/xhtml+xml")
+FEED_TYPES = ("application/rss+xml", "application/atom+xml", "application/rdf+xml", "application/xml",
+              "text/xml", "text/html", "text/plain")
+
+
+class UnexpectedContentType(ValueError):
+    """A response was abandoned because its Content-Type is not one the caller can parse."""
+
+
+@dataclass
+class Download:
+    """A response body read up to a byte cap.
+
+    Carries the status, headers and body the caches and parsers use from a response;
+    `truncated` is set when the body was cut off at the cap.
+    """
+    url: str
+    status_code: int
+    headers: httpx.Headers
+    content: bytes
+    truncated: bool
+    _response: httpx.Response
+
+    def raise_for_status(self) -> None:
+        self._response.raise_for_status()
+
+
+class DownloadStream:
+    """A response body read chunk by chunk as it arrives, up to a byte cap.
+
+    `iter_bytes()` can be left early and called again to carry on where it
+    stopped; every chunk read is kept, so `content` is the body read so far.
+    `truncated` is set once the cap cuts the body off.
+    """
+
+    def __init__(self, response: httpx.Response, max_bytes: int):
+        self.url = str(response.url)
+        self.status_code = response.status_code
+        self.headers = response.headers
+        self.truncated = False
+        self._response = response
+        self._max_bytes = max_bytes
+        self._size = 0
+        self._chunks: List[bytes] = []
+        self._source = response.iter_bytes()
+        self._finished = False
+
+    def iter_bytes(self) -> Iterator[bytes]:
+        """Yield the body's next chunks until it ends or reaches the cap."""
+        while not self._finished:
+            chunk = next(self._source, None)
+            if chunk is None:
+                self._finished = True
+                return
+            if self._size + len(chunk) > self._max_bytes:
+                chunk = chunk[:self._max_bytes - self._size]
+                self.truncated = self._finished = True
+            self._size += len(chunk)
+            self._chunks.append(chunk)
+            if chunk:
+                yield chunk
+
+    @property
+    def content(self) -> bytes:
+        return b"".join(self._chunks)
+
+    def read(self) -> bytes:
+        """Read the rest of the body, up to the cap, and return all of it."""
+        for _ in self.iter_bytes():
+            pass
+        return self.content
+
+    def download(self) -> Download:
+        """The whole body, up to the cap, as a Download."""
+        content = self.read()
+        return Download(self.url, self.status_code, self.headers, content, self.truncated, self._response)
+
+    def raise_for_status(self) -> None:
+        self._response.raise_for_status()
+
+
+def _accepts(content_type: str, accepted: Sequence[str]) -> bool:
+    """Whether a Content-Type header matches one of the accepted media types; a missing header is accepted."""
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return not media_type or media_type in accepted or media_type.endswith("+xml")
+
+
+def http2_available() -> bool:
+    """Whether the h2 package httpx needs for HTTP/2 is installed."""
+    return importlib.util.find_spec("h2") is not None
+
+
+def accept_encoding() -> str:
+    """Content codings httpx can decode here: brotli and zstd only when their packages are installed."""
+    encodings = ["gzip", "deflate"]
+    if importlib.util.find_spec("brotli") or importlib.util.find_spec("brotlicffi"):
+        encodings.append("br")
+    if importlib.util.find_spec("zstandard"):
+        encodings.append("zstd")
+    return ", ".join(encodings)
+
+
+class HttpClient:
+    """One connection pool for every outbound request of the process.
+
+    Connections are kept alive per origin, so repeated fetches from the same few
+    hosts skip DNS, TCP and TLS setup. HTTP/2 is negotiated when `http2` is set and
+    the h2 package is installed; otherwise requests go over HTTP/1.1.
+    """
+
+    def __init__(self, timeout: float = 10.0, max_connections: int = 20, http2: bool = True):
+        """Open the pool; `timeout` applies to requests that do not pass their own."""
+        self.timeout = timeout
+        self.http2 = http2 and http2_available()
+        encodings = accept_encoding()
+        logger = logging.getLogger(__name__)
+        if http2 and not self.http2:
+            logger.warning("http2 is set but the h2 package is not installed; using HTTP/1.1")
+        logger.info(f"HTTP client: {'HTTP/2' if self.http2 else 'HTTP/1.1'}, Accept-Encoding: {encodings}")
+        self._options = dict(
+            http2=self.http2,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections,
+                                keepalive_expiry=KEEPALIVE_EXPIRY_SECONDS),
+            headers={"User-Agent": USER_AGENT, "Accept-Encoding": encodings},
+            timeout=timeout,
+            follow_redirects=True,
+        )
+        self._client = httpx.Client(**self._options)
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None,
+            timeout: Optional[float] = None) -> httpx.Response:
+        return self._client.get(url, headers=headers, timeout=self._timeout(timeout))
+
+    def post(self, url: str, json: Any = None, headers: Optional[Dict[str, str]] = None,
+             timeout: Optional[float] = None) -> httpx.Response:
+        return self._client.post(url, json=json, headers=headers, timeout=self._timeout(timeout))
+
+    def download(self, url: str, max_bytes: int, accept: Sequence[str] = (),
+                 headers: Optional[Dict[str, str]] = None, timeout: Optional[float] = None) -> Download:
+        """GET a URL, reading at most `max_bytes` of its body.
+
+        The body is streamed, so a response larger than the cap is cut off there and
+        its connection dropped instead of being read into memory. With `accept`, a
+        successful response whose Content-Type is not listed raises
+        UnexpectedContentType before any of its body is read.
+        """
+        with self.stream(url, max_bytes, accept, headers, timeout) as stream:
+            return stream.download()
+
+    @contextmanager
+    def stream(self, url: str, max_bytes: int, accept: Sequence[str] = (),
+               headers: Optional[Dict[str, str]] = None, timeout: Optional[float] = None) -> Iterator[DownloadStream]:
+        """GET a URL and hand over its body as a DownloadStream, for parsing while it arrives.
+
+        Content-Type is checked as in download(). Leaving the block drops the
+        connection along with any part of the body that was not read.
+        """
+        with self._client.stream("GET", url, headers=headers, timeout=self._timeout(timeout)) as response:
+            content_type = response.headers.get("Content-Type", "")
+            if accept and response.is_success and not _accepts(content_type, accept):
+                raise UnexpectedContentType(f"Unexpected Content-Type {content_type!r} from {url}")
+            yield DownloadStream(response, max_bytes)
+
+    def async_client(self) -> httpx.AsyncClient:
+        """An async client with the same settings; async pools are tied to one event loop, so close it after use."""
+        return httpx.AsyncClient(**self._options)
+
+    def close(self) -> None:
+        self._client.close()
+
+    def _timeout(self, timeout: Optional[float]) -> float:
+        return self.timeout if timeout is None else timeout
+
+
+_clients: Dict[Tuple[float, int, bool], HttpClient] = {}
+_clients_lock = threading.Lock()
+
+
+def shared_client(config: Config) -> HttpClient:
+    """The process-wide client for the configuration's HTTP settings."""
+    key = (config.http_timeout_seconds, config.http_max_connections, config.http2)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = _clients[key] = HttpClient(*key)
+        return client
+
+
+def source_timeout(config: Config, key: str, source: Optional[Dict[str, Any]] = None) -> float:
+    """Timeout for a source: `source_timeout_seconds[key]`, a scrape source's `timeout_seconds`, or the default."""
+    timeout = config.source_timeout_seconds.get(key)
+    if timeout is None and source is not None:
+        timeout = source.get("timeout_seconds")
+    return float(timeout) if timeout is not None else config.http_timeout_seconds
+
+
+def source_max_bytes(config: Config, key: str, source: Optional[Dict[str, Any]] = None) -> int:
+    """Byte cap for a source: `source_max_bytes[key]`, a scrape source's `max_bytes`, or `max_response_bytes`."""
+    max_bytes = config.source_max_bytes.get(key)
+    if max_bytes is None and source is not None:
+        max_bytes = source.get("max_bytes")
+    return int(max_bytes) if max_bytes is not None else config.max_response_bytes
@@ -0,0 +1,31 @@
+"""Ingest stage: persist a collection run's articles, processed fields and relevance scores in one transaction."""
+
+from typing import Any, Dict, List
+
+from article_store import stored_texts, upsert_articles
+from relevance import store_relevance_many
+
+
+def ingest_articles(conn, collected: List[Dict[str, Any]], processed: List[Dict[str, Any]]) -> int:
+    """Store every collected article, with the enrichment of those that passed processing.
+
+    `processed` holds the NewsProcessor output for a subset of `collected`; its
+    records replace the collected ones so their processed fields are saved too.
+    Every stored article is then rescored in the same transaction from its stored
+    text, so rows the upsert updated, such as URLs registered without content, get
+    a current score too. The transaction is committed once, or rolled back if
+    anything fails. Returns the number of new articles.
+    """
+    # Processed records are copies of collected ones, so their URLs match exactly.
+    processed_by_url = {article.get("url"): article for article in processed}
+    records = [processed_by_url.get(article.get("url"), article) for article in collected]
+
+    try:
+        stored = upsert_articles(conn, records)
+        ids = list(dict.fromkeys(article_id for article_id, _ in stored if article_id is not None))
+        store_relevance_many(conn, list(stored_texts(conn, ids).items()))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return sum(created for _, created in stored)
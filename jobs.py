@@ -0,0 +1,112 @@
+"""Background job management for long-running pipeline tasks."""
+
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+
+@dataclass
+class Job:
+    """State of one submitted job."""
+
+    id: str
+    kind: str
+    params: Dict[str, Any]
+    status: str = "queued"  # "queued", "running", "succeeded", "failed"
+    progress_done: int = 0
+    progress_total: int = 0
+    message: str = ""
+    result: Any = None
+    error: str = ""
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    @property
+    def active(self) -> bool:
+        return self.status in ("queued", "running")
+
+
+class JobProgress:
+    """Progress reporter handed to job functions."""
+
+    def __init__(self, job: Job):
+        self._job = job
+
+    def __call__(self, done: int, total: int, message: str = "") -> None:
+        """Record that `done` of `total` units of work are complete."""
+        self._job.progress_done = done
+        self._job.progress_total = total
+        if message:
+            self._job.message = message
+
+
+class JobManager:
+    """Runs jobs on a thread pool and coalesces identical submissions into one running job."""
+
+    def __init__(self, max_workers: int = 2, max_finished_jobs: int = 100):
+        """Create the executor and in-memory job registry."""
+        self.logger = logging.getLogger(__name__)
+        self.max_finished_jobs = max_finished_jobs
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._active_by_key: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, kind: str, params: Dict[str, Any], func: Callable[[JobProgress], Any]) -> Job:
+        """Start a job, or return the already running job with the same kind and parameters."""
+        key = f"{kind}:{json.dumps(params, sort_keys=True)}"
+
+        with self._lock:
+            active_id = self._active_by_key.get(key)
+            if active_id and self._jobs[active_id].active:
+                self.logger.info(f"Coalescing {kind} submission into running job {active_id}")
+                return self._jobs[active_id]
+
+            job = Job(id=uuid.uuid4().hex, kind=kind, params=params)
+            self._jobs[job.id] = job
+            self._active_by_key[key] = job.id
+            self._prune()
+
+        self._executor.submit(self._run, job, key, func)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Look up a job by id."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list(self) -> List[Job]:
+        """Return all known jobs, newest first."""
+        with self._lock:
+            return list(reversed(self._jobs.values()))
+
+    def _run(self, job: Job, key: str, func: Callable[[JobProgress], Any]) -> None:
+        job.status = "running"
+        job.started_at = time.time()
+        self.logger.info(f"Job {job.id} ({job.kind}) started")
+
+        try:
+            job.result = func(JobProgress(job))
+            job.status = "succeeded"
+        except Exception as e:
+            job.error = getattr(e, "detail", None) or str(e)
+            job.status = "failed"
+            self.logger.error(f"Job {job.id} ({job.kind}) failed: {job.error}")
+        finally:
+            job.finished_at = time.time()
+            with self._lock:
+                if self._active_by_key.get(key) == job.id:
+                    del self._active_by_key[key]
+            self.logger.info(f"Job {job.id} ({job.kind}) {job.status} in {job.finished_at - job.started_at:.1f}s")
+
+    def _prune(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if not job.active]
+        for job_id in finished[:max(0, len(finished) - self.max_finished_jobs)]:
+            del self._jobs[job_id]
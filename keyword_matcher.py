@@ -0,0 +1,119 @@
+"""Multi-pattern keyword matching for the Energy News Bot."""
+
+from collections import deque
+from typing import Dict, Iterable, List, Tuple
+
+# Below this many patterns, CPython's substring search beats a pure-Python automaton scan.
+LINEAR_SCAN_LIMIT = 32
+
+
+class KeywordMatcher:
+    """Matches labelled patterns (keywords, companies, exclude terms) against text in one pass.
+
+    Patterns are compiled into an Aho-Corasick automaton so the cost of a match is
+    proportional to the text length rather than the number of patterns.
+    """
+
+    def __init__(self, patterns: Dict[str, Iterable[str]], ignore_case: bool = False):
+        """Compile patterns grouped by label, e.g. {"keyword": [...], "company": [...]}."""
+        self.ignore_case = ignore_case
+        self.labels = list(patterns)
+        self._entries: List[Tuple[str, str]] = []
+        for label, words in patterns.items():
+            for word in words:
+                self._entries.append((label, word))
+
+        self._always: List[int] = []
+        self._by_key: Dict[str, List[int]] = {}
+        for index, (_, word) in enumerate(self._entries):
+            key = self._normalize(word)
+            if key:
+                self._by_key.setdefault(key, []).append(index)
+            else:
+                self._always.append(index)
+
+        self._use_automaton = len(self._by_key) > LINEAR_SCAN_LIMIT
+        if self._use_automaton:
+            self._build_automaton()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def match(self, text: str) -> Dict[str, List[str]]:
+        """Return every matched pattern per label, in the order the patterns were given."""
+        found = set(self._always)
+        for key in self._matched_keys(self._normalize(text), stop_at_first=False):
+            found.update(self._by_key[key])
+
+        result: Dict[str, List[str]] = {label: [] for label in self.labels}
+        for index in sorted(found):
+            label, word = self._entries[index]
+            result[label].append(word)
+        return result
+
+    def contains_any(self, text: str) -> bool:
+        """Check whether at least one pattern occurs in the text."""
+        if self._always:
+            return True
+        return bool(self._matched_keys(self._normalize(text), stop_at_first=True))
+
+    def _normalize(self, text: str) -> str:
+        return text.lower() if self.ignore_case else text
+
+    def _matched_keys(self, text: str, stop_at_first: bool) -> List[str]:
+        if not self._use_automaton:
+            matched = []
+            for key in self._by_key:
+                if key in text:
+                    matched.append(key)
+                    if stop_at_first:
+                        break
+            return matched
+
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        state = 0
+        matched = set()
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                matched.update(output[state])
+                if stop_at_first:
+                    break
+        return list(matched)
+
+    def _build_automaton(self) -> None:
+        goto: List[Dict[str, int]] = [{}]
+        output: List[Tuple[str, ...]] = [()]
+        for key in self._by_key:
+            state = 0
+            for char in key:
+                next_state = goto[state].get(char)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][char] = next_state
+                    goto.append({})
+                    output.append(())
+                state = next_state
+            output[state] = output[state] + (key,)
+
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in goto[state].items():
+                queue.append(next_state)
+                fallback = fail[state]
+                while fallback and char not in goto[fallback]:
+                    fallback = fail[fallback]
+                fail[next_state] = goto[fallback].get(char, 0)
+                if fail[next_state] == next_state:
+                    fail[next_state] = 0
+                output[next_state] = output[next_state] + output[fail[next_state]]
+
+        self._goto = goto
+        self._fail = fail
+        self._output = output
@@ -1,10 +1,15 @@
 """Main entry point for the Energy News Bot."""
 
+import argparse
+import asyncio
 import logging
+import signal
 import sys
+import threading
 from pathlib import Path
 from datetime import datetime
 
+import metrics
 from config import Config
 from news_collector import NewsCollector
 from news_processor import NewsProcessor
@@ -25,25 +30,60 @@ def setup_logging(log_level: str = "INFO") -> None:
     )
 
 
+def run_daemon(config: Config) -> None:
+    """Run the resident scheduler until SIGINT or SIGTERM."""
+    from scheduler import Scheduler
+    
+    stop_event = threading.Event()
+    
+    def request_stop(signum, frame):
+        logging.getLogger(__name__).info(f"Received signal {signum}, stopping scheduler")
+        stop_event.set()
+    
+    signal.signal(signal.SIGINT, request_stop)
+    signal.signal(signal.SIGTERM, request_stop)
+    
+    Scheduler(config).run_forever(stop_event)
+
+
 def main() -> None:
     """Main function to run the energy news bot."""
+    parser = argparse.ArgumentParser(description="Energy News Bot")
+    parser.add_argument("--daemon", action="store_true",
+                        help="keep running and collect each source on its own schedule")
+    parser.add_argument("--config", default="config.json", help="path to the configuration file")
+    args = parser.parse_args()
+    
     try:
         setup_logging()
         logger = logging.getLogger(__name__)
         
-        config = Config.load_from_file("config.json")
+        config = Config.load_from_file(args.config)
         logger.info("Configuration loaded successfully")
         
+        if args.daemon:
+            run_daemon(config)
+            return
+        
         collector = NewsCollector(config)
         processor = NewsProcessor(config)
         
         from teams_notifier import TeamsNotifier
+        from teams_outbox import shared_outbox
         notifier = TeamsNotifier(config)
+        outbox = shared_outbox(config.state_db_path, max_attempts=config.teams_outbox_max_attempts)
         
+        before = metrics.REGISTRY.snapshot()
         logger.info("Starting news collection...")
         news_articles = collector.collect_news()
         logger.info(f"Collected {len(news_articles)} articles")
         
+        if config.dedup_enabled:
+            from dedup import Deduplicator
+            deduplicator = Deduplicator(config.state_db_path, threshold=config.dedup_threshold)
+            news_articles = deduplicator.deduplicate(news_articles)
+            logger.info(f"{len(news_articles)} articles left after removing duplicates")
+        
         logger.info("Starting news processing...")
         processed_articles = processor.process_articles(news_articles)
         logger.info(f"Processed {len(processed_articles)} articles")
@@ -51,12 +91,19 @@ def main() -> None:
         if processed_articles:
             articles_to_post = processed_articles[:config.max_teams_posts]
             logger.info(f"Limiting to top {config.max_teams_posts} articles for Teams posting")
-            logger.info("Posting articles to Teams...")
-            notifier.post_articles(articles_to_post)
-            logger.info(f"Posted {len(articles_to_post)} articles to Teams")
+            queued = outbox.enqueue(articles_to_post)
+            logger.info(f"Queued {queued} new articles for Teams ({len(articles_to_post) - queued} already in the outbox)")
         else:
             logger.info("No articles matched the filtering criteria")
         
+        logger.info("Posting articles to Teams...")
+        delivered = asyncio.run(outbox.drain(notifier, config.teams_outbox_batch_size))
+        logger.info(f"Posted {delivered} articles to Teams")
+        
+        logger.info("Run summary:")
+        for line in metrics.run_summary(before):
+            logger.info(f"  {line}")
+        
         logger.info("Energy news bot completed successfully")
         
     except Exception as e:
@@ -0,0 +1,243 @@
+"""Process-wide counters and histograms, exported in the Prometheus text format."""
+
+import bisect
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+BYTE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+
+
+class Counter(_Metric):
+    """A monotonically increasing count per label set."""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    @contextmanager
+    def count_exceptions(self, **labels: str) -> Iterator[None]:
+        """Count exceptions raised inside the block, then re-raise them."""
+        try:
+            yield
+        except Exception:
+            self.inc(**labels)
+            raise
+
+    def samples(self) -> Dict[LabelValues, float]:
+        with self._lock:
+            return dict(self._values)
+
+    def render(self) -> List[str]:
+        return self.header() + [
+            f"{self.name}_total{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in sorted(self.samples().items())
+        ]
+
+
+class Histogram(_Metric):
+    """Observations counted into cumulative buckets, with their count and sum, per label set."""
+
+    type_name = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._values: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            # One slot per bucket plus +Inf, then the sum.
+            state = self._values.setdefault(key, [0.0] * (len(self.buckets) + 2))
+            state[bisect.bisect_left(self.buckets, value)] += 1
+            state[-1] += value
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Observe the wall time of the block, whether or not it raises."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self) -> Dict[LabelValues, Tuple[float, float]]:
+        """(count, sum) per label set."""
+        with self._lock:
+            return {key: (sum(state[:-1]), state[-1]) for key, state in self._values.items()}
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = {key: list(state) for key, state in self._values.items()}
+        lines = self.header()
+        for key, state in sorted(values.items()):
+            cumulative = 0.0
+            for bound, count in zip(self.buckets + (math.inf,), state[:-1]):
+                cumulative += count
+                labels = _format_labels(self.labelnames + ("le",), key + (_format_value(bound),))
+                lines.append(f"{self.name}_bucket{labels} {_format_value(cumulative)}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_count{labels} {_format_value(cumulative)}")
+            lines.append(f"{self.name}_sum{labels} {_format_value(state[-1])}")
+        return lines
+
+
+class Registry:
+    """Named metrics of one process."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(line for metric in metrics for line in metric.render()) + "\n"
+
+    def snapshot(self) -> Dict[str, Dict[LabelValues, object]]:
+        """Current samples of every metric, for computing what one run added."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {metric.name: metric.samples() for metric in metrics}
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+
+REGISTRY = Registry()
+
+SOURCE_FETCH_SECONDS = REGISTRY.histogram(
+    "newsbot_source_fetch_seconds", "Time to download an RSS feed or scrape page.", ["source"])
+SOURCE_RESPONSE_BYTES = REGISTRY.histogram(
+    "newsbot_source_response_bytes", "Size of downloaded source responses.", ["source"], buckets=BYTE_BUCKETS)
+RESPONSES_LIMITED = REGISTRY.counter(
+    "newsbot_responses_limited", "Downloads cut off at their byte cap or refused for their Content-Type.", ["reason"])
+SOURCE_PARSE_SECONDS = REGISTRY.histogram(
+    "newsbot_source_parse_seconds", "Time to parse a source response into articles.", ["source"])
+SOURCE_ITEMS = REGISTRY.counter(
+    "newsbot_source_items", "Articles read from a source.", ["source"])
+SOURCE_ERRORS = REGISTRY.counter(
+    "newsbot_source_errors", "Failed collections of a source.", ["source"])
+SCRAPE_ITEM_ERRORS = REGISTRY.counter(
+    "newsbot_scrape_item_errors", "Scraped items skipped because their selectors failed.", ["source"])
+ARTICLE_FETCH_SECONDS = REGISTRY.histogram(
+    "newsbot_article_fetch_seconds", "Time to fetch and extract one article page.", ["outcome"])
+PROCESSOR_ARTICLES = REGISTRY.counter(
+    "newsbot_processor_articles", "Articles seen by the processor, by filter result.", ["result"])
+TEAMS_REQUEST_SECONDS = REGISTRY.histogram(
+    "newsbot_teams_request_seconds", "Latency of Teams webhook requests.", ["status"])
+TEAMS_RETRIES = REGISTRY.counter(
+    "newsbot_teams_retries", "Teams deliveries retried after a failed attempt.")
+TEAMS_DELIVERIES = REGISTRY.counter(
+    "newsbot_teams_deliveries", "Articles delivered to Teams, by outcome.", ["outcome"])
+
+
+def _delta(after: Dict[LabelValues, object], before: Optional[Dict[LabelValues, object]]) -> Dict[LabelValues, object]:
+    before = before or {}
+    changes = {}
+    for key, value in after.items():
+        previous = before.get(key)
+        if isinstance(value, tuple):
+            previous = previous or (0.0, 0.0)
+            change = (value[0] - previous[0], value[1] - previous[1])
+            if change[0]:
+                changes[key] = change
+        elif value - (previous or 0.0):
+            changes[key] = value - (previous or 0.0)
+    return changes
+
+
+def run_summary(before: Dict[str, Dict[LabelValues, object]]) -> List[str]:
+    """Describe what happened since the `before` snapshot: per-source fetches, filter results and Teams posts."""
+    after = REGISTRY.snapshot()
+    changes = {name: _delta(samples, before.get(name)) for name, samples in after.items()}
+    lines = []
+
+    sources = sorted({key[0] for name in ("newsbot_source_fetch_seconds", "newsbot_source_errors")
+                      for key in changes[name]})
+    for source in sources:
+        key = (source,)
+        fetches, fetch_seconds = changes["newsbot_source_fetch_seconds"].get(key, (0, 0.0))
+        _, response_bytes = changes["newsbot_source_response_bytes"].get(key, (0, 0.0))
+        _, parse_seconds = changes["newsbot_source_parse_seconds"].get(key, (0, 0.0))
+        items = changes["newsbot_source_items"].get(key, 0)
+        errors = changes["newsbot_source_errors"].get(key, 0) + changes["newsbot_scrape_item_errors"].get(key, 0)
+        lines.append(f"{source}: fetch {fetch_seconds:.2f}s ({int(fetches)}x, {response_bytes / 1024:.1f} KB), "
+                     f"parse {parse_seconds:.2f}s, {int(items)} items, {int(errors)} errors")
+
+    results = changes["newsbot_processor_articles"]
+    if results:
+        counts = ", ".join(f"{key[0]} {int(count)}" for key, count in sorted(results.items()))
+        lines.append(f"Processor: {counts}")
+
+    requests, request_seconds = (0, 0.0)
+    for count, seconds in changes["newsbot_teams_request_seconds"].values():
+        requests, request_seconds = requests + count, request_seconds + seconds
+    deliveries = changes["newsbot_teams_deliveries"]
+    if requests or deliveries:
+        outcomes = ", ".join(f"{key[0]} {int(count)}" for key, count in sorted(deliveries.items()))
+        retries = int(changes["newsbot_teams_retries"].get((), 0))
+        average = request_seconds / requests if requests else 0.0
+        lines.append(f"Teams: {outcomes or 'no deliveries'}, {int(requests)} requests "
+                     f"averaging {average:.2f}s, {retries} retries")
+    return lines
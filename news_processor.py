@@ -1,10 +1,59 @@
 """News processing module for the Energy News Bot."""
 
 import logging
-from typing import List, Dict, Any
+import re
+from typing import List, Dict, Any, Iterable, Optional
 from datetime import datetime
 
+import metrics
 from config import Config
+from keyword_matcher import KeywordMatcher
+
+JAPANESE_CHAR = re.compile("[\u3040-\u309F\u30A0-\u30FF\u4E00-\u9FAF]")
+NON_JAPANESE_RUNS = re.compile("[^\u3040-\u309F\u30A0-\u30FF\u4E00-\u9FAF]+")
+
+# str.translate table folding each Japanese script onto a single marker so that
+# characters can be counted per script with str.count instead of a Python loop.
+HIRAGANA_MARKER, KATAKANA_MARKER, KANJI_MARKER = "h", "k", "j"
+SCRIPT_MARKERS = {
+    **{code: HIRAGANA_MARKER for code in range(0x3040, 0x30A0)},
+    **{code: KATAKANA_MARKER for code in range(0x30A0, 0x3100)},
+    **{code: KANJI_MARKER for code in range(0x4E00, 0x9FB0)},
+}
+WHITESPACE_CHARS = " \t\n\r\x0b\x0c\xa0\u3000"
+
+# bytes.translate table mapping ASCII whitespace to b" " and everything else to b"x".
+ASCII_WORD_MASK = bytes(32 if byte in b" \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f" else 120 for byte in range(256))
+# A run of non-whitespace; \s covers the same Unicode whitespace as str.split.
+WORD_RUN = re.compile(r"\S+")
+
+
+def count_words(text: str) -> int:
+    """Count whitespace-separated words, matching len(text.split()) without building the token list."""
+    if not text.isascii():
+        # subn counts the runs in C; what it builds is only the whitespace left over.
+        return WORD_RUN.subn("", text)[1]
+    mask = text.encode("ascii").translate(ASCII_WORD_MASK)
+    return mask.count(b" x") + (mask[:1] == b"x")
+
+
+class ArticleBatch:
+    """Columnar view over a list of article dicts for bulk processing."""
+    
+    __slots__ = ("records", "titles", "contents")
+    
+    def __init__(self, articles: Iterable[Dict[str, Any]]):
+        """Split articles into title and content columns, keeping the original records."""
+        self.records = list(articles)
+        self.titles = [article.get("title", "") for article in self.records]
+        self.contents = [article.get("content", "") for article in self.records]
+    
+    def __len__(self) -> int:
+        return len(self.records)
+    
+    def texts(self) -> List[str]:
+        """Return the combined title and content used for filtering, one per article."""
+        return [f"{title} {content}" for title, content in zip(self.titles, self.contents)]
 
 
 class NewsProcessor:
@@ -14,51 +63,81 @@ class NewsProcessor:
         """Initialize the news processor with configuration."""
         self.config = config
         self.logger = logging.getLogger(__name__)
+        self._include_matcher = KeywordMatcher({"include": config.japanese_keywords})
+        self._exclude_matcher = KeywordMatcher({"exclude": config.exclude_keywords}, ignore_case=True)
     
     def process_articles(self, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Process a list of news articles."""
-        processed_articles = []
+        return self.process_batch(ArticleBatch(articles))
+    
+    def process_batch(self, batch: ArticleBatch) -> List[Dict[str, Any]]:
+        """Filter and enrich a batch of articles in bulk, returning processed article dicts."""
+        processed_at = datetime.now().isoformat()
         
-        for article in articles:
+        included = []
+        results: Dict[str, int] = {}
+        for index, text in enumerate(batch.texts()):
             try:
-                if self._should_include_article(article):
-                    processed_article = self._process_single_article(article)
-                    processed_articles.append(processed_article)
-                    
+                reason = self._reject_reason(text)
             except Exception as e:
                 self.logger.error(f"Error processing article: {e}")
+                reason = "error"
+            if reason is None:
+                included.append(index)
+            else:
+                results[reason] = results.get(reason, 0) + 1
+        
+        processed_articles = []
+        for index in included:
+            try:
+                processed_articles.append(self._process_single_article(batch.records[index], processed_at))
+            except Exception as e:
+                self.logger.error(f"Error processing article: {e}")
+                results["error"] = results.get("error", 0) + 1
                 continue
         
+        results["accepted"] = len(processed_articles)
+        for result, count in results.items():
+            if count:
+                metrics.PROCESSOR_ARTICLES.inc(count, result=result)
         return processed_articles
     
     def _should_include_article(self, article: Dict[str, Any]) -> bool:
         """Determine if an article should be included based on filtering criteria."""
         content = article.get("content", "")
         title = article.get("title", "")
-        text = f"{title} {content}"
-        
-        if not self._contains_japanese(text):
-            return False
+        return self._should_include_text(f"{title} {content}")
+    
+    def _should_include_text(self, text: str) -> bool:
+        """Apply the Japanese, keyword and exclude filters to an article's combined text."""
+        return self._reject_reason(text) is None
+    
+    def _reject_reason(self, text: str) -> Optional[str]:
+        """Return which filter rejects an article's combined text, or None if it passes them all."""
+        if self.config.min_japanese_ratio > 0:
+            if self.japanese_stats(text)["ratio"] < self.config.min_japanese_ratio:
+                return "low_japanese_ratio"
+        elif not self._contains_japanese(text):
+            return "not_japanese"
         
         if self.config.japanese_keywords:
-            has_japanese_keyword = any(keyword in text for keyword in self.config.japanese_keywords)
+            has_japanese_keyword = self._include_matcher.contains_any(text)
             if not has_japanese_keyword:
-                return False
+                return "no_keyword"
         
         if self.config.exclude_keywords:
-            text_lower = text.lower()
-            has_excluded = any(keyword.lower() in text_lower for keyword in self.config.exclude_keywords)
+            has_excluded = self._exclude_matcher.contains_any(text)
             if has_excluded:
-                return False
+                return "excluded_keyword"
         
-        return True
+        return None
     
-    def _process_single_article(self, article: Dict[str, Any]) -> Dict[str, Any]:
+    def _process_single_article(self, article: Dict[str, Any], processed_at: Optional[str] = None) -> Dict[str, Any]:
         """Process a single news article."""
         processed_article = article.copy()
         
-        processed_article["processed_at"] = datetime.now().isoformat()
-        processed_article["word_count"] = len(article.get("content", "").split())
+        processed_article["processed_at"] = processed_at or datetime.now().isoformat()
+        processed_article["word_count"] = count_words(article.get("content", ""))
         
         processed_article["sentiment"] = self._analyze_sentiment(article)
         processed_article["topics"] = self._extract_topics(article)
@@ -75,15 +154,25 @@ class NewsProcessor:
     
     def _contains_japanese(self, text: str) -> bool:
         """Check if text contains Japanese characters."""
-        japanese_ranges = [
-            (0x3040, 0x309F),  # Hiragana
-            (0x30A0, 0x30FF),  # Katakana
-            (0x4E00, 0x9FAF),  # CJK Unified Ideographs
-        ]
+        return not text.isascii() and JAPANESE_CHAR.search(text) is not None
+    
+    def japanese_stats(self, text: str) -> Dict[str, Any]:
+        """Count Japanese characters by script and their ratio to all non-whitespace characters."""
+        if text.isascii():
+            hiragana = katakana = kanji = 0
+        else:
+            marked = NON_JAPANESE_RUNS.sub("", text).translate(SCRIPT_MARKERS)
+            hiragana = marked.count(HIRAGANA_MARKER)
+            katakana = marked.count(KATAKANA_MARKER)
+            kanji = marked.count(KANJI_MARKER)
+        japanese = hiragana + katakana + kanji
+        total = len(text) - sum(map(text.count, WHITESPACE_CHARS))
         
-        for char in text:
-            char_code = ord(char)
-            for start, end in japanese_ranges:
-                if start <= char_code <= end:
-                    return True
-        return False
+        return {
+            "hiragana": hiragana,
+            "katakana": katakana,
+            "kanji": kanji,
+            "japanese": japanese,
+            "total": total,
+            "ratio": japanese / total if total else 0.0,
+        }
@@ -0,0 +1,71 @@
+"""Process pool that parses downloaded pages off the GIL, returning only plain extracted fields."""
+
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from content_extractor import SiteBlock, extract_article
+from selector_plan import plan_for
+
+
+def parse_scrape(content: bytes, source: Dict[str, Any], backend: str) -> Tuple[List[Dict[str, str]], List[str]]:
+    """The items of a scrape page, plus the errors of items that were skipped."""
+    errors: List[str] = []
+    items = plan_for(source).extract(content, source["url"], backend, on_error=lambda e: errors.append(str(e)))
+    return items, errors
+
+
+def parse_article(content: bytes, block: Optional[SiteBlock], parser: str) -> Tuple[str, str, Optional[SiteBlock]]:
+    """The (title, body text) of an article page, plus its site's block to remember.
+
+    Workers keep no site blocks: the caller passes the one it remembers for the
+    host and stores the one that comes back, so what any worker learns is shared.
+    """
+    return extract_article(content, block, parser)
+
+
+class ParsePool:
+    """Runs parse functions (these and feed_reader.read_feed) in worker processes.
+
+    Fetching threads hand over raw response bytes and get back lists and strings, so
+    parsing several pages at once uses several cores instead of taking turns on the
+    GIL. Workers are spawned rather than forked, since forking a process that has
+    fetch threads running can copy locks held mid-request.
+    """
+
+    def __init__(self, workers: int):
+        """Create a pool of `workers` processes; they start with the first parse."""
+        self.workers = workers
+        self._executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+
+    def run(self, function, *args: Any, **kwargs: Any) -> Any:
+        """Call a module-level parse function in a worker and wait for its result."""
+        return self._executor.submit(function, *args, **kwargs).result()
+
+    def close(self) -> None:
+        self._executor.shutdown()
+
+
+_pools: Dict[int, ParsePool] = {}
+_pools_lock = threading.Lock()
+
+
+def shared_pool(workers: int) -> Optional[ParsePool]:
+    """The process-wide pool with this many workers, or None to parse in the calling thread."""
+    if workers <= 0:
+        return None
+    with _pools_lock:
+        pool = _pools.get(workers)
+        if pool is None:
+            pool = _pools[workers] = ParsePool(workers)
+        return pool
+
+
+def close_pools() -> None:
+    """Shut down every shared pool; the next shared_pool call starts a new one."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
@@ -0,0 +1,158 @@
+"""Adaptive per-source polling intervals from observed update frequency."""
+
+import json
+import logging
+import math
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from state_db import connect_state_db
+
+
+def expected_freshness(rate: float, interval: float) -> float:
+    """Expected fraction of time a copy polled every `interval` is up to date, for Poisson changes at `rate`."""
+    x = rate * interval
+    if x < 1e-9:
+        return 1.0
+    return (1 - math.exp(-x)) / x
+
+
+def interval_for_freshness(rate: float, target: float) -> float:
+    """Longest polling interval whose expected freshness still reaches the target."""
+    if rate <= 0:
+        return math.inf
+    low, high = 0.0, 1.0
+    while expected_freshness(1.0, high) > target:
+        high *= 2
+    for _ in range(60):
+        middle = (low + high) / 2
+        if expected_freshness(1.0, middle) > target:
+            low = middle
+        else:
+            high = middle
+    return low / rate
+
+
+class PollingPlanner:
+    """Learns how often each source publishes and spaces its polls to hit a target freshness.
+
+    Every poll records whether the source produced URLs it had not returned the
+    previous time. From the last `window` polls the change rate is estimated as a
+    Poisson process, using the bias-reduced estimator for regular polling:
+    rate = -ln((n - changes + 0.5) / (n + 0.5)) / mean_interval.
+    """
+
+    def __init__(self, db_path: str, target_freshness: float = 0.8, min_interval_seconds: float = 900.0,
+                 max_interval_seconds: float = 172800.0, window: int = 50, min_observations: int = 3):
+        """Open the planner's observation log in the given state database."""
+        self.logger = logging.getLogger(__name__)
+        self.target_freshness = target_freshness
+        self.min_interval_seconds = min_interval_seconds
+        self.max_interval_seconds = max_interval_seconds
+        self.window = window
+        self.min_observations = min_observations
+        self._lock = threading.Lock()
+        self._conn = connect_state_db(db_path)
+        with self._lock:
+            self._conn.execute('''CREATE TABLE IF NOT EXISTS source_poll_state (
+                source TEXT PRIMARY KEY,
+                last_urls TEXT NOT NULL,
+                last_polled_at REAL NOT NULL
+            )''')
+            self._conn.execute('''CREATE TABLE IF NOT EXISTS source_polls (
+                source TEXT NOT NULL,
+                polled_at REAL NOT NULL,
+                interval_seconds REAL NOT NULL,
+                changed INTEGER NOT NULL,
+                new_items INTEGER NOT NULL
+            )''')
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_source_polls_source ON source_polls (source, polled_at)")
+            self._conn.commit()
+
+    def record(self, source: str, urls: Iterable[str], polled_at: Optional[float] = None) -> bool:
+        """Record a successful poll of a source. Returns whether it produced new items."""
+        polled_at = time.time() if polled_at is None else polled_at
+        urls = sorted(set(url for url in urls if url))
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT last_urls, last_polled_at FROM source_poll_state WHERE source = ?", (source,)
+            ).fetchone()
+            self._conn.execute(
+                '''INSERT INTO source_poll_state (source, last_urls, last_polled_at) VALUES (?, ?, ?)
+                   ON CONFLICT(source) DO UPDATE SET last_urls = excluded.last_urls,
+                                                     last_polled_at = excluded.last_polled_at''',
+                (source, json.dumps(urls, ensure_ascii=False), polled_at),
+            )
+            if row is None:
+                self._conn.commit()
+                return False
+
+            new_items = len(set(urls) - set(json.loads(row["last_urls"])))
+            self._conn.execute(
+                "INSERT INTO source_polls (source, polled_at, interval_seconds, changed, new_items) VALUES (?, ?, ?, ?, ?)",
+                (source, polled_at, max(0.0, polled_at - row["last_polled_at"]), int(new_items > 0), new_items),
+            )
+            self._conn.execute(
+                '''DELETE FROM source_polls WHERE source = ? AND rowid NOT IN (
+                       SELECT rowid FROM source_polls WHERE source = ? ORDER BY polled_at DESC LIMIT ?)''',
+                (source, source, self.window),
+            )
+            self._conn.commit()
+        return new_items > 0
+
+    def change_rate(self, source: str) -> Optional[float]:
+        """Estimated changes per second, or None until enough polls have been observed."""
+        observations = self._observations(source)
+        if len(observations) < self.min_observations:
+            return None
+        return self._estimate_rate(observations)
+
+    def next_interval(self, source: str, default_seconds: float) -> float:
+        """Polling interval for a source: the default until it has history, then the freshness-based one."""
+        return self._interval_for_rate(self.change_rate(source), default_seconds)
+
+    def stats(self, default_seconds: float) -> List[Dict[str, Any]]:
+        """Per-source hit rate, estimated change rate and chosen interval."""
+        with self._lock:
+            sources = [row["source"] for row in self._conn.execute("SELECT source FROM source_poll_state ORDER BY source")]
+
+        results = []
+        for source in sources:
+            observations = self._observations(source)
+            rate = self._estimate_rate(observations) if len(observations) >= self.min_observations else None
+            interval = self._interval_for_rate(rate, default_seconds)
+            changes = sum(changed for _, changed in observations)
+            results.append({
+                "source": source,
+                "polls": len(observations),
+                "changes": changes,
+                "hit_rate": changes / len(observations) if observations else None,
+                "changes_per_day": rate * 86400 if rate is not None else None,
+                "interval_seconds": interval,
+                "expected_freshness": expected_freshness(rate, interval) if rate is not None else None,
+            })
+        return results
+
+    def _interval_for_rate(self, rate: Optional[float], default_seconds: float) -> float:
+        if rate is None:
+            return default_seconds
+        interval = interval_for_freshness(rate, self.target_freshness)
+        return min(self.max_interval_seconds, max(self.min_interval_seconds, interval))
+
+    def _observations(self, source: str) -> List[tuple]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT interval_seconds, changed FROM source_polls WHERE source = ? ORDER BY polled_at DESC LIMIT ?",
+                (source, self.window),
+            ).fetchall()
+        return [(row["interval_seconds"], row["changed"]) for row in rows]
+
+    def _estimate_rate(self, observations: List[tuple]) -> float:
+        polls = len(observations)
+        changes = sum(changed for _, changed in observations)
+        mean_interval = sum(interval for interval, _ in observations) / polls
+        if mean_interval <= 0:
+            return 0.0
+        return -math.log((polls - changes + 0.5) / (polls + 0.5)) / mean_interval
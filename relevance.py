@@ -0,0 +1,218 @@
+"""Persisted relevance scores for stored articles."""
+
+import json
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from keyword_matcher import KeywordMatcher
+
+# Pattern kinds and the table/column each one is stored in.
+PATTERN_KINDS = {
+    "keyword": ("keywords", "word", "matched_keyword_ids"),
+    "company": ("companies", "name", "matched_company_ids"),
+}
+
+_matcher_cache: Dict[str, Any] = {"fingerprint": None, "matcher": None, "ids": None}
+_matcher_lock = threading.Lock()
+
+
+def create_relevance_table(c) -> None:
+    """Create the article_relevance table and its score index."""
+    c.execute('''CREATE TABLE IF NOT EXISTS article_relevance (
+        article_id INTEGER PRIMARY KEY,
+        score REAL NOT NULL,
+        match_count INTEGER NOT NULL,
+        matched_keyword_ids TEXT NOT NULL DEFAULT '[]',
+        matched_company_ids TEXT NOT NULL DEFAULT '[]',
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )''')
+    c.execute("CREATE INDEX IF NOT EXISTS idx_article_relevance_score ON article_relevance (score)")
+
+
+def _load_patterns(conn):
+    fingerprint = (
+        conn.execute("PRAGMA database_list").fetchone()[2],
+        *conn.execute("""SELECT (SELECT COUNT(*) FROM keywords), (SELECT MAX(id) FROM keywords),
+                                (SELECT COUNT(*) FROM companies), (SELECT MAX(id) FROM companies)""").fetchone(),
+    )
+
+    with _matcher_lock:
+        if _matcher_cache["fingerprint"] != fingerprint:
+            keywords = conn.execute("SELECT id, word FROM keywords ORDER BY id").fetchall()
+            companies = conn.execute("SELECT id, name FROM companies ORDER BY id").fetchall()
+            _matcher_cache["matcher"] = KeywordMatcher({
+                "keyword": [row["word"] for row in keywords],
+                "company": [row["name"] for row in companies],
+            })
+            _matcher_cache["ids"] = {
+                "keyword": {row["word"]: row["id"] for row in keywords},
+                "company": {row["name"]: row["id"] for row in companies},
+            }
+            _matcher_cache["fingerprint"] = fingerprint
+        return _matcher_cache["matcher"], _matcher_cache["ids"]
+
+
+def get_relevance_matcher(conn) -> KeywordMatcher:
+    """Return the compiled keyword/company matcher, rebuilding it when either table has changed."""
+    return _load_patterns(conn)[0]
+
+
+def score_content(matcher: KeywordMatcher, content: str):
+    """Match content against keywords and companies and compute its relevance score."""
+    matches = matcher.match(content)
+    matching_keywords = matches["keyword"]
+    matching_companies = matches["company"]
+
+    total_matches = len(matching_keywords) + len(matching_companies)
+    total_possible = len(matcher)
+    score = total_matches / max(total_possible, 1) if total_possible > 0 else 0.0
+    return matching_keywords, matching_companies, score
+
+
+def article_text(article_data: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Text an article is scored on: its content followed by its title."""
+    if not article_data:
+        return None
+    return article_data.get('content', '') + ' ' + article_data.get('title', '')
+
+
+def _pattern_total(conn) -> int:
+    return conn.execute("SELECT (SELECT COUNT(*) FROM keywords) + (SELECT COUNT(*) FROM companies)").fetchone()[0]
+
+
+def store_relevance(conn, article_id: int, content: str) -> Tuple[List[str], List[str], float]:
+    """Score an article's text and save the result; the caller commits."""
+    return store_relevance_many(conn, [(article_id, content)])[0]
+
+
+def store_relevance_many(conn, articles: List[Tuple[int, str]]) -> List[Tuple[List[str], List[str], float]]:
+    """Score each (article id, text) pair and save all results with one executemany; the caller commits."""
+    matcher, ids = _load_patterns(conn)
+    results, rows = [], []
+    for article_id, content in articles:
+        matching_keywords, matching_companies, score = score_content(matcher, content)
+        results.append((matching_keywords, matching_companies, score))
+        rows.append((article_id, score, len(matching_keywords) + len(matching_companies),
+                     json.dumps([ids["keyword"][word] for word in matching_keywords]),
+                     json.dumps([ids["company"][name] for name in matching_companies])))
+
+    conn.executemany(
+        '''INSERT OR REPLACE INTO article_relevance
+           (article_id, score, match_count, matched_keyword_ids, matched_company_ids, updated_at)
+           VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)''',
+        rows,
+    )
+    return results
+
+
+def score_missing(conn, fetch_text: Callable[[str], Optional[str]],
+                  progress: Callable[..., None] = lambda done, total, message="": None) -> int:
+    """Score stored articles that have no relevance row yet. Returns the number scored."""
+    missing = conn.execute(
+        '''SELECT a.id, a.url FROM articles a
+           LEFT JOIN article_relevance r ON r.article_id = a.id
+           WHERE r.article_id IS NULL ORDER BY a.id'''
+    ).fetchall()
+
+    scored = 0
+    for index, row in enumerate(missing):
+        progress(index, len(missing), f"Scoring {row['url']}")
+        try:
+            text = fetch_text(row["url"])
+        except Exception:
+            text = None
+        if text is None:
+            continue
+        store_relevance(conn, row["id"], text)
+        scored += 1
+        conn.commit()
+    return scored
+
+
+def refresh_scores(conn) -> None:
+    """Rescale every stored score after the number of keywords and companies has changed."""
+    total = _pattern_total(conn)
+    conn.execute(
+        "UPDATE article_relevance SET score = CASE WHEN ? > 0 THEN match_count * 1.0 / ? ELSE 0.0 END",
+        (total, total),
+    )
+
+
+def add_pattern(conn, kind: str, pattern_id: int, pattern: str,
+                fetch_text: Callable[[str], Optional[str]]) -> int:
+    """Check only the new keyword or company against scored articles. Returns the number of rows it matched.
+
+    Article texts are read, and possibly fetched, with no transaction open; the
+    matches are then added in one short transaction that edits each row's stored
+    list, so other writers are not locked out and concurrent calls do not
+    overwrite each other's matches. Commits whatever the caller had pending first.
+    """
+    column = PATTERN_KINDS[kind][2]
+    if conn.in_transaction:
+        conn.commit()
+    rows = conn.execute(
+        f'''SELECT r.article_id, a.url FROM article_relevance r
+            JOIN articles a ON a.id = r.article_id
+            WHERE NOT EXISTS (SELECT 1 FROM json_each(r.{column}) WHERE value = ?)
+            ORDER BY r.article_id''',
+        (pattern_id,),
+    ).fetchall()
+
+    matching = []
+    for row in rows:
+        try:
+            text = fetch_text(row["url"])
+        except Exception:
+            text = None
+        if text is not None and pattern in text:
+            matching.append(row["article_id"])
+
+    try:
+        cursor = conn.executemany(
+            f'''UPDATE article_relevance
+                SET {column} = (SELECT json_group_array(value) FROM (
+                        SELECT value FROM json_each({column}) UNION SELECT ? ORDER BY value)),
+                    match_count = match_count + 1, updated_at = CURRENT_TIMESTAMP
+                WHERE article_id = ? AND NOT EXISTS (SELECT 1 FROM json_each({column}) WHERE value = ?)''',
+            [(pattern_id, article_id, pattern_id) for article_id in matching],
+        )
+        updated = max(cursor.rowcount, 0)
+        refresh_scores(conn)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return updated
+
+
+def remove_pattern(conn, kind: str, pattern_id: int) -> int:
+    """Drop a deleted keyword or company from the rows that matched it; the caller commits."""
+    column = PATTERN_KINDS[kind][2]
+    cursor = conn.execute(
+        f'''UPDATE article_relevance
+            SET {column} = (SELECT json_group_array(value) FROM (
+                    SELECT value FROM json_each({column}) WHERE value != ? ORDER BY value)),
+                match_count = match_count - 1, updated_at = CURRENT_TIMESTAMP
+            WHERE EXISTS (SELECT 1 FROM json_each({column}) WHERE value = ?)''',
+        (pattern_id, pattern_id),
+    )
+    refresh_scores(conn)
+    return cursor.rowcount
+
+
+def matched_names(conn, row) -> Tuple[List[str], List[str]]:
+    """Resolve a relevance row's matched IDs back to keyword words and company names."""
+    names = []
+    for kind in ("keyword", "company"):
+        table, name_column, ids_column = PATTERN_KINDS[kind]
+        ids = json.loads(row[ids_column])
+        if not ids:
+            names.append([])
+            continue
+        placeholders = ",".join("?" * len(ids))
+        names.append([
+            r[name_column] for r in conn.execute(
+                f"SELECT {name_column} FROM {table} WHERE id IN ({placeholders}) ORDER BY id", ids
+            )
+        ])
+    return names[0], names[1]
@@ -0,0 +1,227 @@
+"""Resident scheduler that collects each source on its own interval."""
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import metrics
+from config import Config
+from news_collector import NewsCollector
+from news_processor import NewsProcessor
+from polling_planner import PollingPlanner
+
+
+@dataclass
+class SourceSchedule:
+    """Scheduling state of one RSS feed or scrape source."""
+
+    kind: str
+    source: Any
+    category: str
+    interval_seconds: float
+    next_run: float = 0.0
+    failures: int = 0
+    last_run: Optional[float] = None
+    last_duration: float = 0.0
+    last_article_count: int = 0
+    last_error: str = ""
+
+    @property
+    def key(self) -> str:
+        """Feed URL for RSS sources, source name for scrape sources."""
+        if self.kind == "rss":
+            return self.source
+        return self.source.get("name") or self.source["url"]
+
+
+_planners: Dict[Tuple[str, float, float, float], PollingPlanner] = {}
+_planners_lock = threading.Lock()
+
+
+def shared_planner(config: Config) -> PollingPlanner:
+    """The process-wide polling planner described by the configuration."""
+    key = (config.state_db_path, config.polling_target_freshness,
+           config.polling_min_interval_minutes * 60, config.polling_max_interval_hours * 3600)
+    with _planners_lock:
+        planner = _planners.get(key)
+        if planner is None:
+            planner = _planners[key] = PollingPlanner(
+                key[0], target_freshness=key[1], min_interval_seconds=key[2], max_interval_seconds=key[3],
+            )
+        return planner
+
+
+class Scheduler:
+    """Keeps the collector, processor and notifier warm and runs each source when it is due.
+
+    Every source runs on its own interval with random jitter, so sources spread out
+    instead of firing together. Sources without an explicit interval start at
+    ``update_interval_hours`` and, with adaptive polling, move to the interval the
+    polling planner derives from how often they actually publish. Failing or slow
+    sources back off exponentially up to ``scheduler_max_backoff_hours``.
+    """
+
+    def __init__(self, config: Config, collector: Optional[NewsCollector] = None,
+                 processor: Optional[NewsProcessor] = None, notifier: Any = None, outbox: Any = None,
+                 deduplicator: Any = None, planner: Any = None, clock: Callable[[], float] = time.time,
+                 rng: Optional[random.Random] = None):
+        """Build the long-lived pipeline components and one schedule per configured source."""
+        self.config = config
+        self.logger = logging.getLogger(__name__)
+        self.clock = clock
+        self.rng = rng or random.Random()
+        self.collector = collector or NewsCollector(config)
+        self.processor = processor or NewsProcessor(config)
+
+        if notifier is None:
+            from teams_notifier import TeamsNotifier
+            notifier = TeamsNotifier(config)
+        if outbox is None:
+            from teams_outbox import shared_outbox
+            outbox = shared_outbox(config.state_db_path, max_attempts=config.teams_outbox_max_attempts)
+        if deduplicator is None and config.dedup_enabled:
+            from dedup import Deduplicator
+            deduplicator = Deduplicator(config.state_db_path, threshold=config.dedup_threshold)
+        if planner is None and config.adaptive_polling:
+            planner = shared_planner(config)
+        self.notifier = notifier
+        self.outbox = outbox
+        self.deduplicator = deduplicator
+        self.planner = planner
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, config.max_concurrent_fetches),
+            thread_name_prefix="scheduler",
+        )
+
+        now = self.clock()
+        self.schedules: List[SourceSchedule] = []
+        for kind, source, category in self.collector.collection_tasks():
+            schedule = SourceSchedule(kind=kind, source=source, category=category, interval_seconds=0.0)
+            schedule.interval_seconds = self._interval(schedule)
+            # Spread the first round out a little so sources don't all fire at startup.
+            schedule.next_run = now + self.rng.uniform(0, min(60.0, schedule.interval_seconds * config.scheduler_jitter_ratio))
+            self.schedules.append(schedule)
+
+    def run_forever(self, stop_event: Optional[threading.Event] = None) -> None:
+        """Run due sources until stop_event is set."""
+        stop_event = stop_event or threading.Event()
+        self.logger.info(f"Scheduler started with {len(self.schedules)} sources")
+
+        while not stop_event.is_set():
+            try:
+                self.run_pending()
+            except Exception as e:
+                self.logger.error(f"Error in scheduler cycle: {e}")
+            stop_event.wait(self.seconds_until_next())
+
+        self._executor.shutdown(wait=False)
+        self.logger.info("Scheduler stopped")
+
+    def seconds_until_next(self) -> float:
+        """Time until the next source is due."""
+        if not self.schedules:
+            return 60.0
+        return max(0.0, min(schedule.next_run for schedule in self.schedules) - self.clock())
+
+    def run_pending(self) -> int:
+        """Collect every due source, then process and post what they produced. Returns articles collected."""
+        now = self.clock()
+        due = [schedule for schedule in self.schedules if schedule.next_run <= now]
+        if not due:
+            return 0
+
+        before = metrics.REGISTRY.snapshot()
+        futures = [self._executor.submit(self._collect, schedule) for schedule in due]
+        articles: List[Dict[str, Any]] = []
+        for future in futures:
+            articles.extend(future.result())
+
+        if articles:
+            self._handle_articles(articles)
+        for line in metrics.run_summary(before):
+            self.logger.info(f"  {line}")
+        return len(articles)
+
+    def status(self) -> List[Dict[str, Any]]:
+        """Scheduling state of every source, soonest first."""
+        return [
+            {
+                "source": schedule.key,
+                "kind": schedule.kind,
+                "category": schedule.category,
+                "interval_seconds": schedule.interval_seconds,
+                "next_run": schedule.next_run,
+                "last_run": schedule.last_run,
+                "last_duration": schedule.last_duration,
+                "last_article_count": schedule.last_article_count,
+                "failures": schedule.failures,
+                "last_error": schedule.last_error,
+            }
+            for schedule in sorted(self.schedules, key=lambda schedule: schedule.next_run)
+        ]
+
+    def _interval(self, schedule: SourceSchedule) -> float:
+        """Configured interval for a source; sources without an explicit one adapt when a planner is set."""
+        hours = self.config.source_update_interval_hours.get(schedule.key)
+        if hours is None and schedule.kind == "scrape":
+            hours = schedule.source.get("update_interval_hours")
+        if hours is not None:
+            return float(hours) * 3600
+
+        default_seconds = float(self.config.update_interval_hours) * 3600
+        if self.planner:
+            return self.planner.next_interval(schedule.key, default_seconds)
+        return default_seconds
+
+    def _collect(self, schedule: SourceSchedule) -> List[Dict[str, Any]]:
+        started = self.clock()
+        articles: List[Dict[str, Any]] = []
+        try:
+            articles = self.collector.collect_source(schedule.kind, schedule.source, schedule.category)
+            schedule.failures = 0
+            schedule.last_error = ""
+            if self.planner:
+                self.planner.record(schedule.key, [article.get("url", "") for article in articles], started)
+                schedule.interval_seconds = self._interval(schedule)
+        except Exception as e:
+            schedule.failures += 1
+            schedule.last_error = str(e)
+            self.logger.warning(f"Source {schedule.key} failed ({schedule.failures} in a row): {e}")
+
+        schedule.last_run = started
+        schedule.last_duration = self.clock() - started
+        schedule.last_article_count = len(articles)
+        schedule.next_run = schedule.last_run + self._next_delay(schedule)
+        return articles
+
+    def _next_delay(self, schedule: SourceSchedule) -> float:
+        """Interval with jitter, doubled per consecutive failure and once more for a slow fetch."""
+        penalty = schedule.failures
+        if schedule.last_duration > self.config.scheduler_slow_source_seconds:
+            penalty += 1
+            self.logger.info(f"Source {schedule.key} took {schedule.last_duration:.1f}s, backing off")
+
+        delay = schedule.interval_seconds * (2 ** min(penalty, 16))
+        if penalty:
+            delay = min(delay, max(schedule.interval_seconds, self.config.scheduler_max_backoff_hours * 3600))
+        jitter = self.config.scheduler_jitter_ratio
+        return delay * self.rng.uniform(1 - jitter, 1 + jitter)
+
+    def _handle_articles(self, articles: List[Dict[str, Any]]) -> None:
+        if self.deduplicator:
+            articles = self.deduplicator.deduplicate(articles)
+
+        processed_articles = self.processor.process_articles(articles)
+        if processed_articles:
+            queued = self.outbox.enqueue(processed_articles[:self.config.max_teams_posts])
+            self.logger.info(f"Queued {queued} new articles for Teams")
+
+        delivered = asyncio.run(self.outbox.drain(self.notifier, self.config.teams_outbox_batch_size))
+        self.logger.info(f"Cycle done: {len(articles)} articles, {len(processed_articles)} passed filtering, "
+                         f"{delivered} posted to Teams")
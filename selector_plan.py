@@ -0,0 +1,180 @@
+"""Compiled scrape-source selectors and the HTML parsing backends that run them."""
+
+import importlib.util
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import urljoin
+
+# soupsieve extensions that the selectolax engine does not understand.
+SOUPSIEVE_ONLY = re.compile(r":(-soup-)?contains\(")
+# Leading compound of a selector that a SoupStrainer can express: a tag, a class or an id.
+STRAINABLE_PREFIX = re.compile(r"^\s*(?P<tag>[a-zA-Z][\w-]*)?(?:(?P<kind>[.#])(?P<name>[\w-]+))?(?P<rest>.*)$")
+
+
+def available_backends() -> List[str]:
+    """Backends whose libraries are installed, fastest first."""
+    backends = []
+    if importlib.util.find_spec("selectolax"):
+        backends.append("selectolax")
+    if importlib.util.find_spec("lxml"):
+        backends.append("lxml")
+    backends.append("html.parser")
+    return backends
+
+
+def choose_backend(preferred: str = "auto") -> str:
+    """The configured backend if installed, otherwise the fastest one that is."""
+    installed = available_backends()
+    if preferred in installed:
+        return preferred
+    return installed[0]
+
+
+def strainer_root(selector: str) -> Optional[Dict[str, str]]:
+    """Describe the elements every match of `selector` lies within, or None if there is no such root.
+
+    `.news-list .news-item` only matches inside `.news-list`, so parsing can skip the
+    rest of the page. Selector groups, sibling combinators right after the first
+    compound and pseudo-classes on it disable this.
+    """
+    if "," in selector:
+        return None
+    match = STRAINABLE_PREFIX.match(selector)
+    if not match or not (match.group("tag") or match.group("name")):
+        return None
+    rest = match.group("rest")
+    if rest and not (rest[0].isspace() or rest.lstrip().startswith(">")):
+        return None
+    if rest.strip().startswith(("+", "~")):
+        return None
+
+    root = {}
+    if match.group("tag"):
+        root["name"] = match.group("tag").lower()
+    if match.group("kind") == ".":
+        root["class"] = match.group("name")
+    elif match.group("kind") == "#":
+        root["id"] = match.group("name")
+    return root
+
+
+@dataclass
+class SelectorPlan:
+    """A scrape source's selectors, compiled once and applied to every page it serves.
+
+    `title`, `link` and `date` are None when the item element itself is used
+    ("self" or an empty selector; no date for an empty date selector).
+    """
+
+    news: str
+    title: Optional[str]
+    link: Optional[str]
+    date: Optional[str]
+    root: Optional[Dict[str, str]]
+    soupsieve_only: bool
+    compiled: tuple = field(init=False, repr=False)
+
+    def __post_init__(self):
+        import soupsieve
+        self.compiled = tuple(
+            soupsieve.compile(selector) if selector else None
+            for selector in (self.news, self.title, self.link, self.date)
+        )
+
+    @classmethod
+    def compile(cls, source: Dict[str, Any]) -> "SelectorPlan":
+        def item_selector(value: str) -> Optional[str]:
+            return None if value in ("self", "") else value
+
+        selectors = [source["news_selector"], source.get("title_selector", ""),
+                     source.get("link_selector", ""), source.get("date_selector", "")]
+        return cls(
+            news=source["news_selector"],
+            title=item_selector(source.get("title_selector", "")),
+            link=item_selector(source.get("link_selector", "")),
+            date=source.get("date_selector") or None,
+            root=strainer_root(source["news_selector"]),
+            soupsieve_only=any(SOUPSIEVE_ONLY.search(selector or "") for selector in selectors),
+        )
+
+    def extract(self, content: bytes, base_url: str, backend: str = "html.parser",
+                on_error: Optional[Callable[[Exception], None]] = None) -> List[Dict[str, str]]:
+        """Return the title, absolute URL and date text of every item on a page.
+
+        Items whose title or link selector finds nothing are skipped; items that raise
+        are reported to `on_error` and skipped.
+        """
+        if backend == "selectolax" and not self.soupsieve_only:
+            return self._extract_selectolax(content, base_url, on_error)
+        return self._extract_soup(content, base_url, "lxml" if backend == "lxml" else "html.parser", on_error)
+
+    def _extract_soup(self, content: bytes, base_url: str, parser: str,
+                      on_error: Optional[Callable[[Exception], None]]) -> List[Dict[str, str]]:
+        from bs4 import BeautifulSoup, SoupStrainer
+
+        parse_only = None
+        if self.root:
+            attrs = {key: value for key, value in self.root.items() if key != "name"}
+            parse_only = SoupStrainer(self.root.get("name"), attrs=attrs)
+        soup = BeautifulSoup(content, parser, parse_only=parse_only)
+
+        news, title, link, date = self.compiled
+        items = []
+        for item in news.select(soup):
+            try:
+                title_elem = title.select_one(item) if title else item
+                link_elem = link.select_one(item) if link else item
+                date_elem = date.select_one(item) if date else None
+                if title_elem and link_elem:
+                    items.append(self._item(
+                        title_elem.get_text(strip=True),
+                        link_elem.get("href", ""),
+                        date_elem.get_text(strip=True) if date_elem else "",
+                        base_url,
+                    ))
+            except Exception as e:
+                if on_error:
+                    on_error(e)
+        return items
+
+    def _extract_selectolax(self, content: bytes, base_url: str,
+                            on_error: Optional[Callable[[Exception], None]]) -> List[Dict[str, str]]:
+        from selectolax.parser import HTMLParser
+
+        items = []
+        for item in HTMLParser(content).css(self.news):
+            try:
+                title_elem = item.css_first(self.title) if self.title else item
+                link_elem = item.css_first(self.link) if self.link else item
+                date_elem = item.css_first(self.date) if self.date else None
+                if title_elem and link_elem:
+                    items.append(self._item(
+                        title_elem.text(strip=True),
+                        link_elem.attributes.get("href") or "",
+                        date_elem.text(strip=True) if date_elem else "",
+                        base_url,
+                    ))
+            except Exception as e:
+                if on_error:
+                    on_error(e)
+        return items
+
+    def _item(self, title: str, link: str, date: str, base_url: str) -> Dict[str, str]:
+        if link.startswith("/"):
+            link = urljoin(base_url, link)
+        return {"title": title, "url": link, "published_date": date}
+
+
+_plan_cache: Dict[str, SelectorPlan] = {}
+
+
+def plan_for(source: Dict[str, Any]) -> SelectorPlan:
+    """The compiled plan of a scrape source config, built on first use."""
+    key = json.dumps([source.get(name, "") for name in
+                      ("news_selector", "title_selector", "link_selector", "date_selector")], ensure_ascii=False)
+    plan = _plan_cache.get(key)
+    if plan is None:
+        plan = _plan_cache[key] = SelectorPlan.compile(source)
+    return plan
@@ -0,0 +1,97 @@
+"""Conditional GET validator cache for RSS and scrape sources."""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from state_db import connect_state_db
+
+
+class SourceCache:
+    """Stores ETag, Last-Modified and body hash per source alongside the articles parsed from it."""
+
+    def __init__(self, db_path: str):
+        """Open the cache in the given state database."""
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._conn = connect_state_db(db_path)
+        with self._lock:
+            self._conn.execute('''CREATE TABLE IF NOT EXISTS source_validators (
+                source TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                content_hash TEXT,
+                articles TEXT,
+                updated_at REAL
+            )''')
+            self._conn.commit()
+
+    def request_headers(self, source: str) -> Dict[str, str]:
+        """Build If-None-Match / If-Modified-Since headers for a source."""
+        row = self._get(source)
+        headers = {}
+        if row and row["articles"] is not None:
+            if row["etag"]:
+                headers["If-None-Match"] = row["etag"]
+            if row["last_modified"]:
+                headers["If-Modified-Since"] = row["last_modified"]
+        return headers
+
+    def unchanged_articles(self, source: str, response: Any) -> Optional[List[Dict[str, Any]]]:
+        """Return the cached articles if the response is a 304 or its body hash is unchanged."""
+        row = self._get(source)
+        if not row or row["articles"] is None:
+            return None
+
+        if response.status_code != 304 and hashlib.sha256(response.content).hexdigest() != row["content_hash"]:
+            return None
+
+        with self._lock:
+            self._conn.execute(
+                "UPDATE source_validators SET etag = ?, last_modified = ?, updated_at = ? WHERE source = ?",
+                (response.headers.get("ETag") or row["etag"],
+                 response.headers.get("Last-Modified") or row["last_modified"],
+                 time.time(),
+                 source),
+            )
+            self._conn.commit()
+        return json.loads(row["articles"])
+
+    def store(self, source: str, response: Any, articles: List[Dict[str, Any]]) -> None:
+        """Remember the validators and parsed articles for a freshly downloaded source."""
+        with self._lock:
+            self._conn.execute(
+                '''INSERT OR REPLACE INTO source_validators
+                   (source, etag, last_modified, content_hash, articles, updated_at)
+                   VALUES (?, ?, ?, ?, ?, ?)''',
+                (source,
+                 response.headers.get("ETag"),
+                 response.headers.get("Last-Modified"),
+                 hashlib.sha256(response.content).hexdigest(),
+                 json.dumps(articles, ensure_ascii=False),
+                 time.time()),
+            )
+            self._conn.commit()
+
+    def _get(self, source: str) -> Optional[Any]:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT etag, last_modified, content_hash, articles FROM source_validators WHERE source = ?",
+                (source,),
+            ).fetchone()
+
+
+_caches: Dict[str, SourceCache] = {}
+_caches_lock = threading.Lock()
+
+
+def shared_source_cache(db_path: str) -> SourceCache:
+    """The process-wide cache for this state database."""
+    with _caches_lock:
+        cache = _caches.get(db_path)
+        if cache is None:
+            cache = _caches[db_path] = SourceCache(db_path)
+        return cache
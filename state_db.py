@@ -0,0 +1,37 @@
+"""Local state database shared by the collector caches."""
+
+import os
+import sqlite3
+
+
+def state_db_location(db_path: str) -> str:
+    """Where the configured state_db_path lives on disk.
+
+    STATE_DB_PATH overrides it. Otherwise a relative path is placed in the
+    directory of DB_PATH (or DATABASE_PATH) when one is set, so the state, and
+    with it the record of articles already posted to Teams, is kept on the same
+    persistent volume as the article database instead of in the working directory.
+    """
+    override = os.environ.get("STATE_DB_PATH")
+    if override:
+        return override
+    if os.path.isabs(db_path):
+        return db_path
+    database = os.environ.get("DB_PATH") or os.environ.get("DATABASE_PATH")
+    if database:
+        return os.path.join(os.path.dirname(os.path.abspath(database)), os.path.basename(db_path))
+    return db_path
+
+
+def connect_state_db(db_path: str) -> sqlite3.Connection:
+    """Open the bot's local state database, creating its directory if needed."""
+    db_path = state_db_location(db_path)
+    db_dir = os.path.dirname(db_path)
+    if db_dir:
+        os.makedirs(db_dir, exist_ok=True)
+
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
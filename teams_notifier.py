@@ -1,11 +1,66 @@
 """Microsoft Teams webhook notification module."""
 
+import asyncio
 import logging
-import requests
+import random
 import time
-from typing import Dict, Any, List
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Dict, Any, List, Optional
 
+import metrics
 from config import Config
+from http_client import shared_client
+
+
+@dataclass
+class DeliveryResult:
+    """Outcome of delivering one article to Teams."""
+    
+    url: str
+    title: str
+    success: bool
+    status_code: Optional[int] = None
+    attempts: int = 0
+    error: str = ""
+
+
+class TokenBucket:
+    """Async token-bucket rate limiter that slows down when Teams pushes back."""
+    
+    def __init__(self, rate: float, capacity: int):
+        """Allow `rate` requests per second with bursts of up to `capacity`."""
+        self.max_rate = rate
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+    
+    async def acquire(self) -> None:
+        """Wait until a request may be sent."""
+        while True:
+            now = time.monotonic()
+            if now < self.blocked_until:
+                await asyncio.sleep(self.blocked_until - now)
+                continue
+            
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+    
+    def throttle(self, retry_after: float) -> None:
+        """Back off after a 429: hold all requests for retry_after seconds and halve the rate."""
+        self.blocked_until = max(self.blocked_until, time.monotonic() + retry_after)
+        self.rate = max(self.max_rate / 8, self.rate / 2)
+        self.tokens = 0.0
+    
+    def recover(self) -> None:
+        """Raise the rate back towards the configured maximum after a success."""
+        self.rate = min(self.max_rate, self.rate + self.max_rate / 10)
 
 
 class TeamsNotifier:
@@ -15,48 +70,131 @@ class TeamsNotifier:
         """Initialize the Teams notifier with configuration."""
         self.config = config
         self.logger = logging.getLogger(__name__)
-        
+        self.http = shared_client(config)
+    
     def post_article(self, article: Dict[str, Any]) -> bool:
         """Post a single article to Teams with category label."""
+        started = time.perf_counter()
         try:
-            category_labels = {
-                "government": "[政府]",
-                "market": "[市場]", 
-                "municipality": "[自治体]",
-                "general": ""
-            }
-            
-            category = article.get("category", "general")
-            label = category_labels.get(category, "")
-            
-            title_with_label = f"{label} {article['title']}" if label else article['title']
-            
-            message = {
-                "text": f"**{title_with_label}**\n\n[Read more]({article['url']})"
-            }
-            
-            response = requests.post(
-                self.config.teams_webhook_url,
-                json=message,
-                headers={"Content-Type": "application/json"},
-                timeout=10
-            )
+            response = self.http.post(self.config.teams_webhook_url, json=self._build_message(article))
+            metrics.TEAMS_REQUEST_SECONDS.observe(time.perf_counter() - started, status=str(response.status_code))
             
             if response.status_code == 200:
                 self.logger.info(f"Successfully posted article: {article['title']}")
+                metrics.TEAMS_DELIVERIES.inc(outcome="delivered")
                 return True
             else:
                 self.logger.error(f"Failed to post article. Status: {response.status_code}")
+                metrics.TEAMS_DELIVERIES.inc(outcome="failed")
                 return False
-                
+        
         except Exception as e:
+            metrics.TEAMS_REQUEST_SECONDS.observe(time.perf_counter() - started, status="error")
             self.logger.error(f"Error posting to Teams: {e}")
+            metrics.TEAMS_DELIVERIES.inc(outcome="failed")
             return False
-            
-    def post_articles(self, articles: List[Dict[str, Any]]) -> None:
+    
+    def post_articles(self, articles: List[Dict[str, Any]]) -> List[DeliveryResult]:
         """Post multiple articles to Teams with rate limiting."""
-        for i, article in enumerate(articles):
-            self.post_article(article)
+        return asyncio.run(self.post_articles_async(articles))
+    
+    async def post_articles_async(self, articles: List[Dict[str, Any]]) -> List[DeliveryResult]:
+        """Post articles in order over a pooled async client, honouring Teams rate limits."""
+        bucket = TokenBucket(self.config.teams_rate_per_second, self.config.teams_burst)
+        results = []
+        async with self.http.async_client() as client:
+            for article in articles:
+                results.append(await self._deliver(client, bucket, article))
+        
+        delivered = sum(1 for result in results if result.success)
+        self.logger.info(f"Delivered {delivered} of {len(results)} articles to Teams")
+        return results
+    
+    async def _deliver(self, client: Any, bucket: TokenBucket, article: Dict[str, Any]) -> DeliveryResult:
+        """Deliver one article with bounded retries and jittered exponential backoff."""
+        result = await self._deliver_with_retries(client, bucket, article)
+        metrics.TEAMS_DELIVERIES.inc(outcome="delivered" if result.success else "failed")
+        return result
+    
+    async def _deliver_with_retries(self, client: Any, bucket: TokenBucket, article: Dict[str, Any]) -> DeliveryResult:
+        result = DeliveryResult(url=article.get("url", ""), title=article.get("title", ""), success=False)
+        
+        try:
+            message = self._build_message(article)
+        except Exception as e:
+            result.error = str(e)
+            self.logger.error(f"Error building Teams message: {e}")
+            return result
+        
+        for attempt in range(self.config.teams_max_retries + 1):
+            await bucket.acquire()
+            result.attempts = attempt + 1
+            retry_after = None
+            
+            started = time.perf_counter()
+            try:
+                response = await client.post(self.config.teams_webhook_url, json=message)
+                result.status_code = response.status_code
+                metrics.TEAMS_REQUEST_SECONDS.observe(time.perf_counter() - started, status=str(response.status_code))
+                
+                if response.status_code == 200:
+                    bucket.recover()
+                    result.success = True
+                    result.error = ""
+                    self.logger.info(f"Successfully posted article: {result.title}")
+                    return result
+                
+                result.error = f"HTTP {response.status_code}"
+                if response.status_code == 429:
+                    retry_after = self._parse_retry_after(response.headers.get("Retry-After"))
+                    bucket.throttle(retry_after if retry_after is not None else self._backoff(attempt))
+                elif response.status_code < 500:
+                    self.logger.error(f"Failed to post article. Status: {response.status_code}")
+                    return result
+            except Exception as e:
+                metrics.TEAMS_REQUEST_SECONDS.observe(time.perf_counter() - started, status="error")
+                result.error = str(e)
             
-            if i > 0 and i % 4 == 0:
-                time.sleep(1)
+            if attempt < self.config.teams_max_retries:
+                metrics.TEAMS_RETRIES.inc()
+                delay = retry_after if retry_after is not None else self._backoff(attempt)
+                self.logger.warning(f"Teams delivery failed ({result.error}), retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+        
+        self.logger.error(f"Giving up on article after {result.attempts} attempts: {result.error}")
+        return result
+    
+    def _build_message(self, article: Dict[str, Any]) -> Dict[str, str]:
+        """Build the Teams message payload with the category label."""
+        category_labels = {
+            "government": "[政府]",
+            "market": "[市場]",
+            "municipality": "[自治体]",
+            "general": ""
+        }
+        
+        category = article.get("category", "general")
+        label = category_labels.get(category, "")
+        
+        title_with_label = f"{label} {article['title']}" if label else article['title']
+        
+        return {
+            "text": f"**{title_with_label}**\n\n[Read more]({article['url']})"
+        }
+    
+    def _backoff(self, attempt: int) -> float:
+        """Exponential backoff with full jitter."""
+        return random.uniform(0, self.config.teams_backoff_seconds * (2 ** attempt))
+    
+    def _parse_retry_after(self, value: Optional[str]) -> Optional[float]:
+        """Parse a Retry-After header given either in seconds or as an HTTP date."""
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
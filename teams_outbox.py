@@ -0,0 +1,243 @@
+"""Durable outbox for Microsoft Teams notifications."""
+
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from state_db import connect_state_db
+
+
+def url_hash(url: str) -> str:
+    """Key outbox messages by a stable hash of the article URL."""
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+
+class TeamsOutbox:
+    """SQLite-backed queue of Teams messages that remembers which URLs were already delivered.
+
+    Messages move from "enqueued" to "sending" while a drainer holds them, then to
+    "sent", back to "enqueued", or to "failed" once they have used up their delivery
+    attempts. A drainer claims messages by leasing them, so several drainers sharing
+    one database never post the same message; a lease that runs out (a drainer that
+    died mid-post) makes the message claimable again. Re-enqueueing a sent URL is a
+    no-op; re-enqueueing a failed one gives it a fresh set of attempts.
+    """
+
+    def __init__(self, db_path: str, max_attempts: int = 5, lease_seconds: float = 300.0):
+        """Open the outbox in the given state database."""
+        self.logger = logging.getLogger(__name__)
+        self.max_attempts = max_attempts
+        self.lease_seconds = lease_seconds
+        self._lock = threading.Lock()
+        self._conn = connect_state_db(db_path)
+        with self._lock:
+            self._conn.execute('''CREATE TABLE IF NOT EXISTS teams_outbox (
+                url_hash TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                article TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'enqueued',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                last_error TEXT,
+                enqueued_at REAL,
+                sent_at REAL
+            )''')
+            existing = {row[1] for row in self._conn.execute("PRAGMA table_info(teams_outbox)")}
+            for column in ("lease_until", "attempted_at"):
+                if column not in existing:
+                    self._conn.execute(f"ALTER TABLE teams_outbox ADD COLUMN {column} REAL")
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_teams_outbox_status ON teams_outbox (status, enqueued_at)"
+            )
+            self._conn.commit()
+
+    def enqueue(self, articles: List[Dict[str, Any]]) -> int:
+        """Queue articles for delivery, skipping URLs already sent or queued. Returns the number queued."""
+        now = time.time()
+        queued = 0
+        with self._lock:
+            for article in articles:
+                url = article.get("url", "")
+                if not url:
+                    continue
+                cursor = self._conn.execute(
+                    '''INSERT INTO teams_outbox (url_hash, url, article, status, attempts, enqueued_at)
+                       VALUES (?, ?, ?, 'enqueued', 0, ?)
+                       ON CONFLICT(url_hash) DO UPDATE SET
+                           status = 'enqueued', attempts = 0, last_error = NULL, enqueued_at = excluded.enqueued_at
+                       WHERE teams_outbox.status = 'failed' ''',
+                    (url_hash(url), url, json.dumps(article, ensure_ascii=False, default=str), now),
+                )
+                queued += cursor.rowcount
+            self._conn.commit()
+        return queued
+
+    def claim(self, limit: int, attempted_before: Optional[float] = None) -> List[Tuple[str, Dict[str, Any]]]:
+        """Lease up to `limit` queued messages to the caller, in enqueue order.
+
+        Claimed messages are "sending" until marked sent or failed, and no other
+        claim returns them unless the lease runs out. With `attempted_before`,
+        messages already attempted since then are left for a later drain.
+        """
+        now = time.time()
+        with self._lock:
+            rows = self._conn.execute(
+                '''UPDATE teams_outbox SET status = 'sending', lease_until = ?
+                   WHERE url_hash IN (
+                       SELECT url_hash FROM teams_outbox
+                       WHERE (status = 'enqueued' AND (attempted_at IS NULL OR attempted_at < ?))
+                          OR (status = 'sending' AND lease_until < ?)
+                       ORDER BY enqueued_at, rowid LIMIT ?
+                   )
+                   RETURNING url_hash, article, enqueued_at''',
+                (now + self.lease_seconds, now if attempted_before is None else attempted_before, now, limit),
+            ).fetchall()
+            self._conn.commit()
+        rows.sort(key=lambda row: row["enqueued_at"] or 0.0)
+        return [(row["url_hash"], json.loads(row["article"])) for row in rows]
+
+    def mark_sent(self, key: str) -> None:
+        """Record a successful delivery."""
+        with self._lock:
+            self._conn.execute(
+                '''UPDATE teams_outbox SET status = 'sent', attempts = attempts + 1, last_error = NULL, sent_at = ?,
+                       attempted_at = ?, lease_until = NULL
+                   WHERE url_hash = ?''',
+                (time.time(), time.time(), key),
+            )
+            self._conn.commit()
+
+    def mark_failed(self, key: str, error: str) -> None:
+        """Record a failed delivery, giving up on the message once it runs out of attempts."""
+        with self._lock:
+            self._conn.execute(
+                '''UPDATE teams_outbox
+                   SET attempts = attempts + 1, last_error = ?, attempted_at = ?, lease_until = NULL,
+                       status = CASE WHEN attempts + 1 >= ? THEN 'failed' ELSE 'enqueued' END
+                   WHERE url_hash = ?''',
+                (error, time.time(), self.max_attempts, key),
+            )
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, int]:
+        """Count messages by status."""
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) AS count FROM teams_outbox GROUP BY status").fetchall()
+        counts = {"enqueued": 0, "sent": 0, "failed": 0}
+        counts.update({row["status"]: row["count"] for row in rows})
+        return counts
+
+    async def drain(self, notifier: Any, batch_size: int = 10) -> int:
+        """Deliver every currently queued message once, in batches. Returns the number delivered.
+
+        Each batch is claimed before it is posted, so drainers running at the same
+        time in other threads or processes split the queue instead of both posting
+        it. Database calls run in a worker thread to keep the event loop free.
+        """
+        started = time.time()
+        delivered = attempted = 0
+        while True:
+            batch = await asyncio.to_thread(self.claim, batch_size, started)
+            if not batch:
+                break
+            attempted += len(batch)
+            try:
+                results = await notifier.post_articles_async([article for _, article in batch])
+            except Exception as e:
+                for key, _ in batch:
+                    await asyncio.to_thread(self.mark_failed, key, str(e))
+                raise
+            for (key, _), result in zip(batch, results):
+                if result.success:
+                    await asyncio.to_thread(self.mark_sent, key)
+                    delivered += 1
+                else:
+                    await asyncio.to_thread(self.mark_failed, key, result.error)
+
+        if attempted:
+            self.logger.info(f"Outbox drain delivered {delivered} of {attempted} claimed Teams messages")
+        return delivered
+
+
+class OutboxDrainer:
+    """Background asyncio task that drains the outbox periodically and whenever it is woken."""
+
+    def __init__(self, outbox: TeamsOutbox, notifier: Any, batch_size: int, interval_seconds: float):
+        """Configure the drainer; call start() from inside the event loop."""
+        self.outbox = outbox
+        self.notifier = notifier
+        self.batch_size = batch_size
+        self.interval_seconds = interval_seconds
+        self.logger = logging.getLogger(__name__)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake_event: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start draining on the running event loop."""
+        self._loop = asyncio.get_running_loop()
+        self._wake_event = asyncio.Event()
+        self._task = self._loop.create_task(self._run())
+
+    @property
+    def running(self) -> bool:
+        """Whether the drainer's event loop is still alive."""
+        return self._loop is not None and not self._loop.is_closed() and self._loop.is_running()
+
+    def wake(self) -> None:
+        """Ask the drainer to deliver newly queued messages now; safe to call from any thread."""
+        if not self._wake_event:
+            return
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+
+        if running_loop is self._loop:
+            self._wake_event.set()
+        elif self.running:
+            self._loop.call_soon_threadsafe(self._wake_event.set)
+
+    async def stop(self) -> None:
+        """Cancel the background task."""
+        if not self._task:
+            return
+        if asyncio.get_running_loop() is self._loop:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        elif self.running:
+            self._loop.call_soon_threadsafe(self._task.cancel)
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.outbox.drain(self.notifier, self.batch_size)
+            except Exception as e:
+                self.logger.error(f"Error draining Teams outbox: {e}")
+
+            try:
+                await asyncio.wait_for(self._wake_event.wait(), timeout=self.interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wake_event.clear()
+
+
+_outboxes: Dict[Tuple[str, int], TeamsOutbox] = {}
+_outboxes_lock = threading.Lock()
+
+
+def shared_outbox(db_path: str, max_attempts: int = 5) -> TeamsOutbox:
+    """The process-wide outbox for this state database and retry limit."""
+    key = (db_path, max_attempts)
+    with _outboxes_lock:
+        outbox = _outboxes.get(key)
+        if outbox is None:
+            outbox = _outboxes[key] = TeamsOutbox(db_path, max_attempts=max_attempts)
+        return outbox
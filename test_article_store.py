@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""Test stored article content and full-text search."""
+
+import sys
+import os
+import sqlite3
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from article_store import (create_search_index, migrate_articles_table, normalize_published_date,
+                           search_articles, upsert_articles)
+
+
+def test_search_finds_japanese_terms_by_date():
+    """Articles are searchable by Japanese substrings, ranked, snippeted and filtered by published date."""
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    conn.execute("CREATE TABLE articles (id INTEGER PRIMARY KEY AUTOINCREMENT, url TEXT UNIQUE)")
+    conn.execute("INSERT INTO articles (url) VALUES ('https://example.jp/registered')")
+    migrate_articles_table(conn)
+    assert create_search_index(conn) == "trigram"
+
+    articles = [
+        {"title": "系統用蓄電池の導入が加速", "content": "経済産業省は系統用蓄電池の補助金を拡充した。",
+         "url": "https://example.jp/1", "source": "経済産業省", "category": "government",
+         "published_date": "Mon, 15 Jan 2024 09:00:00 +0900"},
+        {"title": "太陽光発電の新技術", "content": "ペロブスカイト太陽電池と系統用蓄電池を組み合わせる。",
+         "url": "https://example.jp/2", "source": "EnergyNews", "category": "market",
+         "published_date": "2024年2月3日"},
+        {"title": "PPA契約の動向", "content": "コーポレートPPAの契約件数が増加。",
+         "url": "https://example.jp/registered", "source": "EnergyNews", "category": "market",
+         "published_date": "2024.01.20"},
+    ]
+    stored = upsert_articles(conn, articles)
+    assert [created for _, created in stored] == [True, True, False]
+    assert stored[2][0] == 1
+
+    results = search_articles(conn, "系統用蓄電池")
+    assert [r["url"] for r in results] == ["https://example.jp/1", "https://example.jp/2"]
+    assert "<mark>" in results[0]["snippet"]
+
+    january = search_articles(conn, "系統用蓄電池", since="2024-01-01", until="2024-01-31")
+    assert [r["url"] for r in january] == ["https://example.jp/1"]
+
+    short = search_articles(conn, "PPA", category="market")
+    assert [r["url"] for r in short] == ["https://example.jp/registered"]
+    assert search_articles(conn, "契約")[0]["snippet"].count("<mark>契約</mark>") == 1
+
+    conn.execute("DELETE FROM articles WHERE url = 'https://example.jp/1'")
+    assert [r["url"] for r in search_articles(conn, "系統用蓄電池")] == ["https://example.jp/2"]
+    print("✅ Japanese full-text search ranks, snippets and filters stored articles")
+
+
+def test_normalize_published_date():
+    """Feed and scraped date formats normalize to ISO dates."""
+    assert normalize_published_date("Mon, 15 Jan 2024 23:30:00 -0500") == "2024-01-16"
+    assert normalize_published_date("2024-03-01T10:00:00Z") == "2024-03-01"
+    assert normalize_published_date("令和6年 2024年3月5日 更新") == "2024-03-05"
+    assert normalize_published_date("2024/3/5") == "2024-03-05"
+    assert normalize_published_date("昨日") is None
+    print("✅ Published dates normalize to ISO dates")
+
+
+if __name__ == "__main__":
+    test_search_finds_japanese_terms_by_date()
+    test_normalize_published_date()
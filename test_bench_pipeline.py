@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""Test that the pipeline benchmark runs end to end against the local fixture server."""
+
+import sys
+import os
+import json
+import tempfile
+import shutil
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks"))
+
+import bench_pipeline
+
+
+def test_bench_pipeline_writes_results():
+    """A small run collects every fixture article and records each step."""
+    test_dir = tempfile.mkdtemp()
+    try:
+        output = os.path.join(test_dir, "results.json")
+        bench_pipeline.main(["--sizes", "10", "--output", output])
+
+        with open(output, "r", encoding="utf-8") as f:
+            results = json.load(f)
+        timings = {entry["name"]: entry for entry in results["results"]}
+
+        assert timings["collect_news"]["items"] == 10
+        assert timings["POST /api/process-articles/"]["items"] == 10
+        assert timings["GET /api/articles"]["items"] == 10
+        assert {"process_articles", "score_content", "GET /api/search"} <= set(timings)
+        assert all(entry["seconds"] > 0 and entry["size"] == 10 for entry in results["results"])
+        print("✅ Pipeline benchmark writes per-step timings")
+    finally:
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_bench_pipeline_writes_results()
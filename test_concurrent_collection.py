@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""Test concurrent source collection in NewsCollector."""
+
+import sys
+import os
+import time
+import random
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from config import Config
+from news_collector import NewsCollector
+
+
+def make_config(**overrides):
+    """Build a config with several RSS feeds and scrape sources on shared hosts."""
+    config = Config.load_from_file(os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.example.json"))
+    config.rss_feeds = [f"https://feeds.example.com/general/{i}.xml" for i in range(4)]
+    config.government_rss_feeds = [f"https://gov.example.jp/rss/{i}.xml" for i in range(3)]
+    config.market_rss_feeds = ["https://market.example.jp/rss.xml"]
+    config.municipality_rss_feeds = []
+    config.government_scrape_sources = [{"name": "Gov Scrape", "url": "https://gov.example.jp/news/"}]
+    config.market_scrape_sources = [{"name": "Market Scrape", "url": "https://market.example.jp/news/"}]
+    config.municipality_scrape_sources = []
+    for key, value in overrides.items():
+        setattr(config, key, value)
+    return config
+
+
+def stub_sources(collector, delay=0.0):
+    """Replace network fetches with stubs that sleep a random amount."""
+    def fake_rss(feed):
+        time.sleep(random.uniform(0, delay))
+        return [{"title": f"{feed} #{i}", "content": "", "url": f"{feed}#{i}", "published_date": "",
+                 "source": feed, "author": "Unknown"} for i in range(2)]
+
+    def fake_scrape(source):
+        time.sleep(random.uniform(0, delay))
+        return [{"title": source["name"], "content": "", "url": source["url"], "published_date": "",
+                 "source": source["name"], "author": source["name"]}]
+
+    collector._collect_from_rss_source = fake_rss
+    collector._scrape_from_source = fake_scrape
+
+
+def test_concurrent_matches_sequential_order():
+    """Concurrent collection returns the same articles in the same order as sequential collection."""
+    sequential = NewsCollector(make_config(concurrent_collection=False))
+    stub_sources(sequential)
+    expected = sequential.collect_news()
+
+    concurrent = NewsCollector(make_config(concurrent_collection=True, max_concurrent_fetches=4))
+    stub_sources(concurrent, delay=0.05)
+    actual = concurrent.collect_news()
+
+    assert [a["url"] for a in actual] == [a["url"] for a in expected]
+    assert [a["category"] for a in actual] == [a["category"] for a in expected]
+    print(f"✅ {len(actual)} articles collected concurrently in sequential order")
+
+
+def test_deadline_skips_slow_sources():
+    """Sources still running when the deadline passes are dropped from the cycle."""
+    collector = NewsCollector(make_config(collection_deadline_seconds=0.2))
+    stub_sources(collector)
+
+    original = collector._collect_from_rss_source
+
+    def slow_for_market(feed):
+        if "market" in feed:
+            time.sleep(1)
+        return original(feed)
+
+    collector._collect_from_rss_source = slow_for_market
+
+    started = time.monotonic()
+    articles = collector.collect_news()
+    elapsed = time.monotonic() - started
+
+    assert elapsed < 1, f"collect_news took {elapsed:.2f}s, deadline not honoured"
+    assert not any("market.example.jp/rss" in a["url"] for a in articles)
+    assert any(a["category"] == "government" for a in articles)
+    print(f"✅ Deadline honoured in {elapsed:.2f}s with {len(articles)} articles")
+
+
+if __name__ == "__main__":
+    test_concurrent_matches_sequential_order()
+    test_deadline_skips_slow_sources()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""Test the pooled SQLite connections the API borrows for each request."""
+
+import sys
+import os
+import sqlite3
+import tempfile
+import shutil
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import api
+from api import ConnectionPool
+
+
+def make_pool(test_dir, max_idle=2):
+    pool = ConnectionPool(os.path.join(test_dir, "news.db"), max_idle=max_idle)
+    with pool.acquire() as conn:
+        conn.execute("CREATE TABLE keywords (id INTEGER PRIMARY KEY AUTOINCREMENT, word TEXT UNIQUE)")
+    return pool
+
+
+def count(pool):
+    with pool.acquire() as conn:
+        return conn.execute("SELECT COUNT(*) FROM keywords").fetchone()[0]
+
+
+def test_acquire_release_and_reuse():
+    """close() hands the connection back once, and the next acquire reuses it."""
+    test_dir = tempfile.mkdtemp()
+    try:
+        pool = make_pool(test_dir)
+        conn = pool.acquire()
+        raw = conn._conn
+        assert pool._idle == []
+        conn.close()
+        conn.close()
+        assert pool._idle == [raw]
+        assert pool.acquire()._conn is raw and pool._idle == []
+        print("✅ Connections are released once and reused")
+    finally:
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+def test_exhaustion_opens_and_closes_extra_connections():
+    """Borrowing past max_idle opens new connections; the ones over the limit close on release."""
+    test_dir = tempfile.mkdtemp()
+    try:
+        pool = make_pool(test_dir, max_idle=2)
+        borrowed = [pool.acquire() for _ in range(3)]
+        raws = [conn._conn for conn in borrowed]
+        assert len({id(raw) for raw in raws}) == 3
+        for conn in borrowed:
+            conn.close()
+        assert pool._idle == raws[:2]
+        try:
+            raws[2].execute("SELECT 1")
+            assert False, "connection over max_idle was kept open"
+        except sqlite3.ProgrammingError:
+            pass
+        pool.close_all()
+        assert pool._idle == []
+        print("✅ Connections beyond max_idle are closed on release")
+    finally:
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+def test_release_after_exception_rolls_back():
+    """A connection given back mid-transaction, by close() or by a with block that raised, is rolled back."""
+    test_dir = tempfile.mkdtemp()
+    try:
+        pool = make_pool(test_dir)
+        conn = pool.acquire()
+        try:
+            conn.execute("INSERT INTO keywords (word) VALUES ('蓄電池')")
+            raise RuntimeError("request failed")
+        except RuntimeError:
+            pass
+        finally:
+            conn.close()
+        assert not pool._idle[0].in_transaction and count(pool) == 0
+
+        try:
+            with pool.acquire() as conn:
+                conn.execute("INSERT INTO keywords (word) VALUES ('蓄電池')")
+                raise RuntimeError("request failed")
+        except RuntimeError:
+            pass
+        assert len(pool._idle) == 1 and count(pool) == 0
+
+        with pool.acquire() as conn:
+            conn.execute("INSERT INTO keywords (word) VALUES ('蓄電池')")
+        assert count(pool) == 1
+        print("✅ with blocks commit, or roll back on error, and return the connection")
+    finally:
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+def test_proxy_forwards_to_connection():
+    """The proxy exposes the sqlite3 connection until it is returned, then refuses to be used."""
+    test_dir = tempfile.mkdtemp()
+    try:
+        pool = make_pool(test_dir)
+        conn = pool.acquire()
+        assert conn.row_factory is sqlite3.Row
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        conn.execute("INSERT INTO keywords (word) VALUES ('PPA')")
+        assert conn.in_transaction and conn.total_changes == 1
+        conn.commit()
+        conn.close()
+        try:
+            conn.execute("SELECT 1")
+            assert False, "returned connection was still usable"
+        except sqlite3.ProgrammingError:
+            pass
+        print("✅ Proxy forwards to the pooled connection")
+    finally:
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+def test_db_path_resolved_at_startup():
+    """get_db_connection keeps using the path init_database resolved until it runs again."""
+    test_dir = tempfile.mkdtemp()
+    saved_env = {key: os.environ.get(key) for key in ("DB_PATH", "DISABLE_SEEDING")}
+    os.environ["DISABLE_SEEDING"] = "true"
+    try:
+        first, second = os.path.join(test_dir, "first.db"), os.path.join(test_dir, "second.db")
+        os.environ["DB_PATH"] = first
+        api.init_database()
+        pool = api._db_pool
+        assert pool.db_path == first and pool._idle
+
+        os.environ["DB_PATH"] = second
+        with api.get_db_connection() as conn:
+            assert conn.execute("PRAGMA database_list").fetchone()[2] == first
+        assert api._db_pool is pool
+
+        api.init_database()
+        assert api._db_pool.db_path == second and pool._idle == []
+        print("✅ Database path is resolved at startup")
+    finally:
+        for key, value in saved_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_acquire_release_and_reuse()
+    test_exhaustion_opens_and_closes_extra_connections()
+    test_release_after_exception_rolls_back()
+    test_proxy_forwards_to_connection()
+    test_db_path_resolved_at_startup()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Test the persistent article content cache used by fetch_article_content."""
+
+import sys
+import os
+import tempfile
+import shutil
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from config import Config
+from news_collector import NewsCollector
+
+PAGE = "<html><head><title>記事</title></head><body><h1>系統用蓄電池の入札結果</h1><article>ENEOSが落札</article></body></html>".encode("utf-8")
+
+
+class PageHandler(BaseHTTPRequestHandler):
+    """Serves an article page with an ETag and records every request."""
+
+    requests_seen = []
+
+    def do_GET(self):
+        PageHandler.requests_seen.append((self.path, self.headers.get("If-None-Match")))
+        if self.headers.get("If-None-Match") == '"page-v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("ETag", '"page-v1"')
+        self.end_headers()
+        self.wfile.write(PAGE)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def test_content_cache():
+    """Fresh entries skip the network, stale ones revalidate and old ones are evicted."""
+    PageHandler.requests_seen = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), PageHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    test_dir = tempfile.mkdtemp()
+
+    try:
+        config = Config.load_from_file(os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.example.json"))
+        config.state_db_path = os.path.join(test_dir, "state.db")
+        config.content_cache_max_entries = 2
+
+        collector = NewsCollector(config)
+        first = collector.fetch_article_content(f"{base_url}/a")
+        assert first["title"] == "系統用蓄電池の入札結果"
+        assert first["content"] == "ENEOSが落札"
+
+        second = NewsCollector(config).fetch_article_content(f"{base_url}/a")
+        assert second == first
+        assert len(PageHandler.requests_seen) == 1, "fresh cache entry triggered a fetch"
+        print("✅ Fresh entry served from cache without a request")
+
+        config.content_cache_ttl_hours = 0
+        third = NewsCollector(config).fetch_article_content(f"{base_url}/a")
+        assert third == first
+        assert PageHandler.requests_seen[-1] == ("/a", '"page-v1"')
+        print("✅ Stale entry revalidated with If-None-Match")
+
+        collector = NewsCollector(config)
+        collector.fetch_article_content(f"{base_url}/b")
+        collector.fetch_article_content(f"{base_url}/c")
+        assert collector.content_cache.get(f"{base_url}/a") is None
+        assert collector.content_cache.get(f"{base_url}/c") is not None
+        print("✅ Least recently used entry evicted")
+
+        cache = collector.content_cache
+        config.incremental_feeds = True
+        other = NewsCollector(config)
+        assert other.content_cache is cache and other.source_cache is collector.source_cache
+        assert other.feed_state is not None and NewsCollector(config).feed_state is other.feed_state
+        changes = cache._conn.total_changes
+        assert cache.get(f"{base_url}/b") is not None
+        assert cache._conn.total_changes == changes and not cache._conn.in_transaction
+        collector.fetch_article_content(f"{base_url}/d")
+        assert cache.get(f"{base_url}/b") is not None and cache.get(f"{base_url}/c") is None
+        print("✅ Reads write nothing, yet still count as uses at the next store")
+
+        config.source_max_bytes = {"127.0.0.1": len(PAGE) - 20}
+        truncated = NewsCollector(config).fetch_article_content(f"{base_url}/e")
+        assert truncated["title"] == "系統用蓄電池の入札結果"
+        assert cache.get(f"{base_url}/e") is None
+        print("✅ Truncated bodies are not cached")
+    finally:
+        server.shutdown()
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_content_cache()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""Test main-content extraction for article pages."""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from content_extractor import ContentExtractor
+
+BODY = "経済産業省は系統用蓄電池の導入支援に向けた補助金の公募を開始したと発表した。"
+
+
+def page(main_attrs="class='entry-body'", title_in_main=True, paragraphs=3):
+    heading = "<h1>系統用蓄電池の補助金公募</h1>"
+    body = "".join(f"<p>{BODY}{i}</p>" for i in range(paragraphs))
+    sidebar = "".join(f"<p><a href='/r{i}'>関連記事のリンクがここに並びます{i}</a></p>" for i in range(6))
+    return (f"<html><head><title>ニュース | サイト</title><script>var tracking = '{BODY}';</script></head><body>"
+            f"<nav><p>ホーム・ニュース・お問い合わせ・サイトマップ・採用情報</p></nav>"
+            f"{'' if title_in_main else heading}<div class='layout'>"
+            f"<div {main_attrs}>{heading if title_in_main else ''}{body}<footer><p>この記事を共有する・印刷する・ブックマーク</p></footer></div>"
+            f"<div class='sidebar'>{sidebar}</div></div></body></html>").encode("utf-8")
+
+
+def test_densest_block_wins_and_boilerplate_is_pruned():
+    """The article body beats link lists, and nav, footer and script text are dropped."""
+    extractor = ContentExtractor()
+    title, content = extractor.extract(page(), "news.example.jp")
+    assert title == "系統用蓄電池の補助金公募"
+    assert content.startswith("系統用蓄電池の補助金公募" + BODY)
+    assert "関連記事" not in content and "共有" not in content and "tracking" not in content
+    block = extractor.site_block("news.example.jp")
+    assert block.selector == "div.entry-body" and block.title_inside
+    print("✅ Densest block wins, boilerplate pruned")
+
+
+def test_site_block_is_reused_and_rescored_when_layout_changes():
+    """Later pages go straight to the remembered block; a missing block falls back to scoring."""
+    extractor = ContentExtractor()
+    extractor.extract(page(), "news.example.jp")
+    assert extractor.extract(page(paragraphs=5), "news.example.jp")[1].endswith(BODY + "4")
+
+    title, content = extractor.extract(page(main_attrs="id='main-text'"), "news.example.jp")
+    assert title == "系統用蓄電池の補助金公募" and content.endswith(BODY + "2")
+    assert extractor.site_block("news.example.jp").selector == "div#main-text"
+
+    extractor.extract(page(main_attrs="id='post-1234'", title_in_main=False), "other.example.jp")
+    block = extractor.site_block("other.example.jp")
+    assert block is None, "per-article ids and bare divs should not be remembered"
+
+    extractor.extract(page(main_attrs="class='text'", title_in_main=False), "third.example.jp")
+    assert not extractor.site_block("third.example.jp").title_inside
+    assert extractor.extract(page(main_attrs="class='text'", title_in_main=False), "third.example.jp")[0] == \
+        "系統用蓄電池の補助金公募"
+    print("✅ Site block reused and rescored")
+
+
+def test_pages_without_paragraphs_fall_back_to_selectors():
+    """Pages with no scoreable paragraphs use the content selectors, then the body."""
+    extractor = ContentExtractor()
+    content = "<html><body><h1>入札結果</h1><article>ENEOSが落札</article></body></html>".encode("utf-8")
+    assert extractor.extract(content, "a.example.jp") == ("入札結果", "ENEOSが落札")
+    content = "<html><body><div>短い本文</div><footer>footer</footer></body></html>".encode("utf-8")
+    assert extractor.extract(content, "b.example.jp") == ("", "短い本文")
+    print("✅ Selector fallback")
+
+
+if __name__ == "__main__":
+    test_densest_block_wins_and_boilerplate_is_pruned()
+    test_site_block_is_reused_and_rescored_when_layout_changes()
+    test_pages_without_paragraphs_fall_back_to_selectors()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""Test near-duplicate article detection."""
+
+import sys
+import os
+import tempfile
+import shutil
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from dedup import Deduplicator, minhash, similarity
+
+STORY = ("経済産業省は15日、系統用蓄電池の導入を支援する補助金の公募を開始すると発表した。"
+         "太陽光発電の出力抑制が増える中、需給調整力の確保を急ぐ。公募期間は来月末まで。")
+
+
+def test_minhash_is_stable_under_formatting():
+    """Width, case, spacing and punctuation changes keep the signature; a different story does not match."""
+    base = minhash("系統用蓄電池 補助金 " + STORY)
+    reformatted = minhash("系統用蓄電池　補助金。" + STORY.replace("、", " ").replace("15", "１５"))
+    edited = minhash("系統用蓄電池 補助金 " + STORY.replace("来月末", "今月末"))
+    other = minhash("ENEOSは再生可能エネルギー事業の拡大に向け、洋上風力発電の新会社を設立した。" * 2)
+    assert similarity(base, reformatted) == 1.0
+    assert similarity(base, edited) >= 0.8
+    assert similarity(base, other) < 0.2
+    assert minhash("、。 ") is None
+    print("✅ MinHash ignores formatting and separates different stories")
+
+
+def test_duplicates_collapse_within_and_across_runs():
+    """The first copy of a story is kept with alternate sources; later runs drop its duplicates."""
+    test_dir = tempfile.mkdtemp()
+    try:
+        db_path = os.path.join(test_dir, "state.db")
+        articles = [
+            {"title": "系統用蓄電池の補助金公募開始", "content": STORY, "url": "https://nhk.example/1", "source": "NHK"},
+            {"title": "系統用蓄電池の補助金公募開始", "content": STORY + "（共同）", "url": "https://nikkei.example/9",
+             "source": "Nikkei"},
+            {"title": "洋上風力の新会社", "content": "ENEOSは洋上風力発電の新会社を設立した。", "url": "https://example.jp/wind",
+             "source": "EnergyNews"},
+            {"title": "系統用蓄電池の補助金公募開始", "content": STORY, "url": "https://nhk.example/1", "source": "NHK"},
+        ]
+
+        kept = Deduplicator(db_path).deduplicate(articles)
+        assert [a["url"] for a in kept] == ["https://nhk.example/1", "https://example.jp/wind"]
+        assert kept[0]["alternate_sources"] == [{"url": "https://nikkei.example/9", "source": "Nikkei"}]
+
+        reopened = Deduplicator(db_path)
+        rerun = reopened.deduplicate([
+            {"title": "系統用蓄電池の補助金公募開始", "content": STORY, "url": "https://nhk.example/1", "source": "NHK"},
+            {"title": "系統用蓄電池の補助金 公募開始", "content": STORY, "url": "https://scrape.example/x", "source": "Scrape"},
+        ])
+        assert [a["url"] for a in rerun] == ["https://nhk.example/1"]
+        assert rerun[0]["alternate_sources"] == [{"url": "https://scrape.example/x", "source": "Scrape"}]
+        assert reopened.alternates("https://nhk.example/1") == ["https://nikkei.example/9", "https://scrape.example/x"]
+
+        later = reopened.deduplicate([{"title": "続報", "content": STORY, "url": "https://other.example/2"}])
+        assert later == []
+        print("✅ Near-duplicates collapse into the first article within and across runs")
+    finally:
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_minhash_is_stable_under_formatting()
+    test_duplicates_collapse_within_and_across_runs()
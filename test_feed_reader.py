@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""Test the streaming feed reader and incremental feed collection."""
+
+import sys
+import os
+import tempfile
+import shutil
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import feedparser
+from config import Config
+from feed_reader import FeedState, parse_timestamp, read_feed
+from news_collector import NewsCollector
+from parse_pool import close_pools
+
+
+def rss(items):
+    entries = "".join(
+        f"<item><title>記事{i}</title><link>https://example.jp/{i}</link><guid>id-{i}</guid>"
+        f"<description>&lt;p&gt;系統用蓄電池 {i}&lt;/p&gt;</description>"
+        f"<pubDate>Mon, {15 - i:02d} Jan 2024 09:00:00 +0900</pubDate><dc:creator>記者{i}</dc:creator></item>"
+        for i in items
+    )
+    return ('<?xml version="1.0" encoding="UTF-8"?><rss version="2.0" xmlns:dc="http://purl.org/dc/elements/1.1/">'
+            f"<channel><title>Test</title>{entries}</channel></rss>").encode("utf-8")
+
+
+ATOM = """<?xml version="1.0" encoding="utf-8"?><feed xmlns="http://www.w3.org/2005/Atom"><title>t</title>
+<entry><title>洋上風力</title><link rel="alternate" href="https://example.jp/atom/1"/><link rel="edit" href="https://example.jp/edit"/>
+<id>urn:1</id><updated>2024-01-15T09:00:00+09:00</updated><summary>公募</summary><author><name>資源エネルギー庁</name></author></entry>
+</feed>""".encode("utf-8")
+
+
+def test_stream_matches_feedparser():
+    """Streamed RSS and Atom entries carry the same fields feedparser extracts."""
+    for content in (rss(range(3)), ATOM):
+        streamed = read_feed(content)
+        parsed = feedparser.parse(content).entries
+        assert len(streamed) == len(parsed)
+        for entry, expected in zip(streamed, parsed):
+            for field in ("title", "link", "author", "id"):
+                assert entry[field] == expected.get(field, ""), (field, entry[field], expected.get(field))
+            # Entries with only an update time use it as their published date.
+            assert entry["published"] == expected.get("published", expected.get("updated"))
+            assert entry["summary"] == expected["summary"]
+    print("✅ Streamed entries match feedparser")
+
+
+def test_cap_and_last_seen_stop_early():
+    """Reading stops at the cap or the last seen entry, without parsing what follows."""
+    truncated = rss(range(5))[:rss(range(5)).index(b"<item><title>\xe8\xa8\x98\xe4\xba\x8b3")] + b"<item><title>broken"
+    assert [entry["id"] for entry in read_feed(truncated, limit=2)] == ["id-0", "id-1"]
+
+    content = rss(range(5))
+    assert [entry["id"] for entry in read_feed(content, last_seen=("id-2", None))] == ["id-0", "id-1"]
+    cutoff = parse_timestamp("Fri, 12 Jan 2024 09:00:00 +0900")
+    assert [entry["id"] for entry in read_feed(content, last_seen=("gone", cutoff))] == ["id-0", "id-1", "id-2"]
+
+    entity_feed = rss(range(2)).replace("記事0".encode("utf-8"), "記事&nbsp;0".encode("utf-8"))
+    assert len(read_feed(entity_feed)) == 2, "malformed XML should fall back to feedparser"
+    print("✅ Cap and last-seen entry stop the reader")
+
+
+class FeedHandler(BaseHTTPRequestHandler):
+    items = [0, 1]
+
+    def do_GET(self):
+        body = rss(self.items)
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def test_incremental_collection():
+    """With incremental_feeds, each collection only returns entries newer than the last one read."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FeedHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    test_dir = tempfile.mkdtemp()
+    try:
+        config = Config.load_from_file(os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.example.json"))
+        config.state_db_path = os.path.join(test_dir, "state.db")
+        config.incremental_feeds = True
+        feed_url = f"http://127.0.0.1:{server.server_address[1]}/feed.xml"
+
+        FeedHandler.items = [1, 2]
+        assert [a["url"] for a in NewsCollector(config).collect_source("rss", feed_url, "general")] == \
+            ["https://example.jp/1", "https://example.jp/2"]
+        assert NewsCollector(config).collect_source("rss", feed_url, "general") == []
+
+        FeedHandler.items = [0, 1, 2]
+        assert [a["url"] for a in NewsCollector(config).collect_source("rss", feed_url, "general")] == ["https://example.jp/0"]
+        assert FeedState(config.state_db_path).last_seen(feed_url)[0] == "id-0"
+
+        config.incremental_feeds = False
+        assert len(NewsCollector(config).collect_source("rss", feed_url, "general")) == 3
+        print("✅ Incremental collection returns only new entries")
+    finally:
+        server.shutdown()
+        server.server_close()
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+class SlowFeedHandler(BaseHTTPRequestHandler):
+    """Sends the first entries of a feed, then holds the rest back until `release` is set."""
+
+    release = threading.Event()
+
+    def do_GET(self):
+        body = rss(range(10))
+        split = body.index("<item><title>記事5".encode("utf-8"))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/rss+xml")
+        self.end_headers()
+        try:
+            self.wfile.write(body[:split])
+            self.wfile.flush()
+            SlowFeedHandler.release.wait(10)
+            self.wfile.write(body[split:])
+        except OSError:
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+
+def test_feed_parsed_while_downloading():
+    """Entries are parsed as they arrive, so collection stops without waiting for the rest of the feed."""
+    SlowFeedHandler.release.clear()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SlowFeedHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        config = Config.load_from_file(os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.example.json"))
+        config.conditional_requests = False
+        config.max_articles_per_source = 3
+        started = time.monotonic()
+        articles = NewsCollector(config).collect_source(
+            "rss", f"http://127.0.0.1:{server.server_address[1]}/feed.xml", "general")
+        assert [a["url"] for a in articles] == [f"https://example.jp/{i}" for i in range(3)]
+        assert time.monotonic() - started < 5 and not SlowFeedHandler.release.is_set()
+        print("✅ Feeds are parsed while they download")
+    finally:
+        SlowFeedHandler.release.set()
+        server.shutdown()
+        server.server_close()
+
+
+def test_truncated_feed_keeps_marker():
+    """A feed cut off by its byte cap returns what arrived but leaves the last-read marker where it was."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FeedHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    test_dir = tempfile.mkdtemp()
+    try:
+        config = Config.load_from_file(os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.example.json"))
+        config.state_db_path = os.path.join(test_dir, "state.db")
+        config.incremental_feeds = True
+        config.conditional_requests = False
+        feed_url = f"http://127.0.0.1:{server.server_address[1]}/feed.xml"
+        FeedHandler.items = [0, 1, 2, 3]
+        body = rss(FeedHandler.items)
+        config.source_max_bytes = {feed_url: body.index("記事2".encode("utf-8"))}
+
+        for parse_workers in (0, 1):
+            config.parse_workers = parse_workers
+            cut = NewsCollector(config).collect_source("rss", feed_url, "general")
+            assert [a["url"] for a in cut] == ["https://example.jp/0", "https://example.jp/1"]
+            assert FeedState(config.state_db_path).last_seen(feed_url) is None
+
+        config.parse_workers = 0
+        config.source_max_bytes = {}
+        assert len(NewsCollector(config).collect_source("rss", feed_url, "general")) == 4
+        assert FeedState(config.state_db_path).last_seen(feed_url)[0] == "id-0"
+        print("✅ Truncated feeds do not move the last-read marker")
+    finally:
+        close_pools()
+        server.shutdown()
+        server.server_close()
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_stream_matches_feedparser()
+    test_cap_and_last_seen_stop_early()
+    test_incremental_collection()
+    test_feed_parsed_while_downloading()
+    test_truncated_feed_keeps_marker()
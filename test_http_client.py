@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""Test the shared HTTP client: connection reuse, compression and per-source timeouts."""
+
+import sys
+import os
+import gzip
+import logging
+import shutil
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from config import Config
+from http_client import (HTML_TYPES, HttpClient, UnexpectedContentType, accept_encoding, http2_available, shared_client,
+                         source_max_bytes, source_timeout)
+from news_collector import NewsCollector
+from teams_notifier import TeamsNotifier
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.example.json")
+BODY = "系統用蓄電池の公募".encode("utf-8")
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    """Serves gzip-compressed bodies over persistent HTTP/1.1 connections, recording client ports."""
+
+    protocol_version = "HTTP/1.1"
+    ports = set()
+    accept_encodings = []
+
+    def do_GET(self):
+        KeepAliveHandler.ports.add(self.client_address[1])
+        KeepAliveHandler.accept_encodings.append(self.headers.get("Accept-Encoding", ""))
+        body = gzip.compress(BODY)
+        self.send_response(200)
+        self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def test_connections_are_reused_and_decompressed():
+    """Sequential requests to one host share a connection and gzip bodies are decoded."""
+    KeepAliveHandler.ports = set()
+    KeepAliveHandler.accept_encodings = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client = HttpClient(timeout=5)
+    try:
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        for path in ("/a", "/b", "/c"):
+            assert client.get(base + path).content == BODY
+        assert len(KeepAliveHandler.ports) == 1, KeepAliveHandler.ports
+        assert all("gzip" in value for value in KeepAliveHandler.accept_encodings)
+        print("✅ Connections reused, gzip decoded")
+    finally:
+        client.close()
+        server.shutdown()
+        server.server_close()
+
+
+class LargeResponseHandler(BaseHTTPRequestHandler):
+    """Serves an oversized article page, a PDF and a long feed."""
+
+    def do_GET(self):
+        if self.path == "/report.pdf":
+            body, content_type = b"%PDF-1.7" + b"0" * 100000, "application/pdf"
+        elif self.path == "/feed.xml":
+            items = "".join(f"<item><title>記事{i}</title><link>https://example.jp/{i}</link></item>"
+                            for i in range(2000))
+            body = f'<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>{items}</channel></rss>'.encode("utf-8")
+            content_type = "application/rss+xml"
+        else:
+            body = ("<html><head><title>大容量ページ</title></head><body><article><p>"
+                    + "洋上風力" * 200 + "</p></article><img src='data:image/png;base64,"
+                    + "A" * 2000000 + "'></body></html>").encode("utf-8")
+            content_type = "text/html; charset=utf-8"
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+
+def test_downloads_are_capped_and_filtered_by_type():
+    """Bodies stop at the byte cap, and unexpected Content-Types are refused before the body is read."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), LargeResponseHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    test_dir = tempfile.mkdtemp()
+    client = HttpClient(timeout=5)
+    try:
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        page = client.download(base + "/page.html", 64 * 1024, HTML_TYPES)
+        assert page.truncated and len(page.content) == 64 * 1024
+        assert not client.download(base + "/page.html", 4 * 1024 * 1024, HTML_TYPES).truncated
+        try:
+            client.download(base + "/report.pdf", 1024, HTML_TYPES)
+            assert False, "a PDF should be refused"
+        except UnexpectedContentType:
+            pass
+
+        config = Config.load_from_file(CONFIG_PATH)
+        config.state_db_path = os.path.join(test_dir, "state.db")
+        config.max_response_bytes = 64 * 1024
+        config.source_max_bytes = {"127.0.0.1": 32 * 1024}
+        assert source_max_bytes(config, "127.0.0.1") == 32 * 1024
+        assert source_max_bytes(config, "JEPX", {"name": "JEPX", "max_bytes": 1000}) == 1000
+        collector = NewsCollector(config)
+        article = collector.fetch_article_content(base + "/page.html")
+        assert article["title"] == "大容量ページ" and "洋上風力" in article["content"]
+        assert collector.fetch_article_content(base + "/report.pdf") is None
+
+        config.max_articles_per_source = 5000
+        config.content_cache_enabled = False
+        articles = NewsCollector(config).collect_source("rss", base + "/feed.xml", "general")
+        assert 0 < len(articles) < 2000
+        assert articles[-1]["url"] == f"https://example.jp/{len(articles) - 1}"
+        print("✅ Downloads capped and filtered by Content-Type")
+    finally:
+        client.close()
+        server.shutdown()
+        server.server_close()
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+def test_components_share_one_client_and_source_timeouts():
+    """Collector and notifier use the same pool; timeouts resolve per source."""
+    config = Config.load_from_file(CONFIG_PATH)
+    assert NewsCollector(config).http is TeamsNotifier(config).http is shared_client(config)
+
+    config.http_timeout_seconds = 7.0
+    config.source_timeout_seconds = {"https://slow.example.jp/rss": 30.0}
+    assert source_timeout(config, "https://slow.example.jp/rss") == 30.0
+    assert source_timeout(config, "https://other.example.jp/rss") == 7.0
+    assert source_timeout(config, "JEPX", {"name": "JEPX", "timeout_seconds": 20}) == 20.0
+    print("✅ Shared client and per-source timeouts")
+
+
+def test_client_logs_active_features():
+    """A new client logs its protocol and accepted encodings, and warns when HTTP/2 is asked for but unavailable."""
+    records = []
+    handler = logging.Handler()
+    handler.emit = records.append
+    logger = logging.getLogger("http_client")
+    logger.addHandler(handler)
+    level = logger.level
+    logger.setLevel(logging.INFO)
+    try:
+        HttpClient(http2=True).close()
+    finally:
+        logger.removeHandler(handler)
+        logger.setLevel(level)
+    messages = [record.getMessage() for record in records]
+    protocol = "HTTP/2" if http2_available() else "HTTP/1.1"
+    assert f"HTTP client: {protocol}, Accept-Encoding: {accept_encoding()}" in messages, messages
+    assert any("h2 package is not installed" in message for message in messages) != http2_available()
+    print("✅ Client logs its active features")
+
+
+if __name__ == "__main__":
+    test_connections_are_reused_and_decompressed()
+    test_components_share_one_client_and_source_timeouts()
+    test_downloads_are_capped_and_filtered_by_type()
+    test_client_logs_active_features()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""Test the ingest stage that persists collected and processed articles."""
+
+import sys
+import os
+import json
+import sqlite3
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from article_store import migrate_articles_table, normalize_url, stored_article
+from ingest import ingest_articles
+from relevance import create_relevance_table
+
+
+def database():
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    conn.execute("CREATE TABLE articles (id INTEGER PRIMARY KEY AUTOINCREMENT, url TEXT UNIQUE)")
+    conn.execute("CREATE TABLE keywords (id INTEGER PRIMARY KEY AUTOINCREMENT, word TEXT UNIQUE)")
+    conn.execute("CREATE TABLE companies (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT UNIQUE)")
+    conn.execute("INSERT INTO keywords (word) VALUES ('系統用蓄電池')")
+    conn.execute("INSERT INTO articles (url) VALUES ('https://example.jp/registered/')")
+    conn.execute("INSERT INTO articles (url) VALUES ('https://EXAMPLE.jp/registered')")
+    migrate_articles_table(conn)
+    create_relevance_table(conn)
+    return conn
+
+
+def test_normalize_url():
+    """Case, default ports, fragments, tracking parameters and trailing slashes do not make a new URL."""
+    assert normalize_url("HTTPS://Example.JP:443/news/1/?utm_source=x&b=2&a=1#top") == "https://example.jp/news/1?a=1&b=2"
+    assert normalize_url("http://example.jp:8080") == "http://example.jp:8080/"
+    assert normalize_url("https://example.jp/news?id=2") != normalize_url("https://example.jp/news?id=3")
+    print("✅ URLs normalize")
+
+
+def test_ingest_upserts_records_with_enrichment():
+    """One ingest stores every article once, with processed fields and relevance for each stored row."""
+    conn = database()
+    rows = conn.execute("SELECT id, normalized_url FROM articles ORDER BY id").fetchall()
+    assert rows[0]["normalized_url"] == "https://example.jp/registered" and rows[1]["normalized_url"] is None
+
+    collected = [
+        {"url": "https://example.jp/1?utm_campaign=rss", "title": "系統用蓄電池の公募", "content": "本文1",
+         "source": "METI", "category": "government", "published_date": "2024年1月15日"},
+        {"url": "https://example.jp/1", "title": "重複", "content": "重複", "source": "METI"},
+        {"url": "https://example.jp/registered", "title": "登録済み", "content": "系統用蓄電池の本文2", "source": "METI"},
+        {"url": "https://example.jp/2", "title": "洋上風力", "content": "本文3", "source": "METI"},
+        {"title": "URLなし"},
+    ]
+    processed = [dict(collected[0], processed_at="2024-01-15T10:00:00", word_count=3,
+                      sentiment="neutral", topics=["energy", "industry"])]
+    assert ingest_articles(conn, collected, processed) == 2
+
+    assert conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0] == 4
+    first = conn.execute("SELECT * FROM articles WHERE normalized_url = 'https://example.jp/1'").fetchone()
+    assert first["title"] == "系統用蓄電池の公募" and first["published_at"] == "2024-01-15"
+    assert first["word_count"] == 3 and json.loads(first["topics"]) == ["energy", "industry"]
+    assert stored_article(conn, "https://example.jp/registered/")["content"] == "系統用蓄電池の本文2"
+
+    scores = {row["url"]: row["score"] for row in conn.execute(
+        "SELECT a.url, r.score FROM article_relevance r JOIN articles a ON a.id = r.article_id")}
+    assert scores == {"https://example.jp/1?utm_campaign=rss": 1.0, "https://example.jp/registered/": 1.0,
+                      "https://example.jp/2": 0.0}
+
+    # Ingesting again only refreshes processed fields; stored content is kept.
+    later = [dict(collected[0], content="変更", processed_at="2024-01-16T10:00:00")]
+    assert ingest_articles(conn, later, later) == 0
+    first = conn.execute("SELECT * FROM articles WHERE normalized_url = 'https://example.jp/1'").fetchone()
+    assert first["content"] == "本文1" and first["processed_at"] == "2024-01-16T10:00:00" and first["word_count"] == 3
+    assert conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0] == 4
+    assert conn.execute("SELECT score FROM article_relevance WHERE article_id = ?", (first["id"],)).fetchone()[0] == 1.0
+    print("✅ Ingest upserts records with enrichment")
+
+
+if __name__ == "__main__":
+    test_normalize_url()
+    test_ingest_upserts_records_with_enrichment()
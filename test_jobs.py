@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""Test the background job manager."""
+
+import sys
+import os
+import threading
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from jobs import JobManager
+
+
+def wait_for(job, timeout=5):
+    """Poll until a job has finished."""
+    deadline = time.time() + timeout
+    while job.active and time.time() < deadline:
+        time.sleep(0.01)
+    return job
+
+
+def test_identical_submissions_are_coalesced():
+    """A second identical submission returns the running job instead of starting another."""
+    manager = JobManager(max_workers=2)
+    release = threading.Event()
+    runs = []
+
+    def work(progress):
+        runs.append(1)
+        progress(1, 2, "halfway")
+        release.wait(5)
+        progress(2, 2, "done")
+        return {"ok": True}
+
+    first = manager.submit("pickup-results", {}, work)
+    second = manager.submit("pickup-results", {}, work)
+    other = manager.submit("post-high-relevance", {"threshold": 0.5}, lambda progress: "other")
+
+    assert second.id == first.id
+    assert other.id != first.id
+    release.set()
+
+    assert wait_for(first).status == "succeeded"
+    assert first.result == {"ok": True}
+    assert (first.progress_done, first.progress_total, first.message) == (2, 2, "done")
+    assert len(runs) == 1
+
+    third = manager.submit("pickup-results", {}, work)
+    assert third.id != first.id
+    wait_for(third)
+    print("✅ Identical jobs coalesced while running")
+
+
+def test_failed_job_records_error():
+    """Exceptions are captured on the job."""
+    manager = JobManager(max_workers=1)
+
+    def fail(progress):
+        raise RuntimeError("feed unreachable")
+
+    job = wait_for(manager.submit("process-articles", {}, fail))
+    assert job.status == "failed"
+    assert job.error == "feed unreachable"
+    assert manager.get(job.id) is job
+    print("✅ Failed job records its error")
+
+
+if __name__ == "__main__":
+    test_identical_submissions_are_coalesced()
+    test_failed_job_records_error()
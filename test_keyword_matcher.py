@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""Test the shared multi-pattern keyword matcher."""
+
+import sys
+import os
+import random
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from keyword_matcher import KeywordMatcher, LINEAR_SCAN_LIMIT
+
+
+def naive_match(patterns, text):
+    """Reference implementation matching the previous list-comprehension logic."""
+    return {label: [word for word in words if word in text] for label, words in patterns.items()}
+
+
+def test_overlapping_patterns():
+    """Patterns contained in other patterns are all reported, in pattern order."""
+    patterns = {"keyword": ["太陽光発電", "CPPA", "PPA", "系統用蓄電池", "太陽光"], "company": ["ENEOS", "出光興産"]}
+    matcher = KeywordMatcher(patterns)
+    text = "ENEOSがCPPAで太陽光発電を調達"
+    assert matcher.match(text) == naive_match(patterns, text)
+    assert matcher.match(text)["keyword"] == ["太陽光発電", "CPPA", "PPA", "太陽光"]
+    print("✅ Overlapping patterns matched")
+
+
+def test_automaton_matches_naive_scan():
+    """The automaton path agrees with naive substring checks on random input."""
+    rng = random.Random(42)
+    alphabet = "abcあいう電力"
+    companies = sorted({"".join(rng.choice(alphabet) for _ in range(rng.randint(1, 5))) for _ in range(500)})
+    keywords = sorted({"".join(rng.choice(alphabet) for _ in range(rng.randint(2, 6))) for _ in range(200)})
+    patterns = {"keyword": keywords, "company": companies}
+    matcher = KeywordMatcher(patterns)
+    assert len(companies) + len(keywords) > LINEAR_SCAN_LIMIT
+
+    for _ in range(50):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 200)))
+        assert matcher.match(text) == naive_match(patterns, text)
+        assert matcher.contains_any(text) == any(word in text for word in keywords + companies)
+    print(f"✅ Automaton agrees with naive scan over {len(matcher)} patterns")
+
+
+def test_ignore_case():
+    """Case-insensitive matchers lower both patterns and text."""
+    matcher = KeywordMatcher({"exclude": ["Sponsored Content", "advertisement"]}, ignore_case=True)
+    assert matcher.contains_any("This is SPONSORED content")
+    assert not matcher.contains_any("太陽光発電のニュース")
+    print("✅ Case-insensitive exclude terms matched")
+
+
+if __name__ == "__main__":
+    test_overlapping_patterns()
+    test_automaton_matches_naive_scan()
+    test_ignore_case()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""Test pagination, filtering and NDJSON streaming on the list endpoints."""
+
+import sys
+import os
+import json
+import asyncio
+import tempfile
+import shutil
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi.testclient import TestClient
+import api
+from article_store import upsert_articles
+
+
+def test_keyset_pagination_filters_and_ndjson():
+    """Pages follow X-Next-Cursor, filters narrow results and NDJSON matches the JSON rows."""
+    test_dir = tempfile.mkdtemp()
+    saved_env = {key: os.environ.get(key) for key in ("DB_PATH", "DISABLE_SEEDING")}
+    os.environ["DB_PATH"] = os.path.join(test_dir, "news.db")
+    os.environ["DISABLE_SEEDING"] = "true"
+    try:
+        with TestClient(api.app) as client:
+            conn = api.get_db_connection()
+            upsert_articles(conn, [{"url": f"https://example.jp/{i}", "title": f"記事{i}",
+                                    "category": "market" if i % 2 else "government",
+                                    "published_date": f"2024-12-{i + 1:02d}"} for i in range(25)])
+            # since/until filter on when the bot collected an article, not when it was published.
+            conn.execute("UPDATE articles SET collected_at = printf('2024-01-%02dT09:00:00+00:00', id)")
+            conn.executemany(
+                "INSERT INTO pickup_results (title, importance, summary, url, created_at) VALUES (?, ?, ?, ?, ?)",
+                [(f"記事{i}", ["High", "Low"][i % 2], "要約", f"https://example.jp/{i}", f"2024-02-{i + 1:02d} 09:00:00")
+                 for i in range(6)],
+            )
+            conn.commit()
+            conn.close()
+
+            assert len(client.get("/api/articles").json()) == 25
+
+            urls, cursor = [], None
+            while True:
+                params = {"limit": 10, **({"after_id": cursor} if cursor else {})}
+                response = client.get("/api/articles", params=params)
+                urls += [article["url"] for article in response.json()]
+                cursor = response.headers.get("X-Next-Cursor")
+                if not cursor:
+                    break
+            assert urls == [f"https://example.jp/{i}" for i in range(25)]
+
+            market = client.get("/api/articles", params={"category": "market", "since": "2024-01-10",
+                                                          "until": "2024-01-15"}).json()
+            assert [a["url"] for a in market] == [f"https://example.jp/{i}" for i in (9, 11, 13)]
+
+            response = client.get("/api/articles", params={"format": "ndjson", "category": "government"})
+            assert response.headers["content-type"].startswith("application/x-ndjson")
+            lines = [json.loads(line) for line in response.text.splitlines()]
+            assert [line["url"] for line in lines] == [f"https://example.jp/{i}" for i in range(0, 25, 2)]
+
+            high = client.get("/api/pickup_results", params={"importance": "High", "created_until": "2024-02-03"}).json()
+            assert [r["title"] for r in high] == ["記事0", "記事2"]
+            assert set(high[0]) == {"title", "matched_keywords", "matched_companies", "importance", "summary", "url"}
+
+            page = client.get("/api/pickup_results", params={"format": "ndjson", "limit": 2, "after_id": 2})
+            assert [json.loads(line)["id"] for line in page.text.splitlines()] == [3, 4]
+            assert client.get("/api/keywords", params={"limit": 0}).status_code == 422
+        print("✅ List endpoints paginate, filter and stream")
+    finally:
+        for key, value in saved_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+def test_ndjson_returns_connection_when_client_disconnects():
+    """A stream whose client goes away before the first row, or whose query fails, gives its connection back."""
+    test_dir = tempfile.mkdtemp()
+    saved_env = {key: os.environ.get(key) for key in ("DB_PATH", "DISABLE_SEEDING")}
+    os.environ["DB_PATH"] = os.path.join(test_dir, "news.db")
+    os.environ["DISABLE_SEEDING"] = "true"
+    try:
+        with TestClient(api.app):
+            pool = api._db_pool
+            idle = len(pool._idle)
+            response = api.list_rows("SELECT id, word FROM keywords", [], [], None, None, "ndjson",
+                                     dict, api.Response())
+            assert len(pool._idle) == idle - 1
+
+            async def disconnect():
+                return {"type": "http.disconnect"}
+
+            async def send(message):
+                await asyncio.sleep(0)
+
+            asyncio.run(response({"type": "http"}, disconnect, send))
+            assert len(pool._idle) == idle
+
+            try:
+                api.list_rows("SELECT id FROM missing_table", [], [], None, None, "ndjson", dict, api.Response())
+                assert False, "query on a missing table should fail"
+            except api.sqlite3.OperationalError:
+                pass
+            assert len(pool._idle) == idle
+        print("✅ NDJSON streams return their connection on disconnect")
+    finally:
+        for key, value in saved_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_keyset_pagination_filters_and_ndjson()
+    test_ndjson_returns_connection_when_client_disconnects()
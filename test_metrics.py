@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Test the metrics registry, its Prometheus rendering and the pipeline instrumentation."""
+
+import sys
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import metrics
+from config import Config
+from news_collector import NewsCollector
+from news_processor import NewsProcessor
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.example.json")
+
+FEED = ('<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel><title>t</title>'
+        '<item><title>系統用蓄電池</title><link>https://example.jp/1</link></item>'
+        '<item><title>太陽光発電</title><link>https://example.jp/2</link></item>'
+        '</channel></rss>').encode("utf-8")
+
+
+class FeedHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path == "/feed":
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(FEED)))
+            self.end_headers()
+            self.wfile.write(FEED)
+        else:
+            self.send_response(500)
+            self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def test_registry_renders_prometheus_text():
+    """Counters and histograms render with labels, cumulative buckets, count and sum."""
+    registry = metrics.Registry()
+    requests = registry.counter("demo_requests", "Requests served.", ["path"])
+    latency = registry.histogram("demo_latency_seconds", "Latency.", ["path"], buckets=(0.1, 1.0))
+
+    requests.inc(path="/a")
+    requests.inc(2, path='/"b"')
+    for value in (0.05, 0.5, 5.0):
+        latency.observe(value, path="/a")
+
+    text = registry.render()
+    assert "# TYPE demo_requests counter" in text
+    assert 'demo_requests_total{path="/a"} 1' in text
+    assert 'demo_requests_total{path="/\\"b\\""} 2' in text
+    assert 'demo_latency_seconds_bucket{path="/a",le="0.1"} 1' in text
+    assert 'demo_latency_seconds_bucket{path="/a",le="1"} 2' in text
+    assert 'demo_latency_seconds_bucket{path="/a",le="+Inf"} 3' in text
+    assert 'demo_latency_seconds_count{path="/a"} 3' in text
+    assert 'demo_latency_seconds_sum{path="/a"} 5.55' in text
+
+    try:
+        requests.inc(method="GET")
+        assert False, "wrong labels should be rejected"
+    except ValueError:
+        pass
+    print("✅ Registry renders Prometheus text")
+
+
+def test_collector_and_processor_are_instrumented():
+    """A run records per-source fetches, items and errors and the processor's filter results."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FeedHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        config = Config.load_from_file(CONFIG_PATH)
+        config.conditional_requests = False
+        config.content_cache_enabled = False
+
+        before = metrics.REGISTRY.snapshot()
+        collector = NewsCollector(config)
+        articles = collector._collect_rss_feed(f"{base}/feed", "general")
+        assert collector._collect_rss_feed(f"{base}/broken", "general") == []
+        articles.append({"title": "Wind update", "content": "offshore wind"})
+        NewsProcessor(config).process_articles(articles)
+
+        summary = metrics.run_summary(before)
+        assert any(line.startswith(f"{base}/feed: fetch") and "2 items, 0 errors" in line for line in summary), summary
+        assert any(line.startswith(f"{base}/broken: fetch") and "1 errors" in line for line in summary), summary
+        assert "Processor: accepted 2, not_japanese 1" in summary
+
+        text = metrics.REGISTRY.render()
+        assert f'newsbot_source_items_total{{source="{base}/feed"}} 2' in text
+        assert f'newsbot_source_fetch_seconds_count{{source="{base}/feed"}} 1' in text
+        print("✅ Collector and processor report metrics")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    test_registry_renders_prometheus_text()
+    test_collector_and_processor_are_instrumented()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Tests for NewsProcessor filtering and enrichment."""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from config import Config
+from news_processor import NewsProcessor, ArticleBatch, count_words
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.example.json")
+
+
+def make_processor(**overrides):
+    """Build a processor from the example config with overrides applied."""
+    config = Config.load_from_file(CONFIG_PATH)
+    for key, value in overrides.items():
+        setattr(config, key, value)
+    return NewsProcessor(config)
+
+
+def test_japanese_stats():
+    """Script counts and ratio ignore whitespace."""
+    processor = make_processor()
+    stats = processor.japanese_stats("ひらがな カタカナ 漢字 abc")
+    assert (stats["hiragana"], stats["katakana"], stats["kanji"]) == (4, 4, 2)
+    assert stats["total"] == 13
+    assert abs(stats["ratio"] - 10 / 13) < 1e-9
+    assert processor.japanese_stats("solar PPA")["ratio"] == 0.0
+    assert processor.japanese_stats("")["total"] == 0
+    print("✅ Japanese script statistics computed")
+
+
+def test_min_japanese_ratio_filter():
+    """A mostly-English article with one keyword is dropped once a ratio threshold is set."""
+    article = {"title": "PPA market update", "content": "Corporate PPA volumes grew in Q3 for 太陽光発電 projects."}
+
+    assert make_processor()._should_include_article(article)
+    assert not make_processor(min_japanese_ratio=0.5)._should_include_article(article)
+
+    japanese_article = {"title": "太陽光発電のPPA契約", "content": "企業向けの太陽光発電の導入が拡大している。"}
+    assert make_processor(min_japanese_ratio=0.5)._should_include_article(japanese_article)
+    print("✅ min_japanese_ratio filters mostly non-Japanese articles")
+
+
+def test_count_words_matches_split():
+    """count_words agrees with len(str.split()) for ASCII and non-ASCII text."""
+    samples = ["", "   ", "solar", "  solar  power\tPPA\n", "a\x1cb", "系統用蓄電池　の導入", "Tesla と ENEOS",
+               "　経済産業省は\u00a0洋上風力（30MW）の公募を\u2009開始した。\nENEOS と JERA が参加\u3000予定 ",
+               "日本".join(chr(code) for code in range(0x3001) if chr(code).isspace())]
+    for text in samples:
+        assert count_words(text) == len(text.split()), text
+    print("✅ count_words matches str.split")
+
+
+def test_process_batch_output():
+    """Batch processing filters like before and returns enriched dict copies with one timestamp."""
+    processor = make_processor()
+    articles = [
+        {"title": "太陽光発電の新技術", "content": "new 太陽光発電 module", "url": "https://example.jp/1", "category": "market"},
+        {"title": "Wind update", "content": "offshore wind", "url": "https://example.com/2"},
+        {"title": "系統用蓄電池", "content": "sponsored content 系統用蓄電池", "url": "https://example.jp/3"},
+        {"title": "PPA契約", "content": "企業向けPPA", "url": "https://example.jp/4"},
+    ]
+
+    processed = processor.process_batch(ArticleBatch(articles))
+
+    assert [a["url"] for a in processed] == ["https://example.jp/1", "https://example.jp/4"]
+    legacy = [processor._process_single_article(a) for a in articles if processor._should_include_article(a)]
+    strip_timestamp = lambda items: [{k: v for k, v in a.items() if k != "processed_at"} for a in items]
+    assert strip_timestamp(processed) == strip_timestamp(legacy)
+    assert len({a["processed_at"] for a in processed}) == 1
+    assert processed[0]["word_count"] == 3
+    assert processed[0]["category"] == "market"
+    assert set(processed[0]) >= {"processed_at", "word_count", "sentiment", "topics"}
+    assert "processed_at" not in articles[0]
+    print("✅ Batch processing output matches the dict-based format")
+
+
+if __name__ == "__main__":
+    test_japanese_stats()
+    test_min_japanese_ratio_filter()
+    test_count_words_matches_split()
+    test_process_batch_output()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""Test that parsing on the process pool gives the same results as parsing in fetch threads."""
+
+import sys
+import os
+import shutil
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from config import Config
+from content_extractor import shared_extractor
+from news_collector import NewsCollector
+from parse_pool import close_pools, shared_pool
+
+INDEX = ("<html><body><nav><a href='/menu'>メニュー</a></nav><ul class='news'>"
+         + "".join(f"<li><span>2024年1月{i + 1}日</span><a href='/news/{i}'>蓄電池のお知らせ{i}</a></li>" for i in range(5))
+         + "<li><span>2024年1月9日</span></li></ul></body></html>").encode("utf-8")
+ARTICLE = ("<html><head><title>サイト</title></head><body><nav><p>ホーム・ニュース・お問い合わせ・サイトマップ</p></nav>"
+           "<div class='entry'><h1>洋上風力の公募</h1>"
+           + "<p>経済産業省は洋上風力発電の新たな公募区域を指定したと発表した。</p>" * 3
+           + "</div></body></html>").encode("utf-8")
+# Scoring this page would pick div.other; the block learned from ARTICLE picks div.entry.
+ARTICLE2 = ("<html><body><div class='entry'><h1>蓄電池の入札</h1>"
+            + "<p>資源エネルギー庁は系統用蓄電池の入札結果を公表した。</p>" * 2 + "</div><div class='other'>"
+            + "<p>関連する過去の記事の一覧とその要約がここに長く並んでいる。</p>" * 5
+            + "</div></body></html>").encode("utf-8")
+FEED = ('<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+        + "".join(f"<item><title>記事{i}</title><link>https://example.jp/{i}</link></item>" for i in range(3))
+        + "</channel></rss>").encode("utf-8")
+
+
+class PageHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body, content_type = {"/index": (INDEX, "text/html"), "/article": (ARTICLE, "text/html"),
+                              "/article2": (ARTICLE2, "text/html"), "/feed": (FEED, "application/rss+xml")}[self.path]
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def collect(config, base):
+    source = {"name": "テスト市", "url": base + "/index", "news_selector": ".news li",
+              "title_selector": "a", "link_selector": "a", "date_selector": "span"}
+    collector = NewsCollector(config)
+    return (collector.collect_source("scrape", source, "municipality"),
+            collector.collect_source("rss", base + "/feed", "general"),
+            collector.fetch_article_content(base + "/article"))
+
+
+def test_pool_matches_threaded_parsing():
+    """Scrape items, feed entries and article text come back the same from worker processes."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), PageHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    test_dir = tempfile.mkdtemp()
+    try:
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        config = Config.load_from_file(os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.example.json"))
+        config.state_db_path = os.path.join(test_dir, "state.db")
+        config.conditional_requests = False
+        config.content_cache_enabled = False
+
+        threaded = collect(config, base)
+        config.parse_workers = 1
+        assert NewsCollector(config).parse_pool is shared_pool(1)
+        pooled = collect(config, base)
+        assert pooled == threaded
+        scraped, entries, article = pooled
+        assert [a["url"] for a in scraped] == [f"{base}/news/{i}" for i in range(5)]
+        assert len(entries) == 3
+        assert article["title"] == "洋上風力の公募" and "ホーム" not in article["content"]
+        print("✅ Pool parsing matches threaded parsing")
+    finally:
+        close_pools()
+        server.shutdown()
+        server.server_close()
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+def test_pool_workers_share_site_blocks():
+    """Blocks learned in a worker are kept by the collector's process and handed to any worker after."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), PageHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    test_dir = tempfile.mkdtemp()
+    extractor = shared_extractor()
+    try:
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        config = Config.load_from_file(os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.example.json"))
+        config.state_db_path = os.path.join(test_dir, "state.db")
+        config.content_cache_enabled = False
+        config.parse_workers = 1
+        close_pools()
+        extractor.remember("127.0.0.1", None)
+
+        NewsCollector(config).fetch_article_content(base + "/article")
+        assert extractor.site_block("127.0.0.1").selector == "div.entry"
+
+        # A new pool's worker has learned nothing; the block comes from the collector's process.
+        close_pools()
+        article = NewsCollector(config).fetch_article_content(base + "/article2")
+        assert article["title"] == "蓄電池の入札" and "過去の記事" not in article["content"]
+        print("✅ Pool workers share learned site blocks")
+    finally:
+        extractor.remember("127.0.0.1", None)
+        close_pools()
+        server.shutdown()
+        server.server_close()
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_pool_matches_threaded_parsing()
+    test_pool_workers_share_site_blocks()
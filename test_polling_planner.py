@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Test the adaptive polling planner."""
+
+import sys
+import os
+import random
+import tempfile
+import shutil
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from config import Config
+from polling_planner import PollingPlanner, expected_freshness, interval_for_freshness
+from scheduler import shared_planner
+
+HOUR = 3600
+
+
+def simulate(planner, source, changes_per_day, polls, rng, interval=6 * HOUR):
+    """Poll a source whose items change as a Poisson process at the given rate."""
+    now, item = 0.0, 0
+    next_change = rng.expovariate(changes_per_day / 86400)
+    for _ in range(polls):
+        while next_change <= now:
+            item += 1
+            next_change += rng.expovariate(changes_per_day / 86400)
+        planner.record(source, [f"{source}/{item}"], now)
+        now += interval
+
+
+def test_freshness_math():
+    """The chosen interval reaches exactly the target expected freshness."""
+    rate = 4 / 86400
+    interval = interval_for_freshness(rate, 0.8)
+    assert abs(expected_freshness(rate, interval) - 0.8) < 1e-9
+    assert interval_for_freshness(2 * rate, 0.8) < interval
+    print("✅ Freshness target solved for the polling interval")
+
+
+def test_intervals_follow_observed_change_rates():
+    """Busy sources are polled more often than quiet ones, within the configured bounds."""
+    test_dir = tempfile.mkdtemp()
+    try:
+        planner = PollingPlanner(os.path.join(test_dir, "state.db"), target_freshness=0.8,
+                                 min_interval_seconds=15 * 60, max_interval_seconds=48 * HOUR)
+        rng = random.Random(7)
+        simulate(planner, "nhk", changes_per_day=2, polls=40, rng=rng)
+        simulate(planner, "occto", changes_per_day=0.1, polls=40, rng=rng)
+        simulate(planner, "static", changes_per_day=1e-6, polls=40, rng=rng)
+
+        assert planner.next_interval("new-source", 6 * HOUR) == 6 * HOUR
+        assert 1.0 <= planner.change_rate("nhk") * 86400 <= 3.0
+        assert planner.next_interval("nhk", 6 * HOUR) < 6 * HOUR < planner.next_interval("occto", 6 * HOUR)
+        assert planner.next_interval("static", 6 * HOUR) == 48 * HOUR
+
+        reopened = PollingPlanner(os.path.join(test_dir, "state.db"))
+        stats = {row["source"]: row for row in reopened.stats(6 * HOUR)}
+        assert set(stats) == {"nhk", "occto", "static"}
+        assert stats["static"]["hit_rate"] == 0.0
+        assert stats["nhk"]["hit_rate"] > stats["occto"]["hit_rate"]
+        assert stats["nhk"]["polls"] == 39
+        print("✅ Polling intervals follow each source's observed change rate")
+    finally:
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+def test_shared_planner_is_built_once():
+    """Callers with the same configuration get one planner, so its database is opened once."""
+    test_dir = tempfile.mkdtemp()
+    try:
+        config = Config.load_from_file(os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.example.json"))
+        config.state_db_path = os.path.join(test_dir, "state.db")
+        planner = shared_planner(config)
+        assert shared_planner(config) is planner
+        assert planner.target_freshness == config.polling_target_freshness
+        config.polling_target_freshness = 0.5
+        assert shared_planner(config) is not planner
+        print("✅ Shared planner is built once per configuration")
+    finally:
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_freshness_math()
+    test_intervals_follow_observed_change_rates()
+    test_shared_planner_is_built_once()
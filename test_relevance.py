@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Test persisted relevance scores and their incremental updates."""
+
+import sys
+import os
+import sqlite3
+import shutil
+import tempfile
+import threading
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from relevance import add_pattern, create_relevance_table, matched_names, remove_pattern, score_missing, store_relevance
+
+
+def make_db(path=":memory:"):
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    conn.execute("CREATE TABLE articles (id INTEGER PRIMARY KEY AUTOINCREMENT, url TEXT UNIQUE)")
+    conn.execute("CREATE TABLE keywords (id INTEGER PRIMARY KEY AUTOINCREMENT, word TEXT UNIQUE)")
+    conn.execute("CREATE TABLE companies (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT UNIQUE)")
+    create_relevance_table(conn)
+    conn.executemany("INSERT INTO keywords (word) VALUES (?)", [("太陽光発電",), ("PPA",)])
+    conn.executemany("INSERT INTO companies (name) VALUES (?)", [("ENEOS",), ("Tesla",)])
+    return conn
+
+
+def scores(conn):
+    return {row["article_id"]: round(row["score"], 3)
+            for row in conn.execute("SELECT article_id, score FROM article_relevance")}
+
+
+def test_incremental_updates_match_full_rescore():
+    """Adding and deleting patterns updates only affected rows and agrees with scoring from scratch."""
+    texts = {
+        "https://example.jp/1": "ENEOSが太陽光発電のPPAを締結 系統用蓄電池も",
+        "https://example.jp/2": "系統用蓄電池の市場動向",
+        "https://example.jp/3": "Teslaの新製品",
+    }
+    conn = make_db()
+    for url, text in texts.items():
+        article_id = conn.execute("INSERT INTO articles (url) VALUES (?)", (url,)).lastrowid
+        if url != "https://example.jp/3":
+            store_relevance(conn, article_id, text)
+
+    assert score_missing(conn, texts.get) == 1
+    assert scores(conn) == {1: 0.75, 2: 0.0, 3: 0.25}
+
+    keyword_id = conn.execute("INSERT INTO keywords (word) VALUES ('系統用蓄電池')").lastrowid
+    assert add_pattern(conn, "keyword", keyword_id, "系統用蓄電池", texts.get) == 2
+    assert scores(conn) == {1: 0.8, 2: 0.2, 3: 0.2}
+
+    eneos_id = conn.execute("SELECT id FROM companies WHERE name = 'ENEOS'").fetchone()[0]
+    conn.execute("DELETE FROM companies WHERE id = ?", (eneos_id,))
+    assert remove_pattern(conn, "company", eneos_id) == 1
+    assert scores(conn) == {1: 0.75, 2: 0.25, 3: 0.25}
+
+    row = conn.execute("SELECT * FROM article_relevance WHERE article_id = 1").fetchone()
+    assert matched_names(conn, row) == (["太陽光発電", "PPA", "系統用蓄電池"], [])
+
+    incremental = scores(conn)
+    conn.execute("DELETE FROM article_relevance")
+    assert score_missing(conn, texts.get) == 3
+    assert scores(conn) == incremental
+
+    high = conn.execute("SELECT article_id FROM article_relevance WHERE score >= ?", (0.5,)).fetchall()
+    assert [row["article_id"] for row in high] == [1]
+    print("✅ Incremental relevance updates match a full rescore")
+
+
+def test_concurrent_add_pattern_keeps_both_matches():
+    """Two patterns added at once, on separate connections, both end up in every row they match."""
+    test_dir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(test_dir, "news.db")
+        conn = make_db(path)
+        texts = {f"https://example.jp/{i}": "系統用蓄電池と洋上風力" for i in range(5)}
+        for url, text in texts.items():
+            store_relevance(conn, conn.execute("INSERT INTO articles (url) VALUES (?)", (url,)).lastrowid, text)
+        first_id = conn.execute("INSERT INTO keywords (word) VALUES ('系統用蓄電池')").lastrowid
+        second_id = conn.execute("INSERT INTO keywords (word) VALUES ('洋上風力')").lastrowid
+        conn.commit()
+
+        def slow_text(url):
+            time.sleep(0.01)
+            return texts[url]
+
+        results = {}
+
+        def add(pattern_id, pattern):
+            other = sqlite3.connect(path, timeout=10)
+            other.row_factory = sqlite3.Row
+            results[pattern] = add_pattern(other, "keyword", pattern_id, pattern, slow_text)
+            other.close()
+
+        threads = [threading.Thread(target=add, args=args)
+                   for args in ((first_id, "系統用蓄電池"), (second_id, "洋上風力"))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results == {"系統用蓄電池": 5, "洋上風力": 5}
+        for row in conn.execute("SELECT * FROM article_relevance"):
+            assert matched_names(conn, row)[0] == ["系統用蓄電池", "洋上風力"] and row["match_count"] == 2
+        print("✅ Concurrent pattern additions keep both matches")
+    finally:
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_incremental_updates_match_full_rescore()
+    test_concurrent_add_pattern_keeps_both_matches()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Test the resident source scheduler."""
+
+import sys
+import os
+import random
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from config import Config
+from scheduler import Scheduler
+
+HOUR = 3600
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeCollector:
+    """Serves canned articles, fails the "broken" feed and takes 40s on the "slow" one."""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.calls = []
+
+    def collection_tasks(self):
+        return [
+            ("rss", "https://example.jp/fast.rss", "market"),
+            ("rss", "https://example.jp/broken.rss", "market"),
+            ("scrape", {"name": "slow", "url": "https://example.jp/slow", "update_interval_hours": 12}, "government"),
+        ]
+
+    def collect_source(self, kind, source, category):
+        key = source if kind == "rss" else source["name"]
+        self.calls.append(key)
+        if "broken" in key:
+            raise ConnectionError("connection refused")
+        if key == "slow":
+            self.clock.now += 40
+        return [{"title": f"{key} 太陽光発電", "content": "太陽光発電", "url": f"{key}/1", "category": category}]
+
+
+class FakeOutbox:
+    def __init__(self):
+        self.queued = []
+
+    def enqueue(self, articles):
+        self.queued.extend(article["url"] for article in articles)
+        return len(articles)
+
+    async def drain(self, notifier, batch_size=10):
+        return 0
+
+
+def test_sources_run_on_own_intervals_with_backoff():
+    """Each source gets its own interval; failures and slow fetches back off up to the cap."""
+    config = Config.load_from_file(os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.example.json"))
+    config.update_interval_hours = 6
+    config.max_concurrent_fetches = 1
+    config.scheduler_max_backoff_hours = 20
+    config.dedup_enabled = False
+    config.adaptive_polling = False
+
+    clock = FakeClock()
+    collector = FakeCollector(clock)
+    outbox = FakeOutbox()
+    scheduler = Scheduler(config, collector=collector, notifier=object(), outbox=outbox,
+                          clock=clock, rng=random.Random(0))
+    fast, broken, slow = scheduler.schedules
+    assert [s.interval_seconds for s in scheduler.schedules] == [6 * HOUR, 6 * HOUR, 12 * HOUR]
+
+    assert scheduler.run_pending() == 0
+    clock.now += 60
+    assert scheduler.run_pending() == 2
+    assert collector.calls == ["https://example.jp/fast.rss", "https://example.jp/broken.rss", "slow"]
+    assert len(outbox.queued) == 2
+
+    assert 5.4 * HOUR <= fast.next_run - fast.last_run <= 6.6 * HOUR
+    assert broken.failures == 1 and broken.last_error == "connection refused"
+    assert 10.8 * HOUR <= broken.next_run - broken.last_run <= 13.2 * HOUR
+    assert 18 * HOUR <= slow.next_run - slow.last_run <= 22 * HOUR
+
+    for _ in range(3):
+        clock.now = broken.next_run
+        scheduler.run_pending()
+    assert broken.failures == 4
+    assert broken.next_run - broken.last_run <= 22 * HOUR
+    assert scheduler.seconds_until_next() == min(s.next_run for s in scheduler.schedules) - clock.now
+    print("✅ Sources run on their own intervals and back off when failing or slow")
+
+
+if __name__ == "__main__":
+    test_sources_run_on_own_intervals_with_backoff()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Test compiled scrape-selector plans against the example scrape sources."""
+
+import sys
+import os
+import json
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from bs4 import BeautifulSoup
+from selector_plan import SelectorPlan, available_backends, choose_backend, plan_for, strainer_root
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.example.json")
+
+NOISE = "<nav><ul><li><a href='/menu'>メニュー</a></li></ul></nav><script>var x = '<li>';</script>"
+PAGES = {
+    ".news-list .news-item": (
+        f"<html><body>{NOISE}<div class='news-item'><a class='news-title' href='/outside'>外</a></div>"
+        "<div class='news-list'>"
+        "<div class='news-item'><span class='news-date'>2024年1月15日</span><a class='news-title' href='/a'>補助金の公募</a></div>"
+        "<div class='news-item'><a class='news-title' href='https://example.jp/b'>系統用蓄電池</a></div>"
+        "<div class='news-item'><span>リンクなし</span></div>"
+        "</div></body></html>"
+    ),
+    "main ul li": f"<html><body>{NOISE}<main><ul><li><a href='/c'>需給ひっ迫</a></li><li>リンクなし</li></ul></main></body></html>",
+    "": (
+        f"<html><body>{NOISE}<div class='news-section'><a href='/d'>取引情報</a></div>"
+        "<h3>お知らせ</h3><ul><li><a href='/e'>システム停止</a></li></ul></body></html>"
+    ),
+}
+
+
+def legacy_extract(source, html):
+    """The pre-plan scraping loop: full html.parser soup, selectors interpreted per item."""
+    items = []
+    for item in BeautifulSoup(html, "html.parser").select(source["news_selector"]):
+        title_elem = item if source["title_selector"] in ("self", "") else item.select_one(source["title_selector"])
+        link_elem = item if source["link_selector"] in ("self", "") else item.select_one(source["link_selector"])
+        date_elem = item.select_one(source["date_selector"]) if source.get("date_selector") else None
+        if title_elem and link_elem:
+            link = link_elem.get("href", "")
+            items.append({"title": title_elem.get_text(strip=True),
+                          "url": "https://example.jp" + link if link.startswith("/") else link,
+                          "published_date": date_elem.get_text(strip=True) if date_elem else ""})
+    return items
+
+
+def test_strainer_root():
+    """Only selectors confined to one element get a parse root."""
+    assert strainer_root(".news-list .news-item") == {"class": "news-list"}
+    assert strainer_root("main ul li") == {"name": "main"}
+    assert strainer_root("div#news > a") == {"name": "div", "id": "news"}
+    assert strainer_root(".news-item") == {"class": "news-item"}
+    assert strainer_root(".a, .b") is None
+    assert strainer_root("h3 + ul a") is None
+    assert strainer_root("h3:contains('x') ul") is None
+    assert strainer_root("div.a.b li") is None
+    assert strainer_root("[data-x] a") is None
+    print("✅ Parse roots derived from news selectors")
+
+
+def test_plans_match_legacy_scraping():
+    """Each example source extracts the same items as the old per-item loop on every installed backend."""
+    with open(CONFIG_PATH, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    sources = data["government_scrape_sources"] + data["market_scrape_sources"]
+    assert sources
+
+    for source in sources:
+        html = PAGES.get(source["news_selector"], PAGES[""])
+        expected = legacy_extract(source, html)
+        assert expected, source["name"]
+        plan = plan_for(source)
+        assert plan is plan_for(dict(source, url="https://other.example/"))
+        for backend in available_backends():
+            items = plan.extract(html.encode("utf-8"), "https://example.jp/news/", backend)
+            assert items == expected, (source["name"], backend, items)
+    print("✅ Selector plans match the legacy scraping loop")
+
+
+def test_self_selectors_and_backend_choice():
+    """"self" uses the item element, soupsieve-only selectors are flagged, unknown backends fall back."""
+    plan = SelectorPlan.compile({"news_selector": "li:-soup-contains('蓄電池') a", "title_selector": "self",
+                                 "link_selector": "self"})
+    assert plan.title is None and plan.link is None and plan.date is None
+    assert plan.soupsieve_only
+    items = plan.extract("<ul><li><a href='/x'>系統用蓄電池</a></li><li><a href='/y'>風力</a></li></ul>".encode("utf-8"),
+                         "https://example.jp/news/", "selectolax")
+    assert items == [{"title": "系統用蓄電池", "url": "https://example.jp/x", "published_date": ""}]
+
+    assert choose_backend("no-such-parser") == available_backends()[0]
+    assert choose_backend("html.parser") == "html.parser"
+    print("✅ Self selectors and backend fallback")
+
+
+if __name__ == "__main__":
+    test_strainer_root()
+    test_plans_match_legacy_scraping()
+    test_self_selectors_and_backend_choice()
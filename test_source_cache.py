@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Test conditional GET handling for RSS sources."""
+
+import sys
+import os
+import tempfile
+import shutil
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from config import Config
+from news_collector import NewsCollector
+
+FEED = """<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0"><channel><title>Test</title>
+<item><title>太陽光発電の新制度</title><link>https://example.jp/a</link><description>PPA</description></item>
+<item><title>系統用蓄電池の入札</title><link>https://example.jp/b</link><description>蓄電池</description></item>
+</channel></rss>""".encode("utf-8")
+
+
+class FeedHandler(BaseHTTPRequestHandler):
+    """Serves a static feed with an ETag and counts full downloads."""
+
+    full_downloads = 0
+    send_etag = True
+
+    def do_GET(self):
+        if self.send_etag and self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        FeedHandler.full_downloads += 1
+        self.send_response(200)
+        self.send_header("Content-Type", "application/rss+xml")
+        if self.send_etag:
+            self.send_header("ETag", '"v1"')
+        self.end_headers()
+        self.wfile.write(FEED)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def run_collector_twice(send_etag):
+    """Collect the same feed twice against a local server."""
+    FeedHandler.full_downloads = 0
+    FeedHandler.send_etag = send_etag
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FeedHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    test_dir = tempfile.mkdtemp()
+
+    try:
+        config = Config.load_from_file(os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.example.json"))
+        config.state_db_path = os.path.join(test_dir, "state.db")
+        feed_url = f"http://127.0.0.1:{server.server_address[1]}/feed.xml"
+
+        collector = NewsCollector(config)
+        first = collector._collect_from_rss_source(feed_url)
+        parsed = []
+        import news_collector
+        originals = {name: getattr(news_collector, name) for name in ("read_feed", "read_feed_stream")}
+
+        def counting(original):
+            return lambda *args, **kwargs: parsed.append(args) or original(*args, **kwargs)
+
+        for name, original in originals.items():
+            setattr(news_collector, name, counting(original))
+        try:
+            second = NewsCollector(config)._collect_from_rss_source(feed_url)
+        finally:
+            for name, original in originals.items():
+                setattr(news_collector, name, original)
+        return first, second, parsed
+    finally:
+        server.shutdown()
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+def test_not_modified_reuses_cached_articles():
+    """A 304 response returns the previous articles without parsing."""
+    first, second, parsed = run_collector_twice(send_etag=True)
+    assert len(first) == 2
+    assert second == first
+    assert not parsed, "feed was re-parsed after a 304"
+    assert FeedHandler.full_downloads == 1
+    print("✅ 304 Not Modified served from the validator cache")
+
+
+def test_unchanged_body_hash_skips_parse():
+    """A full download with an identical body is not parsed again."""
+    first, second, parsed = run_collector_twice(send_etag=False)
+    assert second == first
+    assert not parsed, "unchanged feed body was re-parsed"
+    assert FeedHandler.full_downloads == 2
+    print("✅ Unchanged body hash served from the validator cache")
+
+
+if __name__ == "__main__":
+    test_not_modified_reuses_cached_articles()
+    test_unchanged_body_hash_skips_parse()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""Test async Teams delivery with rate limiting and retries."""
+
+import sys
+import os
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from config import Config
+from teams_notifier import TeamsNotifier
+
+
+class WebhookHandler(BaseHTTPRequestHandler):
+    """Fake Teams webhook: throttles the first post, rejects bad titles, accepts the rest."""
+
+    received = []
+    throttled = False
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if not WebhookHandler.throttled:
+            WebhookHandler.throttled = True
+            self.send_response(429)
+            self.send_header("Retry-After", "0")
+            self.end_headers()
+            return
+        if "reject" in body["text"]:
+            self.send_response(400)
+            self.end_headers()
+            return
+        WebhookHandler.received.append(body["text"])
+        self.send_response(200)
+        self.end_headers()
+        self.wfile.write(b"1")
+
+    def log_message(self, format, *args):
+        pass
+
+
+def test_post_articles_retries_and_reports():
+    """A 429 is retried after Retry-After and every article gets a delivery result."""
+    WebhookHandler.received = []
+    WebhookHandler.throttled = False
+    server = ThreadingHTTPServer(("127.0.0.1", 0), WebhookHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    try:
+        config = Config.load_from_file(os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.example.json"))
+        config.teams_webhook_url = f"http://127.0.0.1:{server.server_address[1]}/webhook"
+        config.teams_backoff_seconds = 0.01
+
+        articles = [
+            {"title": "太陽光発電", "url": "https://example.jp/1", "category": "market"},
+            {"title": "reject me", "url": "https://example.jp/2"},
+            {"title": "系統用蓄電池", "url": "https://example.jp/3", "category": "government"},
+        ]
+        results = TeamsNotifier(config).post_articles(articles)
+
+        assert [r.success for r in results] == [True, False, True]
+        assert results[0].attempts == 2
+        assert results[1].status_code == 400 and results[1].attempts == 1
+        assert WebhookHandler.received[0].startswith("**[市場] 太陽光発電**")
+        assert WebhookHandler.received[1].startswith("**[政府] 系統用蓄電池**")
+        print("✅ Delivery retried after 429 and reported per-article results")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    test_post_articles_retries_and_reports()
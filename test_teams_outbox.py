@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""Test the durable Teams outbox."""
+
+import sys
+import os
+import asyncio
+import tempfile
+import shutil
+import threading
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from teams_notifier import DeliveryResult
+from state_db import state_db_location
+from teams_outbox import TeamsOutbox, shared_outbox
+
+
+class FakeNotifier:
+    """Records delivered URLs and fails any URL listed in fail_urls."""
+
+    def __init__(self, fail_urls=(), delay=0.0):
+        self.delivered = []
+        self.fail_urls = set(fail_urls)
+        self.delay = delay
+
+    async def post_articles_async(self, articles):
+        await asyncio.sleep(self.delay)
+        results = []
+        for article in articles:
+            success = article["url"] not in self.fail_urls
+            if success:
+                self.delivered.append(article["url"])
+            results.append(DeliveryResult(url=article["url"], title=article["title"], success=success,
+                                          error="" if success else "HTTP 500"))
+        return results
+
+
+def test_outbox_skips_delivered_and_retries_failed():
+    """Sent URLs are never re-delivered and failing URLs give up after max attempts."""
+    test_dir = tempfile.mkdtemp()
+    try:
+        db_path = os.path.join(test_dir, "state.db")
+        articles = [{"title": f"記事{i}", "url": f"https://example.jp/{i}"} for i in range(5)]
+
+        outbox = TeamsOutbox(db_path, max_attempts=2)
+        assert outbox.enqueue(articles) == 5
+        assert outbox.enqueue(articles) == 0
+
+        notifier = FakeNotifier(fail_urls={"https://example.jp/3"})
+        assert asyncio.run(outbox.drain(notifier, batch_size=2)) == 4
+        assert notifier.delivered == [f"https://example.jp/{i}" for i in (0, 1, 2, 4)]
+        assert outbox.stats() == {"enqueued": 1, "sent": 4, "failed": 0}
+
+        reopened = TeamsOutbox(db_path, max_attempts=2)
+        assert reopened.enqueue(articles) == 0
+        assert asyncio.run(reopened.drain(notifier)) == 0
+        assert reopened.stats() == {"enqueued": 0, "sent": 4, "failed": 1}
+
+        assert reopened.enqueue(articles) == 1
+        assert asyncio.run(reopened.drain(FakeNotifier())) == 1
+        assert reopened.stats() == {"enqueued": 0, "sent": 5, "failed": 0}
+        print("✅ Outbox delivers each URL once and gives up on failures after max attempts")
+    finally:
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+def test_concurrent_drainers_post_each_message_once():
+    """Drainers on separate connections, as in separate processes, split the queue between them."""
+    test_dir = tempfile.mkdtemp()
+    try:
+        db_path = os.path.join(test_dir, "state.db")
+        articles = [{"title": f"記事{i}", "url": f"https://example.jp/{i}"} for i in range(40)]
+        assert TeamsOutbox(db_path).enqueue(articles) == 40
+
+        notifiers = [FakeNotifier(delay=0.01) for _ in range(3)]
+        counts = []
+        start = threading.Barrier(len(notifiers))
+
+        def run(notifier):
+            outbox = TeamsOutbox(db_path)
+            start.wait()
+            counts.append(asyncio.run(outbox.drain(notifier, batch_size=3)))
+
+        threads = [threading.Thread(target=run, args=(notifier,)) for notifier in notifiers]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        delivered = [url for notifier in notifiers for url in notifier.delivered]
+        assert sorted(delivered) == sorted(article["url"] for article in articles), "each URL posted exactly once"
+        assert sum(counts) == 40 and sum(1 for notifier in notifiers if notifier.delivered) > 1
+        assert TeamsOutbox(db_path).stats() == {"enqueued": 0, "sent": 40, "failed": 0}
+        print("✅ Concurrent drainers post each message once")
+    finally:
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+def test_shared_outbox_is_opened_once():
+    """Queueing from several places in one process reuses one outbox and its connection."""
+    test_dir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(test_dir, "state.db")
+        outbox = shared_outbox(path, max_attempts=3)
+        assert shared_outbox(path, max_attempts=3) is outbox and outbox.max_attempts == 3
+        assert shared_outbox(path, max_attempts=5) is not outbox
+        print("✅ Shared outbox is opened once")
+    finally:
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+def test_state_db_follows_database_path():
+    """A relative state path is kept next to DB_PATH, so the sent history survives with the database."""
+    test_dir = tempfile.mkdtemp()
+    saved_env = {key: os.environ.get(key) for key in ("DB_PATH", "DATABASE_PATH", "STATE_DB_PATH")}
+    try:
+        for key in saved_env:
+            os.environ.pop(key, None)
+        assert state_db_location("data/state.db") == "data/state.db"
+        os.environ["DB_PATH"] = os.path.join(test_dir, "news.db")
+        TeamsOutbox("data/state.db").enqueue([{"url": "https://example.jp/1", "title": "記事"}])
+        assert os.path.exists(os.path.join(test_dir, "state.db"))
+        assert state_db_location("/srv/state.db") == "/srv/state.db"
+        os.environ["STATE_DB_PATH"] = os.path.join(test_dir, "other.db")
+        assert state_db_location("data/state.db") == os.path.join(test_dir, "other.db")
+        print("✅ State database follows the database path")
+    finally:
+        for key, value in saved_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_outbox_skips_delivered_and_retries_failed()
+    test_concurrent_drainers_post_each_message_once()
+    test_shared_outbox_is_opened_once()
+    test_state_db_follows_database_path()